@@ -0,0 +1,290 @@
+"""Генератори синтетичних CSV для бенчмарків імпорту.
+
+Файли мають ту саму структуру, що й реальні вивантаження (КАТОТТГ, витяг
+ЄДР, вакансії ДСЗ), і детерміновані для одного `seed`. Невелика частка
+рядків навмисно некоректна, щоб бенчмарк проходив і гілки відхилення.
+"""
+
+import csv
+import random
+from datetime import date, timedelta
+
+CATOTTG_HEADER = [
+    "Перший рівень",
+    "Другий рівень",
+    "Третій рівень",
+    "Четвертий рівень",
+    "Додатковий рівень",
+    "Категорія об’єкта",
+    "Назва об’єкта",
+]
+EMPLOYER_HEADER = [
+    "tax_id", "name", "kved_code", "settlement_code", "address"
+]
+VACANCY_HEADER = [
+    "external_id",
+    "employer_tax_id",
+    "position_code",
+    "location_code",
+    "salary_min",
+    "salary_max",
+    "description",
+    "report_3pn_date",
+    "published_at",
+    "education_level",
+    "degree",
+    "confirmed_at",
+]
+
+EDUCATION_LEVELS = [
+    "Загальна середня",
+    "Професійно-технічна",
+    "Неповна вища",
+    "Базова вища",
+    "Вища освіта",
+]
+DEGREES = ["Бакалавр", "Магістр", "Молодший спеціаліст", ""]
+LEGAL_FORMS = ["ТОВ", "ПП", "ФОП", "ПрАТ", "КП"]
+WORDS = [
+    "Альфа", "Будівельник", "Вектор", "Граніт", "Дніпро", "Елеватор",
+    "Житниця", "Злагода", "Ірпінь", "Калина", "Лан", "Меридіан",
+]
+STREETS = ["Шевченка", "Франка", "Лесі Українки", "Соборна", "Центральна"]
+
+
+def _writer(f):
+    return csv.writer(f, delimiter=";", lineterminator="\n")
+
+
+def _code(*parts):
+    """Код КАТОТТГ: UA + 17 цифр, рівні ієрархії + порядковий номер."""
+    *levels, seq = parts
+    prefix = "".join(f"{level % 100:02d}" for level in levels)
+    return f"UA{prefix}{seq:0{17 - len(prefix)}d}"
+
+
+def write_catottg(path, rows, seed=1):
+    """Кодифікатор на ~`rows` рядків.
+
+    Області → райони → громади → населені пункти, у великих містах —
+    райони в місті (B). Повертає коди населених пунктів і районів у місті.
+    """
+    rnd = random.Random(seed)
+    codes = []
+    written = 0
+    seq = 0
+
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(CATOTTG_HEADER)
+        region = 0
+        while written < rows:
+            seq += 1
+            region_code = _code(region, seq)
+            writer.writerow(
+                [region_code, "", "", "", "", "O", f"Область {region}"]
+            )
+            written += 1
+            for district in range(6):
+                seq += 1
+                district_code = _code(region, district, seq)
+                writer.writerow([
+                    region_code, district_code, "", "", "", "P",
+                    f"Район {region}-{district}",
+                ])
+                written += 1
+                for community in range(12):
+                    seq += 1
+                    community_code = _code(region, district, community, seq)
+                    writer.writerow([
+                        region_code, district_code, community_code, "", "",
+                        "H", f"{rnd.choice(WORDS)} громада",
+                    ])
+                    written += 1
+                    for settlement in range(rnd.randint(10, 40)):
+                        seq += 1
+                        settlement_code = _code(
+                            region, district, community, seq
+                        )
+                        category = (
+                            "M" if settlement == 0 else rnd.choice("TCX")
+                        )
+                        writer.writerow([
+                            region_code, district_code, community_code,
+                            settlement_code, "", category,
+                            f"{rnd.choice(WORDS)} {settlement}",
+                        ])
+                        codes.append(settlement_code)
+                        written += 1
+                        if category == "M" and community == 0:
+                            for city_district in range(3):
+                                seq += 1
+                                city_district_code = _code(
+                                    region, district, community, seq
+                                )
+                                writer.writerow([
+                                    region_code, district_code,
+                                    community_code, settlement_code,
+                                    city_district_code, "B",
+                                    f"Район у місті {city_district}",
+                                ])
+                                codes.append(city_district_code)
+                                written += 1
+                        if written >= rows:
+                            return codes
+            region += 1
+    return codes
+
+
+def write_kved(path):
+    """Невеликий КВЕД (секції A-U по 4 класи на групу).
+
+    Повертає коди класів.
+    """
+    classes = []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(
+            ["Код секції", "Код розділу", "Код групи", "Код класу", "Назва"]
+        )
+        for s, section in enumerate("ABCDEFGHIJKLMNOPQRSTU"):
+            writer.writerow([section, "", "", "", f"Секція {section}"])
+            for d in range(3):
+                division = f"{s * 3 + d + 1:02d}"
+                writer.writerow(
+                    [section, division, "", "", f"Розділ {division}"]
+                )
+                for g in range(1, 4):
+                    group = f"{division}.{g}"
+                    writer.writerow(
+                        [section, division, group, "", f"Група {group}"]
+                    )
+                    for c in range(1, 5):
+                        code = f"{group}{c}"
+                        writer.writerow(
+                            [section, division, group, code, f"Клас {code}"]
+                        )
+                        classes.append(code)
+    return classes
+
+
+def write_kp(kp_path, job_titles_path, seed=1):
+    """Класифікатор професій і детальні назви робіт до нього.
+
+    Розділ → ... → група → професійні назви. Повертає коди професійних
+    назв.
+    """
+    rnd = random.Random(seed)
+    positions = []
+    with open(kp_path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(["Код", "Група професій"])
+        for section in range(1, 10):
+            writer.writerow([str(section), f"Розділ {section}"])
+            for subsection in range(1, 4):
+                subsection_code = f"{section}{subsection}"
+                writer.writerow(
+                    [subsection_code, f"Підрозділ {subsection_code}"]
+                )
+                for cls in range(1, 4):
+                    class_code = f"{subsection_code}{cls}"
+                    writer.writerow([class_code, f"Клас {class_code}"])
+                    for group in range(1, 5):
+                        group_code = f"{class_code}{group}"
+                        writer.writerow([group_code, f"Група {group_code}"])
+                        for position in range(1, 4):
+                            code = f"{group_code}.{position}"
+                            writer.writerow(
+                                [code, f"{rnd.choice(WORDS)} {code}"]
+                            )
+                            positions.append(code)
+
+    with open(job_titles_path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(["КОД КП", "ЗКППТР", "ЄТКД", "ДКХП", "НАЗВА"])
+        for code in positions:
+            for n in range(rnd.randint(1, 4)):
+                writer.writerow([
+                    code, rnd.randint(10000, 99999), rnd.randint(1, 80), "",
+                    f"{rnd.choice(WORDS)} {code}-{n}",
+                ])
+    return positions
+
+
+def write_employers(path, rows, kved_codes, location_codes, seed=1):
+    """Витяг ЄДР на `rows` рядків.
+
+    ~2% без назви, ~3% з невідомим КВЕД, ~1% з невідомим населеним
+    пунктом. Повертає податкові номери.
+    """
+    rnd = random.Random(seed)
+    tax_ids = []
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(EMPLOYER_HEADER)
+        for i in range(rows):
+            # ЄДРПОУ (8 цифр) для юросіб, РНОКПП (10 цифр) для ФОП
+            form = rnd.choice(LEGAL_FORMS)
+            if form == "ФОП":
+                tax_id = f"{4_000_000_000 + i}"
+            else:
+                tax_id = f"{20_000_000 + i}"
+            tax_ids.append(tax_id)
+            name = ""
+            if rnd.random() > 0.02:
+                name = f'{form} "{rnd.choice(WORDS)}-{i}"'
+            kved = rnd.choice(kved_codes) if rnd.random() > 0.03 else "99.99"
+            location = "UA00000000000000000"
+            if rnd.random() > 0.01:
+                location = rnd.choice(location_codes)
+            address = f"вул. {rnd.choice(STREETS)}, {rnd.randint(1, 200)}"
+            writer.writerow([tax_id, name, kved, location, address])
+    return tax_ids
+
+
+def write_vacancies(
+    path, rows, tax_ids, position_codes, location_codes, seed=1
+):
+    """Вакансії ДСЗ на `rows` рядків.
+
+    ~5% external_id повторюються (оновлення), ~2% з невідомим
+    роботодавцем, ~1% без коду посади; опис іноді з лапками та переносами
+    рядків.
+    """
+    rnd = random.Random(seed)
+    start = date(2025, 1, 1)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = _writer(f)
+        writer.writerow(VACANCY_HEADER)
+        for i in range(rows):
+            number = i if rnd.random() > 0.05 else rnd.randrange(i + 1)
+            tax_id = "11111111"
+            if rnd.random() > 0.02:
+                tax_id = rnd.choice(tax_ids)
+            position = ""
+            if rnd.random() > 0.01:
+                position = rnd.choice(position_codes)
+            salary_max = rnd.randrange(8000, 60000, 500)
+            salary_min = rnd.choice(["", str(salary_max - 2000)])
+            published = start + timedelta(days=rnd.randrange(365))
+            description = rnd.choice([
+                "",
+                "Повний робочий день",
+                'Вимоги: досвід від 1 року, "відповідальність"\nГрафік 5/2',
+            ])
+            writer.writerow([
+                f"{number:014d}",
+                tax_id,
+                position,
+                rnd.choice(location_codes),
+                salary_min,
+                salary_max,
+                description,
+                published.strftime("%d.%m.%Y"),
+                published.strftime("%d.%m.%Y"),
+                rnd.choice(EDUCATION_LEVELS),
+                rnd.choice(DEGREES),
+                (published + timedelta(days=rnd.randrange(30))).strftime(
+                    "%d.%m.%Y"
+                ),
+            ])
@@ -0,0 +1,268 @@
+"""Бенчмарк імпортерів на синтетичних даних.
+
+Для кожного розміру створюється окрема тимчасова SQLite-база, в неї
+завантажуються довідники (не вимірюється), а потім по черзі виконуються
+сценарії: КАТОТТГ → роботодавці → вакансії. Кожна команда запускається
+в окремому процесі, тож пікова пам'ять (RSS) не змішується між
+сценаріями. Результат — JSON з рядків/с, піковою RSS та кількістю
+SQL-запитів; з --baseline він порівнюється зі збереженим.
+
+    python -m benchmarks.run --sizes 10000 100000 --output bench.json
+    python -m benchmarks.run --sizes 10000 --baseline benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import UTC, datetime
+from io import StringIO
+from pathlib import Path
+
+from benchmarks import generators
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+OWNER_EMAIL = "admin@admin.admin"
+
+# Сценарій: (назва, команда, аргументи з підставленими шляхами до файлів).
+# Виконуються в цьому порядку в одній базі: вакансіям потрібні роботодавці,
+# роботодавцям — населені пункти.
+SCENARIOS = [
+    ("catottg", "load_catottg", ["--file", "{catottg}"]),
+    ("employers", "import_employers", ["{employers}", "--bulk"]),
+    ("vacancies", "import_vacancies", ["{vacancies}", "--bulk"]),
+    (
+        "vacancies_unchanged",
+        "import_vacancies",
+        ["{vacancies}", "--bulk", "--skip-unchanged"],
+    ),
+    ("vacancies_dry_run", "import_vacancies", ["{vacancies}", "--dry-run"]),
+]
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "job_search.settings")
+    import django
+
+    django.setup()
+
+
+def child_setup(files):
+    """Міграції, власник роботодавців і довідники, потрібні імпорту."""
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command("migrate", verbosity=0, stdout=out)
+    get_user_model().objects.create(username="admin", email=OWNER_EMAIL)
+    call_command("load_dictionaries", stdout=out)
+    call_command("load_kved", file=files["kved"], stdout=out)
+    call_command("load_kp", file=files["kp"], stdout=out)
+    call_command("load_job_titles", file=files["job_titles"], stdout=out)
+
+
+def child_measure(command, args):
+    """Виконує команду та друкує JSON з часом, запитами та піковою RSS."""
+    setup_django()
+    from django.core.management import call_command
+    from django.db import connection
+
+    queries = 0
+
+    def count_queries(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    with connection.execute_wrapper(count_queries):
+        call_command(command, *args, stdout=StringIO(), stderr=StringIO())
+    seconds = time.perf_counter() - started
+
+    # ru_maxrss у КБ (Linux); процеси --workers враховуються як дочірні
+    peak_kb = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    print(json.dumps({
+        "seconds": seconds,
+        "queries": queries,
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+    }))
+
+
+def run_child(db_path, *args):
+    env = {**os.environ, "DJANGO_DB_PATH": str(db_path)}
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", *args],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args[:2])}: {result.stderr.strip()}")
+    return result.stdout
+
+
+def generate(directory, size):
+    """Усі CSV для одного розміру. Повертає {назва: шлях}."""
+    files = {
+        name: str(directory / f"{name}.csv")
+        for name in (
+            "catottg", "kved", "kp", "job_titles", "employers", "vacancies"
+        )
+    }
+    locations = generators.write_catottg(files["catottg"], size)
+    kved_codes = generators.write_kved(files["kved"])
+    positions = generators.write_kp(files["kp"], files["job_titles"])
+    tax_ids = generators.write_employers(
+        files["employers"], size, kved_codes, locations
+    )
+    generators.write_vacancies(
+        files["vacancies"], size, tax_ids, positions, locations
+    )
+    return files
+
+
+def run_size(size, scenarios, keep_dir=None):
+    with tempfile.TemporaryDirectory(dir=keep_dir) as tmp:
+        directory = Path(tmp)
+        print(f"[{size}] генерація даних...", flush=True)
+        files = generate(directory, size)
+        db_path = directory / "bench.sqlite3"
+        run_child(db_path, "--child-setup", json.dumps(files))
+
+        for name, command, args in SCENARIOS:
+            if scenarios and name not in scenarios:
+                continue
+            args = [arg.format(**files) for arg in args]
+            output = run_child(
+                db_path, "--child-measure", command, *args
+            )
+            result = json.loads(output.strip().splitlines()[-1])
+            result.update(
+                scenario=name,
+                rows=size,
+                rows_per_sec=round(size / result["seconds"], 1),
+                seconds=round(result["seconds"], 3),
+            )
+            print(
+                f"[{size}] {name:<20} {result['seconds']:9.2f} с "
+                f"{result['rows_per_sec']:10.0f} рядків/с "
+                f"{result['peak_rss_mb']:8.1f} МБ "
+                f"{result['queries']:8} запитів",
+                flush=True,
+            )
+            yield result
+
+
+def compare(results, baseline, threshold):
+    """Порівнює з базовою лінією за (сценарій, розмір).
+
+    Регресія — падіння рядків/с більше ніж на `threshold` або зростання
+    кількості запитів. Повертає кількість регресій.
+    """
+    previous = {
+        (item["scenario"], item["rows"]): item for item in baseline["results"]
+    }
+    regressions = 0
+    print("\nПорівняння з базовою лінією:")
+    for result in results:
+        base = previous.get((result["scenario"], result["rows"]))
+        if base is None:
+            print(
+                f"  {result['scenario']:<20} {result['rows']:>8}  "
+                "немає в базовій лінії"
+            )
+            continue
+        speed = result["rows_per_sec"] / base["rows_per_sec"] - 1
+        rss = result["peak_rss_mb"] - base["peak_rss_mb"]
+        queries = result["queries"] - base["queries"]
+        regressed = speed < -threshold or queries > 0
+        regressions += regressed
+        print(
+            f"  {result['scenario']:<20} {result['rows']:>8}  "
+            f"швидкість {speed:+7.1%}  RSS {rss:+8.1f} МБ  "
+            f"запити {queries:+6}{'  РЕГРЕСІЯ' if regressed else ''}"
+        )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Кількість рядків у файлах (за замовчуванням: 10k, 100k, 1M)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=[name for name, _, _ in SCENARIOS],
+        help="Лише вказані сценарії (залежні все одно потребують попередніх)",
+    )
+    parser.add_argument(
+        "--output",
+        default="benchmarks/results.json",
+        help="Куди записати результати (JSON)",
+    )
+    parser.add_argument(
+        "--baseline", help="JSON попереднього запуску для порівняння"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Допустиме падіння рядків/с відносно базової лінії (0.1 = 10%%)",
+    )
+    parser.add_argument(
+        "--tmp-dir", help="Каталог для тимчасових файлів і баз"
+    )
+    parser.add_argument("--child-setup", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--child-measure", nargs=argparse.REMAINDER, help=argparse.SUPPRESS
+    )
+    options = parser.parse_args(argv)
+
+    if options.child_setup:
+        child_setup(json.loads(options.child_setup))
+        return 0
+    if options.child_measure:
+        command, *args = options.child_measure
+        child_measure(command, args)
+        return 0
+
+    results = []
+    for size in options.sizes:
+        results.extend(run_size(size, options.scenario, options.tmp_dir))
+
+    report = {
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nРезультати записано: {options.output}")
+
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, options.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ from django.db import models
 from django.utils.text import slugify
 
 
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.paginator import Page, Paginator, EmptyPage, PageNotAnInteger
 
 
 def upload_to(instance: models.Model, filename: str, folder_name: str) -> str:
@@ -14,12 +14,35 @@ def upload_to(instance: models.Model, filename: str, folder_name: str) -> str:
     return str(Path(folder_name) / unique_filename)
 
 
+class WindowPage(Page):
+    """Сторінка з номерами сусідніх сторінок для навігації."""
+
+    @property
+    def page_window(self):
+        # Лише кілька номерів довкола поточної: page_range на сотні тисяч
+        # рядків дає десятки тисяч сторінок, і шаблон перебирав би їх усі
+        return range(
+            max(self.number - 2, 1),
+            min(self.number + 2, self.paginator.num_pages) + 1,
+        )
+
+
+class WindowPaginator(Paginator):
+    """Paginator, чиї сторінки мають page_window.
+
+    Див. includes/pagination.html.
+    """
+
+    def _get_page(self, *args, **kwargs):
+        return WindowPage(*args, **kwargs)
+
+
 def get_paginated_page(request, queryset, per_page=20):
     """
     Універсальна функція для пагінації.
     Повертає page_obj для вказаного queryset.
     """
-    paginator = Paginator(queryset, per_page)
+    paginator = WindowPaginator(queryset, per_page)
     page_number = request.GET.get('page')
     
     try:
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import EmploymentType, EducationLevel, Degree, Tag, VacancySource
+from .models import (
+    EmploymentType, EducationLevel, Degree, Tag, VacancySource,
+    ReferenceDataState,
+)
 
 
 @admin.register(EmploymentType)
@@ -46,3 +49,11 @@ class VacancySourceAdmin(admin.ModelAdmin):
             return format_html('<img src="{}" style="max-height: 24px;"/>', obj.icon.url)
         return "-"
     icon_preview.short_description = "Іконка"
+
+
+@admin.register(ReferenceDataState)
+class ReferenceDataStateAdmin(admin.ModelAdmin):
+    list_display = ('stage', 'source_hash', 'restored', 'loaded_at')
+    readonly_fields = tuple(
+        field.name for field in ReferenceDataState._meta.fields
+    )
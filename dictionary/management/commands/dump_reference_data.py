@@ -0,0 +1,37 @@
+import os
+from django.core.management.base import BaseCommand
+from dictionary.reference_data import export_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        'Зберігає таблиці довідників у знімок для швидкого відновлення '
+        '(load_reference_data --snapshot)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='temp/reference_data.json.gz',
+            help='Файл знімка (за замовчуванням: temp/reference_data.json.gz)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['output']
+        hashes = export_snapshot(path)
+
+        for stage, digest in hashes.items():
+            if digest:
+                self.stdout.write(f'  {stage:<14} {digest[:12]}')
+            else:
+                # Невідомо, з якого файлу завантажено таблиці: з такого
+                # етапу знімок не відновлюється
+                self.stdout.write(self.style.WARNING(
+                    f'  {stage:<14} не завантажувався через '
+                    'load_reference_data, відновлення вимкнено'
+                ))
+        size = os.path.getsize(path) / 1024
+        self.stdout.write(self.style.SUCCESS(
+            f'Знімок збережено: {path} ({size:.0f} КБ)'
+        ))
@@ -0,0 +1,221 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+
+from dictionary.reference_data import (
+    STAGES, is_empty, loaded_hashes, mark_loaded, read_snapshot,
+    restore_stage, source_hash,
+)
+
+class Command(BaseCommand):
+    help = (
+        'Завантажує всі довідники (КАТОТТГ, КП, КВЕД, спеціальності...) '
+        'з урахуванням залежностей'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            type=str,
+            default='temp',
+            help='Каталог з файлами довідників (за замовчуванням: temp)'
+        )
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            default=4,
+            help=(
+                'Скільки незалежних етапів виконувати одночасно '
+                '(для SQLite завжди 1)'
+            ),
+        )
+        parser.add_argument(
+            '--skip',
+            action='append',
+            choices=list(STAGES),
+            default=[],
+            help='Пропустити етап (можна вказати кілька разів)'
+        )
+        parser.add_argument(
+            '--snapshot',
+            type=str,
+            help=(
+                'Знімок довідників (dump_reference_data): порожні таблиці '
+                'відновлюються з нього, якщо вихідний файл не змінився'
+            ),
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help=(
+                'Завантажувати етап, навіть якщо цей файл уже завантажено '
+                'в базу'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['jobs'] < 1:
+            raise CommandError('--jobs має бути більше 0')
+
+        jobs = options['jobs']
+        if connection.vendor == 'sqlite' and jobs > 1:
+            # SQLite дозволяє лише одного writer'а: паралельні
+            # завантаження впираються в блокування
+            self.stdout.write('SQLite: етапи виконуються послідовно')
+            jobs = 1
+
+        self.data_dir = options['data_dir']
+        self.force = options['force']
+        self.snapshot = None
+        if options['snapshot']:
+            try:
+                self.snapshot = read_snapshot(options['snapshot'])
+            except (OSError, ValueError) as e:
+                raise CommandError(
+                    'Не вдалося прочитати знімок '
+                    f'{options["snapshot"]}: {e}'
+                ) from e
+        self.loaded = loaded_hashes()
+        # Етапи, відновлені зі знімка в цьому запуску: лише на них можуть
+        # спиратися залежні етапи зі знімка (первинні ключі мають збігатися)
+        self.restored = set()
+        # Етапи, дані яких змінилися в цьому запуску: залежні від них
+        # завантажуються заново
+        self.changed = set()
+
+        stages = {
+            name: deps
+            for name, (_, _, deps, _) in STAGES.items()
+            if name not in options['skip']
+        }
+        # Пропущений етап вважається виконаним: його дані вже мають бути
+        # в базі
+        done = set(options['skip'])
+        failed = set()
+        timings = {}
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            running = {}
+            while stages or running:
+                # Запускаємо все, що має виконані залежності
+                for name, deps in list(stages.items()):
+                    if len(running) >= jobs:
+                        break
+                    if any(dep in failed for dep in deps):
+                        self.stdout.write(self.style.WARNING(
+                            f'{name}: пропущено, '
+                            f'бо не вдалось {", ".join(deps)}'
+                        ))
+                        failed.add(name)
+                        del stages[name]
+                    elif all(dep in done for dep in deps):
+                        running[executor.submit(self.run_stage, name)] = name
+                        del stages[name]
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    output, seconds, error = future.result()
+                    timings[name] = seconds
+                    self.stdout.write(f'=== {name} ({seconds:.1f} с) ===')
+                    self.stdout.write(output, ending='')
+                    if error:
+                        self.stdout.write(
+                            self.style.ERROR(f'{name}: {error}')
+                        )
+                        failed.add(name)
+                    else:
+                        done.add(name)
+        total = time.perf_counter() - started
+
+        self.stdout.write('\nЧас етапів:')
+        for name, seconds in timings.items():
+            status = 'помилка' if name in failed else 'ok'
+            self.stdout.write(f'  {name:<14} {seconds:8.1f} с  {status}')
+        self.stdout.write(f'  {"всього":<14} {total:8.1f} с')
+
+        if failed:
+            raise CommandError(f'Не завантажено: {", ".join(sorted(failed))}')
+        self.stdout.write(self.style.SUCCESS('Довідники завантажено'))
+
+    def run_stage(self, name):
+        """Виконує один етап у потоці пулу.
+
+        Повертає (вивід, секунди, помилка).
+        """
+        output = StringIO()
+        error = None
+        started = time.perf_counter()
+        try:
+            self.load_stage(name, output)
+        except Exception as e:
+            error = e
+        finally:
+            # Кожен потік має власне з'єднання з базою
+            connections.close_all()
+        return output.getvalue(), time.perf_counter() - started, error
+
+    def load_stage(self, name, output):
+        """Завантажує етап найдешевшим доступним способом.
+
+        Файл уже завантажено → нічого не робимо; таблиці порожні і знімок
+        зроблено з цього ж файлу → відновлюємо зі знімка; інакше —
+        завантажувач.
+        """
+        command, file_name, deps, _ = STAGES[name]
+        digest = source_hash(name, self.data_dir)
+
+        if (
+            digest
+            and not self.force
+            and self.loaded.get(name) == digest
+            and not any(dep in self.changed for dep in deps)
+        ):
+            output.write(
+                'Файл не змінився з останнього завантаження, пропущено\n'
+            )
+            return
+
+        snapshot = self.snapshot['stages'] if self.snapshot else {}
+        if (
+            digest
+            and snapshot.get(name, {}).get('source_hash') == digest
+            and all(dep in self.restored for dep in deps)
+            and is_empty(name)
+        ):
+            with transaction.atomic():
+                count = restore_stage(self.snapshot, name)
+                mark_loaded(name, digest, restored=True)
+            self.restored.add(name)
+            self.changed.add(name)
+            output.write(f'Відновлено зі знімка: {count} записів\n')
+            return
+
+        args = []
+        kwargs = {}
+        if file_name:
+            file_path = os.path.join(self.data_dir, file_name)
+            if command == 'load_speciality':
+                args.append(file_path)
+            else:
+                kwargs['file'] = file_path
+
+        # Завантажувачі повідомляють про помилку лише через CommandError:
+        # етап успішний, тільки якщо команда повернулась без винятку
+        call_command(command, *args, stdout=output, stderr=output, **kwargs)
+        self.changed.add(name)
+        # Хеш записується лише для перевіреного завантаження: інакше
+        # наступний запуск пропустить етап як уже завантажений
+        if is_empty(name):
+            raise CommandError('завантажувач не записав жодного рядка')
+        if digest:
+            mark_loaded(name, digest)
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0003_vacancysource"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceDataState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "stage",
+                    models.CharField(max_length=50, unique=True, verbose_name="Етап"),
+                ),
+                (
+                    "source_hash",
+                    models.CharField(max_length=64, verbose_name="SHA-256 джерела"),
+                ),
+                (
+                    "restored",
+                    models.BooleanField(
+                        default=False, verbose_name="Відновлено зі знімка"
+                    ),
+                ),
+                (
+                    "loaded_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Завантажено"),
+                ),
+            ],
+            options={
+                "verbose_name": "Стан довідника",
+                "verbose_name_plural": "Стан довідників",
+                "ordering": ["stage"],
+            },
+        ),
+    ]
@@ -84,3 +84,26 @@ class VacancySource(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class ReferenceDataState(models.Model):
+    """Вихідний файл, завантажений в етап довідників (load_reference_data)."""
+
+    stage = models.CharField(max_length=50, unique=True, verbose_name="Етап")
+    source_hash = models.CharField(
+        max_length=64, verbose_name="SHA-256 джерела"
+    )
+    restored = models.BooleanField(
+        default=False, verbose_name="Відновлено зі знімка"
+    )
+    loaded_at = models.DateTimeField(
+        auto_now=True, verbose_name="Завантажено"
+    )
+
+    class Meta:
+        ordering = ['stage']
+        verbose_name = "Стан довідника"
+        verbose_name_plural = "Стан довідників"
+
+    def __str__(self):
+        return self.stage
@@ -0,0 +1,177 @@
+"""Етапи завантаження довідників та знімок (snapshot) їхніх таблиць.
+
+Кожен етап — це команда-завантажувач, її вихідний файл і таблиці, які вона
+заповнює. Знімок зберігає ці таблиці разом з SHA-256 вихідних файлів, з
+яких їх було завантажено: якщо файл не змінився, етап відновлюється зі
+знімка пачками замість розбору CSV.
+"""
+
+import gzip
+import hashlib
+import importlib
+import json
+import os
+
+from django.apps import apps
+from django.core.management import get_commands
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from dictionary.models import ReferenceDataState
+
+SNAPSHOT_VERSION = 1
+BATCH_SIZE = 1000
+
+# Етап: (команда, файл у каталозі даних або None, етапи, від яких
+# залежить, таблиці). Етапи запускаються в цьому порядку: КП першим, бо за
+# ним чекають назви робіт.
+# Таблиці перелічені так, що батьківські йдуть перед дочірніми.
+STAGES = {
+    'kp': ('load_kp', 'classification_of_professions.csv', [], [
+        'position.Section', 'position.Subsection', 'position.Class',
+        'position.Subclass', 'position.Group', 'position.Position',
+    ]),
+    'catottg': ('load_catottg', 'kodifikator.csv', [], [
+        'location.Region', 'location.District', 'location.Community',
+        'location.Settlement', 'location.CityDistrict',
+    ]),
+    'kved': ('load_kved', 'dc_009_2010_1.csv', [], [
+        'kved.Section', 'kved.Division', 'kved.Group', 'kved.Class',
+    ]),
+    'speciality': ('load_speciality', 'speciality.csv', [], [
+        'speciality.KnowledgeField', 'speciality.Speciality',
+    ]),
+    'dictionaries': ('load_dictionaries', None, [], [
+        'dictionary.EmploymentType', 'dictionary.EducationLevel',
+        'dictionary.Degree', 'dictionary.Tag',
+    ]),
+    'job_titles': (
+        'load_job_titles',
+        'classification_of_professions_details.csv',
+        ['kp'],
+        ['position.JobTitle'],
+    ),
+}
+
+
+def source_path(stage, data_dir):
+    """Файл, з якого завантажується етап.
+
+    Для етапів без файлу — модуль самої команди.
+    """
+    command, file_name, _, _ = STAGES[stage]
+    if file_name:
+        return os.path.join(data_dir, file_name)
+    app_name = get_commands()[command]
+    module = f'{app_name}.management.commands.{command}'
+    return importlib.import_module(module).__file__
+
+
+def source_hash(stage, data_dir):
+    """SHA-256 вихідного файлу етапу або None, якщо файлу немає."""
+    path = source_path(stage, data_dir)
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def stage_models(stage):
+    return [apps.get_model(label) for label in STAGES[stage][3]]
+
+
+def is_empty(stage):
+    return not any(model.objects.exists() for model in stage_models(stage))
+
+
+def loaded_hashes():
+    """Повертає {етап: SHA-256 файлу, з якого його завантажено в базу}."""
+    return dict(
+        ReferenceDataState.objects.values_list('stage', 'source_hash')
+    )
+
+
+def mark_loaded(stage, digest, restored=False):
+    ReferenceDataState.objects.update_or_create(
+        stage=stage,
+        defaults={'source_hash': digest, 'restored': restored},
+    )
+
+
+def export_snapshot(path):
+    """Записує всі таблиці довідників у стиснутий JSON (по колонках).
+
+    Хеш джерела береться з ReferenceDataState: лише він гарантує, що дані
+    в базі справді завантажені з цього файлу. Повертає {етап: хеш або None}.
+    """
+    hashes = loaded_hashes()
+    snapshot = {'version': SNAPSHOT_VERSION, 'stages': {}}
+    for stage in STAGES:
+        tables = {}
+        for model in stage_models(stage):
+            fields = [field.attname for field in model._meta.concrete_fields]
+            tables[model._meta.label] = {
+                'fields': fields,
+                'rows': list(
+                    model.objects.order_by('pk').values_list(*fields)
+                ),
+            }
+        snapshot['stages'][stage] = {
+            'source_hash': hashes.get(stage), 'tables': tables
+        }
+
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(',', ':'))
+    return {
+        stage: data['source_hash']
+        for stage, data in snapshot['stages'].items()
+    }
+
+
+def read_snapshot(path):
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(
+            f'Непідтримувана версія знімка: {snapshot.get("version")} '
+            f'(очікується {SNAPSHOT_VERSION})'
+        )
+    return snapshot
+
+
+def restore_stage(snapshot, stage):
+    """Вставляє таблиці етапу зі знімка зі збереженням первинних ключів.
+
+    Таблиці мають бути порожніми. Значення у знімку вже в тому вигляді,
+    в якому їх повернула база (values_list), тому вставляються напряму
+    через executemany, без створення екземплярів моделей.
+    Повертає кількість вставлених рядків.
+    """
+    models = stage_models(stage)
+    tables = snapshot['stages'][stage]['tables']
+    quote = connection.ops.quote_name
+    count = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in models:
+            table = tables[model._meta.label]
+            columns = {
+                field.attname: field.column
+                for field in model._meta.concrete_fields
+            }
+            sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+                quote(model._meta.db_table),
+                ', '.join(quote(columns[name]) for name in table['fields']),
+                ', '.join(['%s'] * len(table['fields'])),
+            )
+            for start in range(0, len(table['rows']), BATCH_SIZE):
+                rows = table['rows'][start:start + BATCH_SIZE]
+                cursor.executemany(sql, rows)
+            count += len(table['rows'])
+
+        # Явні id: лічильники автоінкременту треба підтягнути (PostgreSQL)
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+    return count
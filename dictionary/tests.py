@@ -1,3 +1,87 @@
-from django.test import TestCase
+import tempfile
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.test import TransactionTestCase
+
+from dictionary.models import ReferenceDataState
+from dictionary.reference_data import STAGES
+from position.models import JobTitle
+from speciality.models import Speciality
+
+LOAD_SPECIALITY_LOGGER = 'speciality.management.commands.load_speciality'
+
+
+class LoadReferenceDataTests(TransactionTestCase):
+    """load_reference_data: залежності етапів і облік завантажених файлів.
+
+    Етапи виконуються в потоках з власним з'єднанням, тож тест не
+    загортається в транзакцію (TransactionTestCase).
+    """
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.data_dir = Path(tmp.name)
+
+    def load(self, *stages):
+        """Запускає лише етапи `stages`, повертає вивід команди."""
+        output = StringIO()
+        skip = []
+        for name in STAGES:
+            if name not in stages:
+                skip += ['--skip', name]
+        call_command(
+            'load_reference_data',
+            '--data-dir',
+            str(self.data_dir),
+            *skip,
+            stdout=output,
+        )
+        return output.getvalue()
+
+    def test_failed_stage_skips_dependents(self):
+        # Файлу КП немає: load_kp завершується CommandError, а назви
+        # робіт, що від нього залежать, не завантажуються
+        job_titles = self.data_dir / STAGES['job_titles'][1]
+        job_titles.write_text(
+            'КОД КП;ЗКППТР;ЄТКД;ДКХП;НАЗВА\n1110;1;2;;Керівник\n',
+            encoding='utf-8',
+        )
+        with self.assertRaisesMessage(CommandError, 'job_titles, kp'):
+            self.load('kp', 'job_titles')
+        self.assertFalse(JobTitle.objects.exists())
+
+    def test_failed_load_is_retried(self):
+        # Файл не в UTF-8: load_speciality падає, хеш файлу не
+        # записується, тож наступний запуск не вважає етап завантаженим
+        speciality = self.data_dir / STAGES['speciality'][1]
+        speciality.write_bytes('Галузь;Спеціальність\n'.encode('cp1251'))
+        for _ in range(2):
+            with (
+                self.assertLogs(LOAD_SPECIALITY_LOGGER, 'ERROR'),
+                self.assertRaisesMessage(CommandError, 'speciality'),
+            ):
+                self.load('speciality')
+            self.assertFalse(ReferenceDataState.objects.exists())
+
+        # Файл без жодної спеціальності — теж не успіх
+        speciality.write_text('Галузь;Спеціальність\n', encoding='utf-8')
+        with self.assertRaisesMessage(CommandError, 'speciality'):
+            self.load('speciality')
+        self.assertFalse(ReferenceDataState.objects.exists())
+
+        speciality.write_text(
+            'Галузь;Спеціальність\n01 Освіта;011 Освітні науки\n',
+            encoding='utf-8',
+        )
+        self.load('speciality')
+        self.assertTrue(Speciality.objects.filter(code='011').exists())
+        self.assertTrue(
+            ReferenceDataState.objects.filter(stage='speciality').exists()
+        )
+        self.assertIn(
+            'Файл не змінився з останнього завантаження',
+            self.load('speciality'),
+        )
@@ -0,0 +1,200 @@
+"""Пакетний імпорт роботодавців з CSV (витяг ЄДР).
+
+КВЕД та населені пункти завантажуються в пам'ять один раз, роботодавці
+записуються пачками через upsert по `tax_id`. Ненайдені коди не
+друкуються на кожен рядок, а збираються в підсумок (код → кількість).
+Рядки публічного списку вакансій оновлених роботодавців
+перебудовуються після кожної пачки (vacancy.listing).
+"""
+
+import re
+from collections import Counter
+
+from django.db import transaction
+
+from core.validation import column, empty, not_matching, regex_of, unknown
+from employer.models import Employer
+from kved.models import Class as KvedClass
+from location.lookups import SettlementLookup
+from vacancy.listing import sync_employers
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Поля, які імпорт перезаписує в існуючого роботодавця
+IMPORT_FIELDS = ["name", "owner", "kved", "location", "address"]
+
+# Формат tax_id — з валідатора моделі, як і в --dry-run
+TAX_ID_REGEX = re.compile(regex_of(Employer, "tax_id"))
+
+
+def rejection(row):
+    """Причина, з якої рядок не імпортується, або None."""
+    tax_id = row.get("tax_id", "").strip()
+    if not tax_id or not row.get("name", "").strip():
+        return "відсутній tax_id або name"
+    if not TAX_ID_REGEX.fullmatch(tax_id):
+        return "tax_id не з 8-10 цифр"
+    return None
+
+
+class BulkEmployerImporter:
+    """Перетворює рядки CSV на роботодавців та записує їх пачками.
+
+    Лічильники рахуються так само, як при послідовному `update_or_create`:
+    повтор `tax_id` у файлі вважається оновленням.
+    """
+
+    def __init__(
+        self, owner_id, batch_size=DEFAULT_BATCH_SIZE, on_error=None
+    ):
+        """`on_error(tax_id, exception)` — для рядків, що не записались."""
+        self.owner_id = owner_id
+        self.batch_size = batch_size
+        self.on_error = on_error
+        self.kveds = dict(KvedClass.objects.values_list("code", "id"))
+        self.locations = SettlementLookup()
+        self.missing_kved = Counter()
+        self.missing_locations = Counter()
+        self.pending = []
+        self.created = 0
+        self.updated = 0
+        self.errors = 0
+
+    def resolve(self, row):
+        """Незбережений Employer або None, якщо рядок не імпортується."""
+        tax_id = row.get("tax_id", "").strip()
+        name = row.get("name", "").strip()
+        kved_code = row.get("kved_code", "").strip()
+        settlement_code = row.get("settlement_code", "").strip()
+
+        if rejection(row):
+            return None
+
+        kved_id = None
+        if kved_code:
+            kved_id = self.kveds.get(kved_code)
+            if kved_id is None:
+                self.missing_kved[kved_code] += 1
+
+        location_id = None
+        if settlement_code:
+            location_id = self.locations.get(settlement_code)
+            if location_id is None:
+                self.missing_locations[settlement_code] += 1
+
+        return Employer(
+            tax_id=tax_id,
+            name=name,
+            owner_id=self.owner_id,
+            kved_id=kved_id,
+            location_id=location_id,
+            address=row.get("address", "").strip(),
+        )
+
+    def add(self, employer):
+        self.pending.append(employer)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Записує накопичену пачку однією транзакцією."""
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+
+        existing = dict(
+            Employer.objects.filter(
+                tax_id__in={e.tax_id for e in batch}
+            ).values_list("tax_id", "id")
+        )
+        # Останній рядок з тим самим tax_id перемагає
+        unique = {}
+        created = updated = 0
+        for employer in batch:
+            if employer.tax_id in existing or employer.tax_id in unique:
+                updated += 1
+            else:
+                created += 1
+            unique[employer.tax_id] = employer
+
+        try:
+            with transaction.atomic():
+                Employer.objects.bulk_create(
+                    unique.values(),
+                    update_conflicts=True,
+                    unique_fields=["tax_id"],
+                    update_fields=[*IMPORT_FIELDS, "updated_at"],
+                )
+                # bulk_create не надсилає post_save, тож рядки публічного
+                # списку вакансій оновлених роботодавців — тут
+                sync_employers(existing.values())
+        except Exception:
+            # Пачка не пройшла: пишемо по рядку, щоб ізолювати помилкові
+            for employer in batch:
+                self._write_one(employer)
+            return
+
+        self.created += created
+        self.updated += updated
+
+    def _write_one(self, employer):
+        defaults = {
+            field.attname: getattr(employer, field.attname)
+            for field in map(Employer._meta.get_field, IMPORT_FIELDS)
+        }
+        try:
+            with transaction.atomic():
+                _, created = Employer.objects.update_or_create(
+                    tax_id=employer.tax_id, defaults=defaults
+                )
+        except Exception as e:
+            self.errors += 1
+            if self.on_error:
+                self.on_error(employer.tax_id, e)
+            return
+        if created:
+            self.created += 1
+        else:
+            self.updated += 1
+
+
+class EmployerValidator:
+    """Перевірка пачки рядків без запису (--dry-run), по колонках."""
+
+    def __init__(self, report):
+        """Результати перевірки додаються в `report` (DryRunReport)."""
+        self.report = report
+        self.kveds = set(KvedClass.objects.values_list("code", flat=True))
+        self.locations = SettlementLookup()
+        self.tax_id_regex = regex_of(Employer, "tax_id")
+
+    def __call__(self, numbers, rows):
+        report = self.report
+        report.rows += len(rows)
+
+        tax_ids = column(rows, "tax_id")
+        incomplete = sorted({*empty(tax_ids), *empty(column(rows, "name"))})
+        report.check(
+            "error", "Відсутній tax_id або name", numbers, incomplete
+        )
+        report.check(
+            "error",
+            "tax_id не з 8-10 цифр",
+            numbers,
+            not_matching(tax_ids, self.tax_id_regex),
+        )
+        report.check(
+            "warning",
+            "КВЕД не знайдено",
+            numbers,
+            unknown(column(rows, "kved_code"), self.kveds.__contains__),
+        )
+        report.check(
+            "warning",
+            "Населений пункт або район міста не знайдено",
+            numbers,
+            unknown(
+                column(rows, "settlement_code"),
+                lambda code: self.locations.get(code) is not None,
+            ),
+        )
@@ -5,6 +5,10 @@ from django.contrib.auth import get_user_model
 from employer.models import Employer
 from kved.models import Class as KvedClass
 from location.models import Settlement, CityDistrict
+from core.validation import DryRunReport, validate_csv
+from employer.importer import (
+    DEFAULT_BATCH_SIZE, BulkEmployerImporter, EmployerValidator, rejection,
+)
 
 User = get_user_model()
 
@@ -14,6 +18,31 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='Шлях до CSV файлу')
         parser.add_argument('--owner', type=str, help='Email власника для всіх роботодавців (за замовчуванням: admin@admin.admin)')
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help=(
+                'Пакетний режим: КВЕД і локації в пам\'яті, upsert пачками '
+                'по tax_id, підсумок ненайдених кодів'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість рядків у пачці запису для --bulk '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help=(
+                'Лише перевірити файл і показати, які рядки буде відхилено, '
+                'без запису в БД'
+            ),
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file']
@@ -23,12 +52,20 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'Файл не знайдено: {csv_file_path}'))
             return
 
+        if options['dry_run']:
+            self.dry_run(csv_file_path, options)
+            return
+
         try:
             owner = User.objects.get(email=owner_email)
         except User.DoesNotExist:
             self.stdout.write(self.style.ERROR(f'Користувача з email {owner_email} не знайдено.'))
             return
 
+        if options['bulk']:
+            self.import_bulk(csv_file_path, owner, options)
+            return
+
         with open(csv_file_path, 'r', encoding='utf-8-sig') as f:
             reader = csv.DictReader(f, delimiter=';')
             
@@ -43,8 +80,9 @@ class Command(BaseCommand):
                 settlement_code = row.get('settlement_code', '').strip()
                 address = row.get('address', '').strip()
 
-                if not tax_id or not name:
-                    self.stdout.write(self.style.WARNING(f'Пропущено рядок: відсутній tax_id або name ({row})'))
+                reason = rejection(row)
+                if reason:
+                    self.stdout.write(self.style.WARNING(f'Пропущено рядок: {reason} ({row})'))
                     error_count += 1
                     continue
 
@@ -90,3 +128,79 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(
                 f'Імпорт завершено. Створено: {created_count}, Оновлено: {updated_count}, Помилок: {error_count}'
             ))
+
+    def import_bulk(self, csv_file_path, owner, options):
+        """Пакетний імпорт: без запитів до БД на кожен рядок."""
+        if options['batch_size'] < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        importer = BulkEmployerImporter(
+            owner.pk,
+            batch_size=options['batch_size'],
+            on_error=lambda tax_id, e: self.stdout.write(
+                self.style.ERROR(f'Помилка при імпорті {tax_id}: {e}')
+            ),
+        )
+
+        with open(csv_file_path, encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f, delimiter=';')
+
+            for row in reader:
+                employer = importer.resolve(row)
+                if employer is None:
+                    self.stdout.write(self.style.WARNING(
+                        f'Пропущено рядок: {rejection(row)} ({row})'
+                    ))
+                    importer.errors += 1
+                    continue
+                importer.add(employer)
+
+            importer.flush()
+
+        verbosity = options['verbosity']
+        self.write_missing(
+            'КВЕД не знайдено', importer.missing_kved, verbosity
+        )
+        self.write_missing(
+            'Населений пункт або район міста не знайдено',
+            importer.missing_locations,
+            verbosity,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Імпорт завершено. Створено: {importer.created}, '
+            f'Оновлено: {importer.updated}, Помилок: {importer.errors}'
+        ))
+
+    def dry_run(self, csv_file_path, options):
+        """Перевірка всього файлу пачками, без запису."""
+        if options['batch_size'] < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        report = DryRunReport()
+        validate_csv(
+            csv_file_path, EmployerValidator(report), options['batch_size']
+        )
+        report.write(self.stdout, self.style, options['verbosity'])
+
+    def write_missing(self, title, counter, verbosity, limit=20):
+        """Підсумок ненайдених кодів: код → кількість рядків.
+
+        Показує перші `limit` кодів, усі — при -v 2.
+        """
+        if not counter:
+            return
+        self.stdout.write(self.style.WARNING(
+            f'{title}: {len(counter)} кодів у {sum(counter.values())} рядках'
+        ))
+        shown = counter.most_common(None if verbosity >= 2 else limit)
+        for code, count in shown:
+            self.stdout.write(f'  {code}: {count}')
+        if len(shown) < len(counter):
+            rest = len(counter) - len(shown)
+            self.stdout.write(f'  ... ще {rest} (див. -v 2)')
@@ -1,3 +1,64 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from employer.models import Employer
+
+HEADER = ('tax_id', 'name', 'kved_code')
+ROWS = (
+    ('12345678', 'ТОВ "Перше"', ''),
+    ('22222222', '', ''),  # Без назви
+    ('12AB', 'ТОВ "Друге"', ''),  # tax_id не з 8-10 цифр
+    ('', 'ТОВ "Третє"', ''),  # Без tax_id
+    ('1234567890', 'ФОП Іваненко', '99.99'),  # Невідомий КВЕД
+)
+
+
+class ImportEmployersTests(TestCase):
+    """import_employers: --dry-run відхиляє ті ж рядки, що й імпорт."""
+
+    @classmethod
+    def setUpTestData(cls):
+        get_user_model().objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin'
+        )
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'employers.csv'
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';', lineterminator='\n')
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+
+    def import_employers(self, *args, **options):
+        output = StringIO()
+        call_command(
+            'import_employers', str(self.path), *args,
+            owner='admin@example.com', stdout=output, **options,
+        )
+        return output.getvalue()
+
+    def test_dry_run_rejects_match_import(self):
+        output = self.import_employers('--dry-run', verbosity=2)
+        self.assertIn('Буде відхилено: 3, з попередженнями: 1', output)
+        self.assertIn('Відсутній tax_id або name: 2 (рядки 3, 5)', output)
+        self.assertIn('tax_id не з 8-10 цифр: 1 (рядки 4)', output)
+        self.assertFalse(Employer.objects.exists())
+
+        for args in ([], ['--bulk']):
+            with self.subTest(args):
+                output = self.import_employers(*args)
+                self.assertIn('Помилок: 3', output)
+                # Записано рівно ті рядки, які --dry-run не відхилив
+                self.assertEqual(
+                    sorted(Employer.objects.values_list('tax_id', flat=True)),
+                    ['12345678', '1234567890'],
+                )
+                Employer.objects.all().delete()
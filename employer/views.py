@@ -2,7 +2,7 @@ from django.views.generic import ListView, DetailView, UpdateView
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy
 from .models import Employer
-from core.utils import get_paginated_page
+from core.utils import WindowPaginator, get_paginated_page
 
 class EmployerListView(ListView):
     """Список роботодавців з використанням Class-Based Views"""
@@ -10,6 +10,7 @@ class EmployerListView(ListView):
     template_name = "employer/list.html"
     context_object_name = "employers"
     paginate_by = 9
+    paginator_class = WindowPaginator
     queryset = Employer.objects.select_related(
         "location__community__district__region", 
         "kved"
@@ -1,3 +1,69 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from kved.models import Class, Division, Group, Section
+
+# У вивантаженні назви колонок у лапках і з переносами рядків
+HEADER = [
+    'Код секції\n', 'Код розділу\n', 'Код групи\n', 'Код класу\n', 'Назва',
+]
+
+# Рядки навмисно не відсортовані: нащадки йдуть раніше за батьків
+ROWS = [
+    ['A', '01', '01.1', '01.11', 'Вирощування зернових культур'],
+    ['A', '01', '01.1', '', 'Вирощування однорічних культур'],
+    ['A', '', '', '', 'Сільське господарство'],
+    ['A', '01', '', '', 'Рослинництво і тваринництво'],
+    ['A', '01', '01.1', '01.12', 'Вирощування рису'],
+    # Група, розділу якої немає у файлі
+    ['B', '05', '05.1', '', 'Добування кам’яного вугілля'],
+]
+
+
+class LoadKvedTests(TestCase):
+    """load_kved на невеликому невідсортованому файлі."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'kved.csv'
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';', lineterminator='\n')
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+
+    def load(self):
+        output = StringIO()
+        call_command('load_kved', file=str(self.path), stdout=output)
+        return output.getvalue()
+
+    def test_unsorted_input(self):
+        output = self.load()
+        self.assertEqual(
+            list(
+                Class.objects.order_by('code').values_list(
+                    'code', 'group__code', 'group__division__code',
+                    'group__division__section__code',
+                )
+            ),
+            [
+                ('01.11', '01.1', '01', 'A'),
+                ('01.12', '01.1', '01', 'A'),
+            ],
+        )
+        self.assertFalse(Group.objects.filter(code='05.1').exists())
+        self.assertIn('Parent Division 05 not found for Group 05.1', output)
+        self.assertIn('Errors: 1', output)
+
+    def test_reload_is_idempotent(self):
+        self.load()
+        models = (Section, Division, Group, Class)
+        counts = [model.objects.count() for model in models]
+        self.assertEqual(counts, [1, 1, 1, 2])
+        self.load()
+        self.assertEqual([model.objects.count() for model in models], counts)
@@ -0,0 +1,21 @@
+from location.models import CityDistrict, Settlement
+
+
+class SettlementLookup:
+    """Код КАТОТТГ → id населеного пункту, завантажені в пам'ять один раз.
+
+    Код району в місті (B) повертає місто, до якого район належить.
+    """
+
+    def __init__(self):
+        """Завантажує обидві мапи двома запитами."""
+        self.settlements = dict(Settlement.objects.values_list("code", "id"))
+        self.city_districts = dict(
+            CityDistrict.objects.values_list("code", "settlement_id")
+        )
+
+    def get(self, code):
+        settlement_id = self.settlements.get(code)
+        if settlement_id is None:
+            settlement_id = self.city_districts.get(code)
+        return settlement_id
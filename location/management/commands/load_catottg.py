@@ -1,16 +1,19 @@
 import csv
 import os
-from django.core.management.base import BaseCommand
-from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from location.models import Region, District, Community, Settlement, CityDistrict
 
+BATCH_SIZE = 1000
+
+
 class Command(BaseCommand):
     help = 'Load CATOTTG data from CSV file'
 
     def add_arguments(self, parser):
         parser.add_argument(
-            '--file', 
-            type=str, 
+            '--file',
+            type=str,
             default='temp/kodifikator.csv',
             help='Path to the CATOTTG CSV file'
         )
@@ -18,120 +21,123 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         file_path = options['file']
         if not os.path.exists(file_path):
-            self.stdout.write(self.style.ERROR(f'File not found: {file_path}'))
-            return
+            raise CommandError(f'File not found: {file_path}')
 
         self.stdout.write(f'Loading data from {file_path}...')
 
-        # We will do multiple passes to ensure parents exist
-        # Pass 1: Regions (O, K)
-        # Pass 2: Districts (P)
-        # Pass 3: Communities (H)
-        # Pass 4: Settlements (M, T, C, X)
-        # Pass 5: City Districts (B)
-        
-        categories_order = [
-            ['O', 'K'], # Regions
-            ['P'],      # Districts
-            ['H'],      # Communities
-            ['M', 'T', 'C', 'X'], # Settlements
-            ['B']       # City Districts
+        # Single pass: build the whole tree in memory as
+        # {code: (parent_code, fields)} per level, first occurrence wins
+        regions = {}
+        districts = {}
+        communities = {}
+        settlements = {}
+        city_districts = {}
+
+        # CATOTTG CSV Headers:
+        # Перший рівень;Другий рівень;Третій рівень;Четвертий рівень;
+        # Додатковий рівень;Категорія об’єкта;Назва об’єкта
+        with open(file_path, encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f, delimiter=';')
+            for row in reader:
+                cat = row["Категорія об’єкта"]
+                name = row["Назва об’єкта"]
+
+                if cat in ['O', 'K']: # Region
+                    code = row["Перший рівень"]
+                    if code in regions:
+                        continue
+                    regions[code] = (None, {'name': name, 'category': cat})
+
+                    # Для міст зі спеціальним статусом (Київ, Севастополь)
+                    # CATOTTG часто використовує той самий код на всіх
+                    # рівнях. Щоб вони були доступні як Settlement,
+                    # створимо технічні District та Community. Вони мають
+                    # пріоритет над звичайними записами з тим самим кодом.
+                    if cat == 'K':
+                        districts[code] = (code, {'name': name})
+                        communities[code] = (code, {'name': name})
+                        settlements[code] = (
+                            code, {'name': name, 'category': 'M'}
+                        )
+
+                elif cat == 'P': # District
+                    districts.setdefault(
+                        row["Другий рівень"],
+                        (row["Перший рівень"], {'name': name})
+                    )
+
+                elif cat == 'H': # Community
+                    communities.setdefault(
+                        row["Третій рівень"],
+                        (row["Другий рівень"], {'name': name})
+                    )
+
+                elif cat in ['M', 'T', 'C', 'X']: # Settlement
+                    settlements.setdefault(
+                        row["Четвертий рівень"],
+                        (
+                            row["Третій рівень"],
+                            {'name': name, 'category': cat},
+                        )
+                    )
+
+                elif cat == 'B': # City District
+                    city_districts.setdefault(
+                        row["Додатковий рівень"],
+                        (row["Четвертий рівень"], {'name': name})
+                    )
+
+        # Level by level: parents of each level are already in the DB,
+        # their ids come back from bulk_create of the previous level
+        levels = [
+            (Region, regions, None),
+            (District, districts, 'region'),
+            (Community, communities, 'district'),
+            (Settlement, settlements, 'community'),
+            (CityDistrict, city_districts, 'settlement'),
         ]
 
         total_created = 0
+        parent_ids = {}
+        with transaction.atomic():
+            for model, items, parent_field in levels:
+                parent_ids, created, existing, orphans = self.insert_level(
+                    model, items, parent_field, parent_ids
+                )
+                total_created += created
+                self.stdout.write(self.style.SUCCESS(
+                    f'{model.__name__}: created {created}, '
+                    f'already present {existing}'
+                ))
+                if orphans:
+                    self.stdout.write(self.style.WARNING(
+                        f'{model.__name__}: skipped {orphans} items '
+                        'without parent'
+                    ))
 
-        # Read all rows into memory to avoid opening file multiple times (file is ~3MB, usually fine)
-        # If file is huge, we would loop file multiple times. 3MB is tiny.
-        with open(file_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f, delimiter=';')
-            rows = list(reader)
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully finished. Created {total_created} items.'
+        ))
 
-        for pass_cats in categories_order:
-            self.stdout.write(f'Processing categories: {pass_cats}...')
-            count = 0
-            for row in rows:
-                cat = row["Категорія об’єкта"]
-                if cat not in pass_cats:
+    def insert_level(self, model, items, parent_field, parent_ids):
+        """Bulk-insert missing objects of one level, return code → id map."""
+        ids = dict(model.objects.values_list('code', 'id'))
+        existing = 0
+        orphans = 0
+        new_objects = []
+
+        for code, (parent_code, fields) in items.items():
+            if code in ids:
+                existing += 1
+                continue
+            if parent_field:
+                parent_id = parent_ids.get(parent_code)
+                if parent_id is None:
+                    orphans += 1
                     continue
-                
-                name = row["Назва об’єкта"]
-                
-                # CATOTTG CSV Headers:
-                # Перший рівень;Другий рівень;Третій рівень;Четвертий рівень;Додатковий рівень;Категорія об’єкта;Назва об’єкта
-                
-                # Check level based on category to find current code and parent
-                try:
-                    if cat in ['O', 'K']: # Region
-                        code = row["Перший рівень"]
-                        region, _ = Region.objects.get_or_create(
-                            code=code,
-                            defaults={'name': name, 'category': cat}
-                        )
-                        
-                        # Для міст зі спеціальним статусом (Київ, Севастополь) 
-                        # CATOTTG часто використовує той самий код на всіх рівнях.
-                        # Щоб вони були доступні як Settlement, створимо технічні District та Community.
-                        if cat == 'K':
-                            district, _ = District.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'region': region}
-                            )
-                            community, _ = Community.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'district': district}
-                            )
-                            Settlement.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'category': 'M', 'community': community}
-                            )
-                    
-                    elif cat == 'P': # District
-                        code = row["Другий рівень"]
-                        parent_code = row["Перший рівень"]
-                        parent = Region.objects.filter(code=parent_code).first()
-                        if parent:
-                            District.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'region': parent}
-                            )
-                    
-                    elif cat == 'H': # Community
-                        code = row["Третій рівень"]
-                        parent_code = row["Другий рівень"]
-                        # Sometimes Communities are direct children of Regions? (unlikely in new reform, but check)
-                        # Actually in new reform: Region -> District -> Community.
-                        parent = District.objects.filter(code=parent_code).first()
-                        if parent:
-                            Community.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'district': parent}
-                            )
-                    
-                    elif cat in ['M', 'T', 'C', 'X']: # Settlement
-                        code = row["Четвертий рівень"]
-                        parent_code = row["Третій рівень"]
-                        parent = Community.objects.filter(code=parent_code).first()
-                        if parent:
-                            Settlement.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'category': cat, 'community': parent}
-                            )
-                    
-                    elif cat == 'B': # City District
-                        code = row["Додатковий рівень"]
-                        parent_code = row["Четвертий рівень"]
-                        parent = Settlement.objects.filter(code=parent_code).first()
-                        if parent:
-                            CityDistrict.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'settlement': parent}
-                            )
-                    
-                    count += 1
-                except Exception as e:
-                    self.stdout.write(self.style.WARNING(f'Error processing {name} ({cat}): {e}'))
-
-            self.stdout.write(self.style.SUCCESS(f'Processed {count} items for categories {pass_cats}'))
-            total_created += count
-
-        self.stdout.write(self.style.SUCCESS(f'Successfully finished. processed {total_created} items.'))
+                fields = {**fields, f'{parent_field}_id': parent_id}
+            new_objects.append(model(code=code, **fields))
+
+        model.objects.bulk_create(new_objects, batch_size=BATCH_SIZE)
+        ids.update((obj.code, obj.pk) for obj in new_objects)
+        return ids, len(new_objects), existing, orphans
@@ -1,3 +1,113 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from location.models import (
+    CityDistrict,
+    Community,
+    District,
+    Region,
+    Settlement,
+)
+
+HEADER = [
+    'Перший рівень', 'Другий рівень', 'Третій рівень', 'Четвертий рівень',
+    'Додатковий рівень', 'Категорія об’єкта', 'Назва об’єкта',
+]
+REGION = 'UA01000000000013043'
+DISTRICT = 'UA01020000000022387'
+COMMUNITY = 'UA01020010000036461'
+CITY = 'UA01020010010055486'
+KYIV = 'UA80000000000093317'
+MODELS = (Region, District, Community, Settlement, CityDistrict)
+
+ROWS = [
+    [REGION, '', '', '', '', 'O', 'Автономна Республіка Крим'],
+    [REGION, DISTRICT, '', '', '', 'P', 'Бахчисарайський'],
+    [REGION, DISTRICT, COMMUNITY, '', '', 'H', 'Бахчисарайська'],
+    # Район у місті йде раніше за саме місто: батьки знаходяться
+    # після читання всього файлу
+    [
+        REGION, DISTRICT, COMMUNITY, CITY, 'UA01020010010077777', 'B',
+        'Центральний',
+    ],
+    [REGION, DISTRICT, COMMUNITY, CITY, '', 'M', 'Бахчисарай'],
+    [
+        REGION, DISTRICT, COMMUNITY, 'UA01020010020011111', '', 'X',
+        'Дубки',
+    ],
+    # Населений пункт громади, якої немає у файлі
+    [
+        REGION, DISTRICT, 'UA01020099999999999', 'UA01020099990000001',
+        '', 'C', 'Сирота',
+    ],
+    # Місто зі спеціальним статусом і його район
+    [KYIV, '', '', '', '', 'K', 'Київ'],
+    [KYIV, '', '', KYIV, 'UA80000000000126643', 'B', 'Голосіївський'],
+]
+
+
+class LoadCatottgTests(TestCase):
+    """load_catottg на невеликому кодифікаторі."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'kodifikator.csv'
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';', lineterminator='\n')
+            writer.writerow(HEADER)
+            writer.writerows(ROWS)
+
+    def load(self):
+        output = StringIO()
+        call_command('load_catottg', file=str(self.path), stdout=output)
+        return output.getvalue()
+
+    def test_parents(self):
+        output = self.load()
+        city = Settlement.objects.get(code=CITY)
+        self.assertEqual(
+            (
+                city.category,
+                city.community.code,
+                city.community.district.code,
+                city.community.district.region.code,
+            ),
+            ('M', COMMUNITY, DISTRICT, REGION),
+        )
+        self.assertEqual(
+            CityDistrict.objects.get(name='Центральний').settlement, city
+        )
+        self.assertFalse(Settlement.objects.filter(name='Сирота').exists())
+        self.assertIn('Settlement: skipped 1 items without parent', output)
+
+    def test_special_status_city(self):
+        # Київ — регіон, а також технічні район, громада і населений пункт
+        # з тим самим кодом, до якого прив'язані райони в місті
+        self.load()
+        self.assertEqual(Region.objects.get(code=KYIV).category, 'K')
+        kyiv = Settlement.objects.get(code=KYIV)
+        self.assertEqual(
+            (
+                kyiv.category,
+                kyiv.community.code,
+                kyiv.community.district.code,
+                kyiv.community.district.region.code,
+            ),
+            ('M', KYIV, KYIV, KYIV),
+        )
+        self.assertEqual(
+            CityDistrict.objects.get(name='Голосіївський').settlement, kyiv
+        )
+
+    def test_reload_is_idempotent(self):
+        self.load()
+        counts = [model.objects.count() for model in MODELS]
+        self.assertEqual(counts, [2, 2, 2, 3, 2])
+        self.assertIn('Created 0 items', self.load())
+        self.assertEqual([model.objects.count() for model in MODELS], counts)
@@ -1,8 +1,15 @@
 import csv
 import os
-from django.core.management.base import BaseCommand
+from collections import Counter, defaultdict
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from position.models import Position, Group, Subclass, JobTitle
 
+BATCH_SIZE = 1000
+UPDATE_FIELDS = [
+    'zkpptr_code', 'etkd_issue', 'dkhp_issue', 'position', 'group', 'subclass'
+]
+
 class Command(BaseCommand):
     help = 'Load Job Titles (Detailed) from CSV file'
 
@@ -17,27 +24,38 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         file_path = options['file']
         if not os.path.exists(file_path):
-            self.stdout.write(self.style.ERROR(f'File not found: {file_path}'))
-            return
+            raise CommandError(f'File not found: {file_path}')
 
         self.stdout.write(f'Loading data from {file_path}...')
         
-        # Cache for performance
-        # Using codes as keys. Note: Code is not unique for Position, so we store ids as list or first match?
-        # Standard says codes are shared by positions in the same group usually. 
-        # But for linking, if we have 1120.1, we link to ANY 1120.1 position? 
-        # Ideally we match exact one, but if multiple positions have same code (rare but possible now), 
-        # we just pick one. For this task, picking first match is acceptable heuristic. 
-        
-        # However, we just added db_index=True to Position.code, so easy to lookup.
-        # caching 1000s of objects might be faster.
-        
-        count = 0
-        errors = 0
+        # Parents are resolved from code → id maps loaded once. Codes are not
+        # unique for Position, the first match (by id) is used as before.
+        self.parent_ids = {
+            'position': self.code_map(Position),
+            'group': self.code_map(Group),
+            'subclass': self.code_map(Subclass),
+        }
+        # (code, name) → ids of titles already in the table, and their
+        # current values so that unchanged titles are not rewritten
+        self.attnames = [
+            JobTitle._meta.get_field(field).attname for field in UPDATE_FIELDS
+        ]
+        self.existing = defaultdict(list)
+        self.current = {}
+        titles = JobTitle.objects.order_by('pk').values_list(
+            'pk', 'code', 'name', *self.attnames
+        )
+        for pk, code, name, *values in titles:
+            self.existing[(code, name)].append(pk)
+            self.current[pk] = tuple(values)
+
+        self.count = 0
+        self.errors = 0
+        batch = []
         
         with open(file_path, 'r', encoding='utf-8-sig') as f:
             reader = csv.reader(f, delimiter=';')
-            headers = next(reader, None) # Skip header
+            next(reader, None)  # Skip header
             
             # CSV Headers index guess based on inspection:
             # 0: CODE (e.g. "1110 ")
@@ -65,36 +83,118 @@ class Command(BaseCommand):
                 if not name:
                     continue
                     
-                # Try to find parent
-                pos_obj = Position.objects.filter(code=raw_code).first()
-                group_obj = None
-                subclass_obj = None
-                
-                if not pos_obj:
-                    group_obj = Group.objects.filter(code=raw_code).first()
-                    
-                if not pos_obj and not group_obj:
-                    subclass_obj = Subclass.objects.filter(code=raw_code).first()
-                
-                # Create JobTitle
-                try:
-                    JobTitle.objects.update_or_create(
-                        code=raw_code,
-                        name=name,
-                        defaults={
-                            'zkpptr_code': zkpptr,
-                            'etkd_issue': etkd,
-                            'dkhp_issue': dkhp,
-                            'position': pos_obj,
-                            'group': group_obj,
-                            'subclass': subclass_obj
-                        }
-                    )
-                    count += 1
-                    if count % 1000 == 0:
-                        self.stdout.write(f'Processed {count} records...')
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f'Error creating {name} ({raw_code}): {e}'))
-                    errors += 1
-
-        self.stdout.write(self.style.SUCCESS(f'Successfully processed {count} records. Errors: {errors}'))
+                batch.append(self.resolve(raw_code, name, zkpptr, etkd, dkhp))
+                if len(batch) >= BATCH_SIZE:
+                    self.flush(batch)
+                    batch = []
+
+        self.flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully processed {self.count} records. '
+            f'Errors: {self.errors}'
+        ))
+
+    def code_map(self, model):
+        ids = {}
+        codes = model.objects.order_by('pk').values_list('code', 'pk')
+        for code, pk in codes:
+            ids.setdefault(code, pk)
+        return ids
+
+    def resolve(self, code, name, zkpptr, etkd, dkhp):
+        """Unsaved JobTitle linked to a parent with this code.
+
+        Position is preferred, then Group, then Subclass.
+        """
+        title = JobTitle(
+            code=code,
+            name=name,
+            zkpptr_code=zkpptr,
+            etkd_issue=etkd,
+            dkhp_issue=dkhp,
+        )
+        for field in ('position', 'group', 'subclass'):
+            parent_id = self.parent_ids[field].get(code)
+            if parent_id is not None:
+                setattr(title, f'{field}_id', parent_id)
+                break
+        return title
+
+    def flush(self, batch):
+        """Upsert a batch keyed on (code, name).
+
+        New titles go through bulk_create, changed ones through bulk_update.
+        """
+        if not batch:
+            return
+
+        # The last row with the same (code, name) wins, like sequential
+        # update_or_create. Counts are per input row on both paths.
+        titles = {}
+        rows = Counter()
+        for title in batch:
+            key = (title.code, title.name)
+            if len(self.existing.get(key, ())) > 1:
+                self.stdout.write(self.style.ERROR(
+                    f'Error creating {title.name} ({title.code}): '
+                    f'{len(self.existing[key])} job titles with this code '
+                    'and name already exist'
+                ))
+                self.errors += 1
+                continue
+            titles[key] = title
+            rows[key] += 1
+
+        new_titles = []
+        changed_titles = []
+        for key, title in titles.items():
+            if key in self.existing:
+                title.pk = self.existing[key][0]
+                if self.current.get(title.pk) != self.values(title):
+                    changed_titles.append(title)
+            else:
+                new_titles.append(title)
+
+        try:
+            with transaction.atomic():
+                JobTitle.objects.bulk_create(new_titles)
+                JobTitle.objects.bulk_update(changed_titles, UPDATE_FIELDS)
+        except Exception:
+            # Find the failing rows one by one
+            for key, title in titles.items():
+                if self.write_one(title):
+                    self.count += rows[key]
+                else:
+                    self.errors += rows[key]
+        else:
+            for title in new_titles:
+                self.existing[(title.code, title.name)].append(title.pk)
+            for title in (*new_titles, *changed_titles):
+                self.current[title.pk] = self.values(title)
+            self.count += rows.total()
+        self.stdout.write(f'Processed {self.count} records...')
+
+    def values(self, title):
+        return tuple(getattr(title, name) for name in self.attnames)
+
+    def write_one(self, title):
+        """Write one title with update_or_create, return success."""
+        try:
+            with transaction.atomic():
+                obj, _ = JobTitle.objects.update_or_create(
+                    code=title.code,
+                    name=title.name,
+                    defaults=dict(
+                        zip(self.attnames, self.values(title), strict=True)
+                    ),
+                )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(
+                f'Error creating {title.name} ({title.code}): {e}'
+            ))
+            return False
+        if obj.pk not in self.existing[(obj.code, obj.name)]:
+            self.existing[(obj.code, obj.name)].append(obj.pk)
+        self.current[obj.pk] = self.values(obj)
+        return True
@@ -1,6 +1,7 @@
 import csv
 import os
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
 from position.models import Section, Subsection, Class, Subclass, Group, Position
 
 
@@ -61,6 +62,9 @@ def get_parent_code(code, level):
     return None
 
 
+BATCH_SIZE = 1000
+
+
 class Command(BaseCommand):
     help = 'Load Classification of Professions (KP) data from CSV file'
 
@@ -75,12 +79,11 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         file_path = options['file']
         if not os.path.exists(file_path):
-            self.stdout.write(self.style.ERROR(f'File not found: {file_path}'))
-            return
+            raise CommandError(f'File not found: {file_path}')
 
         self.stdout.write(f'Loading data from {file_path}...')
 
-        stats = {
+        self.stats = {
             'sections': 0,
             'subsections': 0,
             'classes': 0,
@@ -90,176 +93,160 @@ class Command(BaseCommand):
             'errors': 0
         }
 
+        # Build the whole KP tree in memory first: {level: {code: name}},
+        # positions as {(code, name): parent_code}. First occurrence wins.
+        tree = {'section': {}, 'subsection': {}, 'class': {}, 'subclass': {}}
+        positions = {}
+
         with open(file_path, 'r', encoding='utf-8-sig') as f:
             reader = csv.DictReader(f, delimiter=';')
-            rows = list(reader)
-
-        total_rows = len(rows)
-        self.stdout.write(f'Found {total_rows} rows to process')
-
-        # First pass: Import all codes without dots (Section, Subsection, Class, Subclass)
-        # For 4-digit codes, we'll import them as Subclasses initially
-        self.stdout.write('Pass 1: Importing non-position codes...')
-        for idx, row in enumerate(rows, 1):
-            if idx % 100 == 0:
-                self.stdout.write(f'Processing row {idx}/{total_rows}...')
-
-            code = row.get('Код', '').strip()
-            name = row.get('Група професій', '').strip()
-
-            if not code or not name:
-                continue
+            for row in reader:
+                code = row.get('Код', '').strip()
+                name = row.get('Група професій', '').strip()
 
-            if '.' in code:
-                continue
-
-            level = get_code_level(code)
-            if not level or level == 'position':
-                continue
+                if not code or not name:
+                    continue
 
-            try:
-                if level == 'section':
-                    Section.objects.get_or_create(
-                        code=code,
-                        defaults={'name': name}
+                level = get_code_level(code)
+                if level == 'position':
+                    positions.setdefault(
+                        (code, name), get_parent_code(code, level)
                     )
-                    stats['sections'] += 1
-
-                elif level == 'subsection':
-                    parent_code = get_parent_code(code, level)
-                    if parent_code:
-                        section = Section.objects.filter(code=parent_code).first()
-                        if section:
-                            Subsection.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'section': section}
-                            )
-                            stats['subsections'] += 1
-                        else:
-                            self.stdout.write(self.style.WARNING(f'Section not found for code {code}, parent: {parent_code}'))
-                            stats['errors'] += 1
-                    else:
-                        self.stdout.write(self.style.WARNING(f'Could not determine parent for subsection {code}'))
-                        stats['errors'] += 1
-
-                elif level == 'class':
-                    parent_code = get_parent_code(code, level)
-                    subsection = None
-                    section = None
-
-                    if parent_code:
-                        subsection = Subsection.objects.filter(code=parent_code).first()
-                        if not subsection:
-                            section_code = get_parent_code(parent_code, 'subsection')
-                            if section_code:
-                                section = Section.objects.filter(code=section_code).first()
-
-                    if subsection:
-                        Class.objects.get_or_create(
-                            code=code,
-                            defaults={'name': name, 'subsection': subsection, 'section': subsection.section}
-                        )
-                        stats['classes'] += 1
-                    elif section:
-                        Class.objects.get_or_create(
-                            code=code,
-                            defaults={'name': name, 'subsection': None, 'section': section}
-                        )
-                        stats['classes'] += 1
-                    else:
-                        self.stdout.write(self.style.WARNING(f'Parent not found for class {code}, parent code: {parent_code}'))
-                        stats['errors'] += 1
-
-                elif level == 'subclass':
-                    parent_code = get_parent_code(code, level)
-                    if parent_code:
-                        class_obj = Class.objects.filter(code=parent_code).first()
-                        if class_obj:
-                            Subclass.objects.get_or_create(
-                                code=code,
-                                defaults={'name': name, 'class_obj': class_obj}
-                            )
-                            stats['subclasses'] += 1
-                        else:
-                            self.stdout.write(self.style.WARNING(f'Class not found for subclass {code}, parent: {parent_code}'))
-                            stats['errors'] += 1
-                    else:
-                        self.stdout.write(self.style.WARNING(f'Could not determine parent for subclass {code}'))
-                        stats['errors'] += 1
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'Error processing {code} ({name}): {e}'))
-                stats['errors'] += 1
-
-        # Second pass: Import Positions and handle Groups
-        # A 4-digit Subclass that has Position children should be converted to a Group
-        self.stdout.write('Pass 2: Importing positions and creating groups...')
-        position_parents = {}  # Track which 4-digit codes have positions
+                elif level in tree:
+                    tree[level].setdefault(code, name)
+
+        # A 4-digit code with Position children is a Group, otherwise a
+        # Subclass. Decided here, before anything is written to the database.
+        group_codes = {parent for parent in positions.values() if parent}
+        codes = sum(len(level) for level in tree.values())
+        self.stdout.write(
+            f'Found {codes} classification codes '
+            f'and {len(positions)} positions'
+        )
 
-        for idx, row in enumerate(rows, 1):
-            if idx % 100 == 0:
-                self.stdout.write(f'Processing row {idx}/{total_rows}...')
+        with transaction.atomic():
+            self.write_tree(tree, positions, group_codes)
 
-            code = row.get('Код', '').strip()
-            name = row.get('Група професій', '').strip()
+        self.stdout.write(self.style.SUCCESS('\nImport completed!'))
+        self.stdout.write(f'Sections: {self.stats["sections"]}')
+        self.stdout.write(f'Subsections: {self.stats["subsections"]}')
+        self.stdout.write(f'Classes: {self.stats["classes"]}')
+        self.stdout.write(f'Subclasses: {self.stats["subclasses"]}')
+        self.stdout.write(f'Groups: {self.stats["groups"]}')
+        self.stdout.write(f'Positions: {self.stats["positions"]}')
+        if self.stats['errors'] > 0:
+            self.stdout.write(
+                self.style.WARNING(f'Errors: {self.stats["errors"]}')
+            )
+
+    def write_tree(self, tree, positions, group_codes):
+        """Write each level with one bulk insert.
+
+        Parents are resolved from the code → id maps of the level above.
+        """
+        section_ids = self.insert(Section, {
+            code: {'name': name} for code, name in tree['section'].items()
+        }, 'sections')
+
+        subsections = {}
+        for code, name in tree['subsection'].items():
+            parent_code = get_parent_code(code, 'subsection')
+            if parent_code in section_ids:
+                subsections[code] = {
+                    'name': name, 'section_id': section_ids[parent_code]
+                }
+            else:
+                self.warn(
+                    f'Section not found for code {code}, '
+                    f'parent: {parent_code}'
+                )
+        subsection_ids = self.insert(Subsection, subsections, 'subsections')
+        subsection_sections = dict(
+            Subsection.objects.values_list('code', 'section_id')
+        )
 
-            if not code or not name:
+        classes = {}
+        for code, name in tree['class'].items():
+            parent_code = get_parent_code(code, 'class')
+            section_code = None
+            if parent_code:
+                section_code = get_parent_code(parent_code, 'subsection')
+            if parent_code in subsection_ids:
+                classes[code] = {
+                    'name': name,
+                    'subsection_id': subsection_ids[parent_code],
+                    'section_id': subsection_sections[parent_code],
+                }
+            elif section_code in section_ids:
+                classes[code] = {
+                    'name': name,
+                    'subsection_id': None,
+                    'section_id': section_ids[section_code],
+                }
+            else:
+                self.warn(
+                    f'Parent not found for class {code}, '
+                    f'parent code: {parent_code}'
+                )
+        class_ids = self.insert(Class, classes, 'classes')
+
+        subclasses = {}
+        groups = {}
+        for code, name in tree['subclass'].items():
+            parent_code = get_parent_code(code, 'subclass')
+            if parent_code not in class_ids:
+                self.warn(
+                    f'Class not found for subclass {code}, '
+                    f'parent: {parent_code}'
+                )
                 continue
-
-            if '.' not in code:
+            target = groups if code in group_codes else subclasses
+            target[code] = {
+                'name': name, 'class_obj_id': class_ids[parent_code]
+            }
+
+        # Subclasses left over from an earlier load that are Groups now
+        converted, _ = Subclass.objects.filter(code__in=groups).delete()
+        if converted:
+            self.stdout.write(f'Converted {converted} Subclasses to Groups')
+        self.insert(Subclass, subclasses, 'subclasses')
+        group_ids = self.insert(Group, groups, 'groups')
+
+        existing_positions = set(
+            Position.objects.values_list('code', 'name', 'group_id')
+        )
+        new_positions = []
+        for (code, name), parent_code in positions.items():
+            if not parent_code:
+                self.warn(f'Could not determine parent for position {code}')
                 continue
-
-            level = get_code_level(code)
-            if level != 'position':
+            group_id = group_ids.get(parent_code)
+            if group_id is None:
+                self.warn(
+                    f'Parent not found for position {code}, '
+                    f'parent code: {parent_code}'
+                )
                 continue
-
-            try:
-                parent_code = get_parent_code(code, level)
-                if parent_code:
-                    position_parents[parent_code] = True
-
-                    group = Group.objects.filter(code=parent_code).first()
-                    subclass = None
-
-                    if not group:
-                        subclass = Subclass.objects.filter(code=parent_code).first()
-                        if subclass:
-                            # Convert Subclass to Group (Subclass with Position children becomes Group)
-                            group, created = Group.objects.get_or_create(
-                                code=parent_code,
-                                defaults={'name': subclass.name, 'class_obj': subclass.class_obj}
-                            )
-                            if created:
-                                stats['groups'] += 1
-                                stats['subclasses'] -= 1
-                                # Delete the Subclass since it's now a Group
-                                subclass.delete()
-
-                    if group:
-                        Position.objects.get_or_create(
-                            code=code,
-                            name=name,
-                            group=group
-                        )
-                        stats['positions'] += 1
-                    else:
-                        self.stdout.write(self.style.WARNING(f'Parent not found for position {code}, parent code: {parent_code}'))
-                        stats['errors'] += 1
-                else:
-                    self.stdout.write(self.style.WARNING(f'Could not determine parent for position {code}'))
-                    stats['errors'] += 1
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f'Error processing {code} ({name}): {e}'))
-                stats['errors'] += 1
-
-        self.stdout.write(self.style.SUCCESS('\nImport completed!'))
-        self.stdout.write(f'Sections: {stats["sections"]}')
-        self.stdout.write(f'Subsections: {stats["subsections"]}')
-        self.stdout.write(f'Classes: {stats["classes"]}')
-        self.stdout.write(f'Subclasses: {stats["subclasses"]}')
-        self.stdout.write(f'Groups: {stats["groups"]}')
-        self.stdout.write(f'Positions: {stats["positions"]}')
-        if stats['errors'] > 0:
-            self.stdout.write(self.style.WARNING(f'Errors: {stats["errors"]}'))
-
+            self.stats['positions'] += 1
+            if (code, name, group_id) not in existing_positions:
+                new_positions.append(
+                    Position(code=code, name=name, group_id=group_id)
+                )
+        Position.objects.bulk_create(new_positions, batch_size=BATCH_SIZE)
+
+    def insert(self, model, items, stat):
+        """Bulk-insert codes missing in the table, return code → id map."""
+        ids = dict(model.objects.values_list('code', 'id'))
+        new_objects = [
+            model(code=code, **fields)
+            for code, fields in items.items()
+            if code not in ids
+        ]
+        model.objects.bulk_create(new_objects, batch_size=BATCH_SIZE)
+        ids.update((obj.code, obj.pk) for obj in new_objects)
+        self.stats[stat] += len(items)
+        return ids
+
+    def warn(self, message):
+        self.stdout.write(self.style.WARNING(message))
+        self.stats['errors'] += 1
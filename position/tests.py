@@ -1,3 +1,163 @@
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import DatabaseError
 from django.test import TestCase
 
-# Create your tests here.
+from position.models import (
+    Class,
+    Group,
+    JobTitle,
+    Position,
+    Section,
+    Subclass,
+)
+
+KP_MODELS = (Section, Class, Subclass, Group, Position)
+JOB_TITLES_HEADER = ['КОД КП', 'ЗКППТР', 'ЄТКД', 'ДКХП', 'НАЗВА']
+
+KP_ROWS = [
+    ['1', 'Законодавці, вищі державні службовці, керівники'],
+    ['11', 'Законодавці, вищі державні службовці'],
+    ['111', 'Законодавці'],
+    ['1110', 'Законодавці'],
+    ['1110.1', 'Член Верховної Ради'],
+    ['1111', 'Без професійних назв'],
+    # Клас без підрозділу у файлі прив'язується до розділу
+    ['121', 'Керівники підприємств'],
+]
+
+
+class KpFiles:
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def write_csv(self, name, header, rows):
+        path = self.tmp / name
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';', lineterminator='\n')
+            writer.writerow(header)
+            writer.writerows(rows)
+        return path
+
+    def load_kp(self, rows=KP_ROWS):
+        path = self.write_csv('kp.csv', ['Код', 'Група професій'], rows)
+        output = StringIO()
+        call_command('load_kp', file=str(path), stdout=output)
+        return output.getvalue()
+
+
+class LoadKpTests(KpFiles, TestCase):
+    """load_kp: дерево КП, групи та підкласи."""
+
+    def test_tree(self):
+        self.load_kp()
+        # Чотиризначний код з професійними назвами — група, без них —
+        # підклас
+        group = Group.objects.get(code='1110')
+        self.assertEqual(group.class_obj.code, '111')
+        self.assertEqual(
+            list(Position.objects.values_list('code', 'group')),
+            [('1110.1', group.pk)],
+        )
+        self.assertEqual(
+            Subclass.objects.get(code='1111').class_obj.code, '111'
+        )
+        orphan = Class.objects.get(code='121')
+        self.assertEqual(
+            (orphan.section.code, orphan.subsection), ('1', None)
+        )
+
+    def test_subclass_becomes_group(self):
+        self.load_kp()
+        output = self.load_kp([*KP_ROWS, ['1111.1', 'Нова назва']])
+        self.assertIn('Converted 1 Subclasses to Groups', output)
+        self.assertFalse(Subclass.objects.exists())
+        self.assertEqual(
+            Position.objects.get(code='1111.1').group,
+            Group.objects.get(code='1111'),
+        )
+
+    def test_reload_is_idempotent(self):
+        self.load_kp()
+        counts = [model.objects.count() for model in KP_MODELS]
+        self.assertEqual(counts, [1, 2, 1, 1, 1])
+        self.load_kp()
+        self.assertEqual(
+            [model.objects.count() for model in KP_MODELS], counts
+        )
+
+
+class LoadJobTitlesTests(KpFiles, TestCase):
+    """load_job_titles: прив'язка до КП і підрахунок рядків."""
+
+    ROWS = (
+        ['1110.1', '11111', '1', '', 'Депутат'],
+        ['1110', '22222', '2', '', 'Законодавець'],
+        ['1111', '33333', '3', '', 'Радник'],
+        # Повтор (код, назва): оновлення, але рядок рахується
+        ['1110.1', '44444', '4', '', 'Депутат'],
+        ['9999', '55555', '5', '', 'Без батька'],
+    )
+
+    def load_job_titles(self):
+        path = self.write_csv(
+            'job_titles.csv', JOB_TITLES_HEADER, self.ROWS
+        )
+        output = StringIO()
+        call_command('load_job_titles', file=str(path), stdout=output)
+        return output.getvalue()
+
+    def test_parents(self):
+        self.load_kp()
+        output = self.load_job_titles()
+        self.assertIn('Successfully processed 5 records. Errors: 0', output)
+        titles = {
+            title.name: title
+            for title in JobTitle.objects.select_related(
+                'position', 'group', 'subclass'
+            )
+        }
+        self.assertEqual(len(titles), 4)
+        self.assertEqual(titles['Депутат'].position.code, '1110.1')
+        self.assertEqual(titles['Депутат'].zkpptr_code, '44444')
+        self.assertEqual(titles['Законодавець'].group.code, '1110')
+        self.assertEqual(titles['Радник'].subclass.code, '1111')
+        orphan = titles['Без батька']
+        self.assertEqual(
+            (orphan.position, orphan.group, orphan.subclass),
+            (None, None, None),
+        )
+
+    def test_batch_fallback_counts_rows(self):
+        # Пачка не записалась: рядки пишуться по одному, а підсумок
+        # рахує ті самі рядки, що й пакетний запис
+        self.load_kp()
+        update_or_create = JobTitle.objects.update_or_create
+
+        def fail_one(**kwargs):
+            if kwargs['name'] == 'Радник':
+                raise DatabaseError('row failed')
+            return update_or_create(**kwargs)
+
+        with (
+            mock.patch.object(
+                JobTitle.objects, 'bulk_create', side_effect=DatabaseError
+            ),
+            mock.patch.object(
+                JobTitle.objects, 'update_or_create', side_effect=fail_one
+            ),
+        ):
+            output = self.load_job_titles()
+        self.assertIn('Error creating Радник (1111): row failed', output)
+        self.assertIn('Successfully processed 4 records. Errors: 1', output)
+        self.assertEqual(JobTitle.objects.count(), 3)
+        self.assertEqual(
+            JobTitle.objects.get(name='Депутат').zkpptr_code, '44444'
+        )
@@ -1,11 +1,13 @@
 import csv
 import logging
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from speciality.models import KnowledgeField, Speciality
 
 logger = logging.getLogger(__name__)
 
+BATCH_SIZE = 1000
+
 class Command(BaseCommand):
     help = 'Import Knowledge Fields and Specialities from CSV'
 
@@ -14,6 +16,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         file_path = options['file_path']
+        self.verbosity = options['verbosity']
         self.stdout.write(f"Starting import from {file_path}...")
 
         try:
@@ -26,15 +29,20 @@ class Command(BaseCommand):
             
             self.stdout.write(self.style.SUCCESS("Import completed successfully"))
 
-        except FileNotFoundError:
-            self.stdout.write(self.style.ERROR(f"File not found: {file_path}"))
+        except FileNotFoundError as e:
+            raise CommandError(f"File not found: {file_path}") from e
         except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error: {str(e)}"))
+            # CommandError, not a message: load_reference_data must see
+            # that the stage failed
             logger.exception("Import failed")
+            raise CommandError(f"Error: {e}") from e
 
     def process_rows(self, reader):
-        count_kf = 0
-        count_spec = 0
+        # Collect everything first (first occurrence wins), then write each
+        # table with one upsert. Knowledge fields are looked up in memory,
+        # so a speciality may come before its knowledge field in the file.
+        knowledge_fields = {}
+        specialities = {}
 
         for row_num, row in enumerate(reader, start=2):
             if not row or len(row) < 2:
@@ -49,11 +57,7 @@ class Command(BaseCommand):
                 parts = field_raw.split(' ', 1)
                 if len(parts) == 2:
                     code, name = parts
-                    KnowledgeField.objects.get_or_create(
-                        code=code,
-                        defaults={'name': name}
-                    )
-                    count_kf += 1
+                    knowledge_fields.setdefault(code, name)
 
             # Process Speciality if present
             if spec_raw:
@@ -61,23 +65,86 @@ class Command(BaseCommand):
                 parts = spec_raw.split(' ', 1)
                 if len(parts) == 2:
                     code, name = parts
-                    
-                    # Logic: Link to KnowledgeField via first 2 digits of speciality code
-                    kf_code = code[:2]
-                    
-                    try:
-                        kf = KnowledgeField.objects.get(code=kf_code)
-                        Speciality.objects.get_or_create(
-                            code=code,
-                            defaults={
-                                'name': name,
-                                'knowledge_field': kf,
-                                'level': 1,  # Flat list for now
-                                'parent': None
-                            }
-                        )
-                        count_spec += 1
-                    except KnowledgeField.DoesNotExist:
-                        self.stdout.write(self.style.WARNING(f"Row {row_num}: KnowledgeField {kf_code} not found for Speciality {code}. Skipping."))
-
-        self.stdout.write(f"Processed: {count_kf} Knowledge Fields, {count_spec} Specialities")
+                    specialities.setdefault(code, (name, row_num))
+
+        kf_current = {
+            code: (name,)
+            for code, name in KnowledgeField.objects.values_list(
+                'code', 'name'
+            )
+        }
+        kf_new = {code: (name,) for code, name in knowledge_fields.items()}
+        kf_diff = self.upsert(KnowledgeField, kf_current, kf_new, ['name'])
+
+        kf_ids = dict(KnowledgeField.objects.values_list('code', 'id'))
+        spec_new = {}
+        for code, (name, row_num) in specialities.items():
+            # Logic: Link to KnowledgeField via first 2 digits of
+            # speciality code
+            kf_code = code[:2]
+            if kf_code not in kf_ids:
+                self.stdout.write(self.style.WARNING(
+                    f"Row {row_num}: KnowledgeField {kf_code} not found "
+                    f"for Speciality {code}. Skipping."
+                ))
+                continue
+            spec_new[code] = (name, kf_ids[kf_code])
+
+        spec_current = {
+            code: (name, kf_id)
+            for code, name, kf_id in Speciality.objects.values_list(
+                'code', 'name', 'knowledge_field_id'
+            )
+        }
+        spec_diff = self.upsert(
+            Speciality, spec_current, spec_new, ['name', 'knowledge_field_id']
+        )
+
+        self.stdout.write(
+            f"Processed: {len(kf_new)} Knowledge Fields, "
+            f"{len(spec_new)} Specialities"
+        )
+        self.write_diff('Knowledge Fields', kf_diff)
+        self.write_diff('Specialities', spec_diff)
+
+    def upsert(self, model, current, new, fields):
+        """Insert new codes and update changed ones with one bulk upsert.
+
+        `current` and `new` map code → tuple of `fields` values.
+        Returns the diff against the table as {kind: [codes]}.
+        """
+        diff = {
+            'added': [], 'changed': [], 'unchanged': [], 'not in file': []
+        }
+        objects = []
+        for code, values in new.items():
+            if code not in current:
+                diff['added'].append(code)
+            elif current[code] != values:
+                diff['changed'].append(code)
+            else:
+                diff['unchanged'].append(code)
+                continue
+            objects.append(
+                model(code=code, **dict(zip(fields, values, strict=True)))
+            )
+        diff['not in file'] = sorted(set(current) - set(new))
+
+        model.objects.bulk_create(
+            objects,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['code'],
+            update_fields=[field.removesuffix('_id') for field in fields],
+        )
+        return diff
+
+    def write_diff(self, title, diff):
+        counts = ", ".join(
+            f"{len(codes)} {kind}" for kind, codes in diff.items()
+        )
+        self.stdout.write(f"{title}: {counts}")
+        if self.verbosity > 1:
+            for kind in ('added', 'changed', 'not in file'):
+                if diff[kind]:
+                    self.stdout.write(f"  {kind}: {', '.join(diff[kind])}")
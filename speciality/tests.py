@@ -1,3 +1,88 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from speciality.models import KnowledgeField, Speciality
+
+HEADER = 'Галузь знань;Спеціальність\n'
+
+
+class LoadSpecialityTests(TestCase):
+    """load_speciality: upsert і підсумок змін відносно таблиці."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'speciality.csv'
+
+    def load(self, rows, verbosity=1):
+        self.path.write_text(
+            HEADER + '\n'.join(rows) + '\n', encoding='utf-8'
+        )
+        output = StringIO()
+        call_command(
+            'load_speciality', str(self.path), verbosity=verbosity,
+            stdout=output,
+        )
+        return output.getvalue()
+
+    def test_initial_load(self):
+        output = self.load([
+            # Спеціальність раніше за свою галузь
+            ';012 Дошкільна освіта',
+            '01 Освіта;011 Освітні науки',
+            # Галузі 99 у файлі немає
+            ';991 Невідома',
+        ])
+        self.assertEqual(
+            list(
+                Speciality.objects.order_by('code').values_list(
+                    'code', 'name', 'knowledge_field__code'
+                )
+            ),
+            [
+                ('011', 'Освітні науки', '01'),
+                ('012', 'Дошкільна освіта', '01'),
+            ],
+        )
+        self.assertIn(
+            'KnowledgeField 99 not found for Speciality 991', output
+        )
+        self.assertIn(
+            'Specialities: 2 added, 0 changed, 0 unchanged, 0 not in file',
+            output,
+        )
+
+    def test_diff_summary(self):
+        self.load([
+            '01 Освіта;011 Освітні науки',
+            ';012 Дошкільна освіта',
+            ';013 Початкова освіта',
+        ])
+        output = self.load([
+            '01 Освіта;011 Освітні науки',
+            ';012 Дошкільна освіта (нова назва)',
+            ';014 Середня освіта',
+        ], verbosity=2)
+        self.assertIn(
+            'Knowledge Fields: 0 added, 0 changed, 1 unchanged, '
+            '0 not in file',
+            output,
+        )
+        self.assertIn(
+            'Specialities: 1 added, 1 changed, 1 unchanged, 1 not in file',
+            output,
+        )
+        self.assertIn('  added: 014', output)
+        self.assertIn('  changed: 012', output)
+        self.assertIn('  not in file: 013', output)
+        self.assertEqual(
+            Speciality.objects.get(code='012').name,
+            'Дошкільна освіта (нова назва)',
+        )
+        # Коди, яких немає у файлі, лише показуються, а не видаляються
+        self.assertTrue(Speciality.objects.filter(code='013').exists())
+        self.assertEqual(KnowledgeField.objects.count(), 1)
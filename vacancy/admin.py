@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.urls import reverse
 from django.utils import timezone
-from .models import Vacancy
+from django.utils.html import format_html
+from . import search
+from .models import ImportReject, ImportRun, Vacancy
 
 
 @admin.register(Vacancy)
@@ -23,6 +26,7 @@ class VacancyAdmin(admin.ModelAdmin):
         'status',
         'is_active', 
         'source',
+        ('duplicate_of', admin.EmptyFieldListFilter),
         'report_3pn_date',
         'employment_type', 
         'education_level', 
@@ -43,7 +47,8 @@ class VacancyAdmin(admin.ModelAdmin):
         'speciality', 
         'location', 
         'kved',
-        'parent'
+        'parent',
+        'duplicate_of'
     )
     
     actions = ['confirm_relevance']
@@ -53,6 +58,13 @@ class VacancyAdmin(admin.ModelAdmin):
         queryset.update(confirmed_at=timezone.now())
         self.message_user(request, "Актуальність обраних вакансій підтверджена.")
 
+    def get_search_results(self, request, queryset, search_term):
+        # search_fields лишаються для поля пошуку, але шукаємо за
+        # повнотекстовим індексом замість LIKE '%…%' по кожному полю
+        if not search.match(search_term):
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=search.matching(search_term)), False
+
     def generation_label(self, obj):
         if obj.generation > 1:
             return f"{obj.generation}-ге"
@@ -67,3 +79,53 @@ class VacancyAdmin(admin.ModelAdmin):
             return "⏳ Потребує перевірки"
         return "✅ Актуальна"
     relevance_status.short_description = "Статус"
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = (
+        'file_name',
+        'status',
+        'checkpoint_row',
+        'created_count',
+        'updated_count',
+        'unchanged_count',
+        'error_count',
+        'started_at',
+        'finished_at'
+    )
+    list_filter = ('status', 'started_at')
+    search_fields = ('file_name', 'file_hash')
+    readonly_fields = (
+        *[field.name for field in ImportRun._meta.fields],
+        'rejects_link',
+    )
+
+    def rejects_link(self, obj):
+        # Відхилених рядків у поганому файлі десятки тисяч: не inline на
+        # сторінці запуску, а посилання на відфільтрований список
+        # із пагінацією
+        url = reverse('admin:vacancy_importreject_changelist')
+        return format_html(
+            '<a href="{}?run__id__exact={}">Переглянути ({})</a>',
+            url,
+            obj.pk,
+            obj.error_count,
+        )
+    rejects_link.short_description = "Відхилені рядки"
+
+
+@admin.register(ImportReject)
+class ImportRejectAdmin(admin.ModelAdmin):
+    list_display = ('row_number', 'reason', 'run')
+    list_filter = ('run',)
+    list_select_related = ('run',)
+    list_per_page = 100
+    search_fields = ('reason',)
+    readonly_fields = ('run', 'row_number', 'reason', 'raw_row')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
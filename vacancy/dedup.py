@@ -0,0 +1,229 @@
+"""Пошук майже однакових вакансій (MinHash + LSH).
+
+Та сама вакансія приходить з різних джерел (ДСЗ, Work.ua, robota.ua) під
+різними external_id і з трохи різним текстом. Для кожної вакансії
+рахується MinHash-підпис множини шинглів: слова назви та трійки слів
+опису, кожен з яких позначений роботодавцем і населеним пунктом (у
+вакансій різних роботодавців чи міст спільних шинглів немає). Підпис
+ділиться на смуги, і вакансії з однаковою смугою потрапляють в один
+кошик (DuplicateBucket).
+Кандидати на дублікат шукаються за індексом кошиків, а не порівнянням з
+усією базою, тож робота на рядок не залежить від кількості вакансій.
+Кандидат вважається дублікатом, якщо оцінка подібності Жаккара за
+підписами не менша за поріг.
+
+Кластер зберігається у `Vacancy.duplicate_of`: дублікати вказують на
+першу вакансію кластера, тож у списку можна показувати лише її.
+"""
+
+import hashlib
+import re
+from array import array
+from collections import defaultdict
+from itertools import batched
+from operator import eq
+
+from django.db import connection, transaction
+
+from vacancy.models import DuplicateBucket, Vacancy
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+
+# Поріг оцінки Жаккара. При 16 смугах по 4 значення пара з подібністю
+# 0.7 стає кандидатом з імовірністю ~99%, з подібністю 0.3 — ~12%.
+THRESHOLD = 0.7
+
+# Скільки значень передавати в одному IN (обмеження параметрів SQLite)
+QUERY_CHUNK = 900
+
+_WORD_RE = re.compile(r"\w+")
+_APOSTROPHES = str.maketrans("", "", "'’ʼ`")
+
+
+def words(text):
+    """Нормалізовані слова: нижній регістр, без апострофів і пунктуації."""
+    return _WORD_RE.findall(text.lower().translate(_APOSTROPHES))
+
+
+def shingles(vacancy):
+    """Множина ознак вакансії, за якою рахується подібність."""
+    prefix = f"{vacancy.employer_id}:{vacancy.location_id}"
+    result = {f"{prefix}:t:{word}" for word in words(vacancy.title)}
+    description = words(vacancy.description)
+    result.update(
+        f"{prefix}:d:" + " ".join(description[i:i + SHINGLE_SIZE])
+        for i in range(max(len(description) - SHINGLE_SIZE + 1, 1))
+    )
+    return result
+
+
+def minhash(features):
+    """MinHash-підпис множини: NUM_PERM мінімумів незалежних хешів.
+
+    Усі NUM_PERM 32-бітних хешів шингла беруться з одного виходу
+    SHAKE-128, а мінімуми рахуються поелементно в C (zip/map).
+    """
+    hashes = []
+    for feature in features:
+        values = array("I")
+        values.frombytes(
+            hashlib.shake_128(feature.encode()).digest(NUM_PERM * 4)
+        )
+        hashes.append(values)
+    return list(map(min, zip(*hashes, strict=True)))
+
+
+def band_keys(signature):
+    """Ключі кошиків LSH: хеш кожної смуги підпису разом з її номером."""
+    keys = []
+    for band in range(BANDS):
+        rows = array("I", signature[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(
+            bytes([band]) + rows.tobytes(), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, signed=True))
+    return keys
+
+
+def similarity(a, b):
+    """Оцінка подібності Жаккара: частка однакових значень підписів."""
+    return sum(map(eq, a, b)) / NUM_PERM
+
+
+def pack(signature):
+    return array("I", signature).tobytes()
+
+
+def unpack(data):
+    signature = array("I")
+    signature.frombytes(data)
+    return signature.tolist()
+
+
+class DuplicateIndex:
+    """Індекс дублікатів, який поповнюється пачками під час імпорту.
+
+    `add(vacancies)` викликається після запису пачки: для кожної вакансії
+    зберігаються підпис і кошики, а `duplicate_of` вказує на голову
+    кластера найподібнішої активної вакансії (або очищується, якщо
+    подібних немає). Вакансії пачки порівнюються і між собою.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        """`threshold` — мінімальна оцінка подібності для дубліката."""
+        self.threshold = threshold
+        self.indexed = 0
+        self.duplicates = 0
+
+    def add(self, vacancies):
+        """Індексує щойно записані вакансії (id шукається за external_id)."""
+        latest = {vacancy.external_id: vacancy for vacancy in vacancies}
+        pks = {}
+        for chunk in batched(latest, QUERY_CHUNK):
+            pks.update(
+                Vacancy.objects.filter(external_id__in=chunk)
+                .values_list("external_id", "pk")
+            )
+        for external_id, vacancy in latest.items():
+            vacancy.pk = pks.get(external_id)
+        self.index([vacancy for vacancy in latest.values() if vacancy.pk])
+
+    def index(self, vacancies):
+        """Індексує збережені вакансії (потрібні pk, назва, опис, FK)."""
+        entries = []
+        for vacancy in vacancies:
+            signature = minhash(shingles(vacancy))
+            entries.append((vacancy.pk, signature, band_keys(signature)))
+        if not entries:
+            return
+        own = {pk for pk, _, _ in entries}
+
+        # Кошик → активні вакансії в ньому (крім самої пачки)
+        buckets = defaultdict(set)
+        keys = {key for _, _, band in entries for key in band}
+        for chunk in batched(keys, QUERY_CHUNK):
+            for key, pk in DuplicateBucket.objects.filter(
+                key__in=chunk, vacancy__is_active=True
+            ).values_list("key", "vacancy_id"):
+                if pk not in own:
+                    buckets[key].add(pk)
+
+        signatures = {}
+        heads = {}
+        candidates = set().union(*buckets.values())
+        for chunk in batched(candidates, QUERY_CHUNK):
+            for pk, data, duplicate_of in Vacancy.objects.filter(
+                pk__in=chunk
+            ).values_list("pk", "minhash", "duplicate_of_id"):
+                if data:
+                    signatures[pk] = unpack(data)
+                    heads[pk] = duplicate_of or pk
+
+        # Голови існуючих кластерів лишаються головами
+        leaders = set()
+        for chunk in batched(own, QUERY_CHUNK):
+            leaders.update(
+                Vacancy.objects.filter(duplicate_of__in=chunk)
+                .values_list("duplicate_of_id", flat=True)
+            )
+
+        updates = []
+        rows = []
+        for pk, signature, band in entries:
+            duplicate_of = None
+            if pk not in leaders:
+                duplicate_of = self._best_match(
+                    signature, band, buckets, signatures, heads
+                )
+            self.duplicates += duplicate_of is not None
+            updates.append((pack(signature), duplicate_of, pk))
+            rows.extend((key, pk) for key in band)
+            signatures[pk] = signature
+            heads[pk] = duplicate_of or pk
+            for key in band:
+                buckets[key].add(pk)
+
+        self._save(own, updates, rows)
+        self.indexed += len(entries)
+
+    def _save(self, own, updates, rows):
+        """Заміна кошиків і підписів пачки.
+
+        Рядків на вакансію BANDS, тож пишемо через executemany, без
+        створення екземплярів моделей.
+        """
+        quote = connection.ops.quote_name
+        buckets = DuplicateBucket._meta
+        vacancies = Vacancy._meta
+        insert = "INSERT INTO {} ({}, {}) VALUES (%s, %s)".format(
+            quote(buckets.db_table),
+            quote(buckets.get_field("key").column),
+            quote(buckets.get_field("vacancy").column),
+        )
+        update = "UPDATE {} SET {} = %s, {} = %s WHERE {} = %s".format(
+            quote(vacancies.db_table),
+            quote(vacancies.get_field("minhash").column),
+            quote(vacancies.get_field("duplicate_of").column),
+            quote(vacancies.pk.column),
+        )
+        with transaction.atomic(), connection.cursor() as cursor:
+            for chunk in batched(own, QUERY_CHUNK):
+                DuplicateBucket.objects.filter(vacancy_id__in=chunk).delete()
+            cursor.executemany(insert, rows)
+            cursor.executemany(update, updates)
+
+    def _best_match(self, signature, band, buckets, signatures, heads):
+        """Голова кластера найподібнішого кандидата або None."""
+        best, best_pk = 0.0, None
+        for pk in set().union(*(buckets.get(key, ()) for key in band)):
+            if pk not in signatures:
+                continue
+            score = similarity(signature, signatures[pk])
+            if score > best or (score == best and best_pk and pk < best_pk):
+                best, best_pk = score, pk
+        if best_pk is None or best < self.threshold:
+            return None
+        return heads[best_pk]
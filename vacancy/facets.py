@@ -0,0 +1,222 @@
+"""Фасетний фільтр публічного списку вакансій.
+
+Кожен фасет — колонка VacancyListing (область, вид зайнятості, освіта,
+ступінь, теги, джерело, діапазон зарплати). У межах фасету вибрані
+значення об'єднуються через АБО, фасети між собою — через І.
+
+Лічильник біля значення показує, скільки вакансій буде, якщо додати це
+значення до фільтра: враховуються вибрані значення всіх інших фасетів,
+але не власного. Усі лічильники беруться з одного проходу по рядках:
+GROUP BY за всіма колонками фасетів читає лише покривний індекс
+vacancy_listing_facets_idx і дає кілька тисяч комбінацій значень з
+кількістю вакансій. Далі фільтр застосовується до комбінацій у пам'яті,
+тож для будь-якого вибору фасетів прохід по таблиці не повторюється.
+
+Комбінації кешуються на FACET_CACHE_SECONDS за базовим набором
+(пошуковим запитом), лічильники — за нормалізованим набором фільтрів.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from dictionary.models import (
+    Degree,
+    EducationLevel,
+    EmploymentType,
+    Tag,
+    VacancySource,
+)
+from location.models import Region
+from vacancy.listing import SALARY_BANDS
+from vacancy.models import Vacancy
+
+# Лічильники змінюються з кожним імпортом, тож кеш короткий
+FACET_CACHE_SECONDS = 60
+
+# Значення фасету — id: лише ASCII-цифри і не більше, ніж уміщує
+# 64-бітне ціле SQLite ("²" чи 20 цифр відкидаються, а не дають 500)
+_ID_RE = re.compile(r"[0-9]{1,18}")
+
+
+def _dictionary(model):
+    return lambda: list(model.objects.values_list("pk", "name"))
+
+
+class Facet:
+    """Фасет: параметр запиту, колонка VacancyListing і значення."""
+
+    def __init__(self, name, label, field, options):
+        """`options` — функція, що повертає [(значення, підпис)]."""
+        self.name = name
+        self.label = label
+        self.field = field
+        self._options = options
+
+    def options(self):
+        """[(значення, підпис)] у порядку показу."""
+        return self._options()
+
+    def q(self, values):
+        """Умова для рядків з будь-яким із `values`."""
+        return Q(**{f"{self.field}__in": values})
+
+    def values_of(self, column):
+        """Значення фасету за вмістом колонки (NULL — жодного)."""
+        return () if column is None else (column,)
+
+
+class TagFacet(Facet):
+    """Теги: фільтр за зв'язком вакансія–тег.
+
+    У рядку списку теги — колонка ",3,7," (для лічильників), а фільтр
+    іде за індексом зв'язку вакансія–тег, а не LIKE по всій таблиці.
+    """
+
+    def q(self, values):
+        return Q(pk__in=Vacancy.tags.through.objects.filter(
+            tag_id__in=values
+        ).values("vacancy_id"))
+
+    def values_of(self, column):
+        return tuple(int(tag) for tag in column.strip(",").split(",") if tag)
+
+
+FACETS = [
+    Facet(
+        "region",
+        "Область",
+        "region",
+        lambda: list(
+            Region.objects.order_by("name").values_list("pk", "name")
+        ),
+    ),
+    Facet(
+        "employment_type",
+        "Вид зайнятості",
+        "employment_type",
+        _dictionary(EmploymentType),
+    ),
+    Facet(
+        "education_level",
+        "Рівень освіти",
+        "education_level",
+        _dictionary(EducationLevel),
+    ),
+    Facet("degree", "Освітній ступінь", "degree", _dictionary(Degree)),
+    TagFacet("tag", "Теги", "tag_ids", _dictionary(Tag)),
+    Facet("source", "Джерело", "source", _dictionary(VacancySource)),
+    Facet(
+        "salary",
+        "Зарплата, грн",
+        "salary_band",
+        lambda: [(number, label) for number, _, label in SALARY_BANDS],
+    ),
+]
+
+
+def selected_filters(params):
+    """Нормалізований вибір з параметрів запиту: {фасет: (id, ...)}.
+
+    Лише id (інші значення відкидаються), без повторів і впорядковані,
+    тож однаковий вибір у будь-якому порядку дає однаковий ключ кешу.
+    """
+    selected = {}
+    for facet in FACETS:
+        values = sorted({
+            int(value) for value in params.getlist(facet.name)
+            if _ID_RE.fullmatch(value)
+        })
+        if values:
+            selected[facet.name] = tuple(values)
+    return selected
+
+
+def filter_queryset(queryset, selected):
+    """Рядки, що проходять усі вибрані фасети."""
+    for facet in FACETS:
+        if facet.name in selected:
+            queryset = queryset.filter(facet.q(selected[facet.name]))
+    return queryset
+
+
+def _cache_key(*parts):
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+    return f"vacancy-facets:{digest}"
+
+
+def combinations(queryset, cache_key=""):
+    """Комбінації значень фасетів `queryset` з кількістю рядків.
+
+    [(значення колонок фасетів, кількість)] одним GROUP BY за покривним
+    індексом.
+    """
+    key = _cache_key("combinations", cache_key)
+    result = cache.get(key)
+    if result is None:
+        fields = [facet.field for facet in FACETS]
+        result = [
+            (tuple(row[field] for field in fields), row["count"])
+            for row in queryset.order_by().values(*fields).annotate(
+                count=Count("*")
+            )
+        ]
+        cache.set(key, result, FACET_CACHE_SECONDS)
+    return result
+
+
+def count_facets(combos, selected):
+    """{фасет: Counter(значення → кількість)} за комбінаціями."""
+    counts = {facet.name: Counter() for facet in FACETS}
+    for columns, count in combos:
+        values = [
+            facet.values_of(column)
+            for facet, column in zip(FACETS, columns, strict=True)
+        ]
+        failed = [
+            facet.name
+            for facet, own in zip(FACETS, values, strict=True)
+            if facet.name in selected
+            and not set(own).intersection(selected[facet.name])
+        ]
+        # Комбінація, що не проходить два фасети, не рахується ніде;
+        # що не проходить один — рахується лише в ньому
+        if len(failed) > 1:
+            continue
+        for facet, own in zip(FACETS, values, strict=True):
+            if not failed or failed[0] == facet.name:
+                for value in own:
+                    counts[facet.name][value] += count
+    return counts
+
+
+def facet_counts(queryset, selected, cache_key=""):
+    """[(фасет, [(значення, підпис, кількість, вибрано)])] для `queryset`.
+
+    Показуються значення з ненульовою кількістю і вибрані. `cache_key`
+    відрізняє різні базові набори (наприклад, пошуковий запит і межу
+    його найновіших збігів).
+    """
+    key = _cache_key("counts", cache_key, sorted(selected.items()))
+    cached = cache.get(key)
+    if cached is None:
+        options = {facet.name: facet.options() for facet in FACETS}
+        counts = count_facets(combinations(queryset, cache_key), selected)
+        cached = (options, counts)
+        cache.set(key, cached, FACET_CACHE_SECONDS)
+    options, counts = cached
+
+    result = []
+    for facet in FACETS:
+        chosen = selected.get(facet.name, ())
+        values = []
+        for value, label in options[facet.name]:
+            count = counts[facet.name][value]
+            if count or value in chosen:
+                values.append((value, label, count, value in chosen))
+        if values:
+            result.append((facet, values))
+    return result
@@ -0,0 +1,1059 @@
+"""Імпорт вакансій з CSV (ДСЗ) як конвеєр генераторів.
+
+read → normalize → resolve → write: рядки проходять стадії по одному,
+а в пам'яті одночасно тримається не більше однієї пачки для запису.
+Довідники завантажуються один раз (код → id), тож стадія resolve не
+робить запитів до БД.
+"""
+
+import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import batched, pairwise
+
+from django.db import connections, transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from core.validation import (
+    column,
+    empty,
+    not_date,
+    not_integer,
+    not_matching,
+    regex_of,
+    unknown,
+)
+from dictionary.models import Degree, EducationLevel
+from employer.models import Employer
+from location.lookups import SettlementLookup
+from position.models import JobTitle
+from vacancy.listing import QUERY_CHUNK, deferred, sync_listings
+from vacancy.models import ImportReject, ImportRun, Vacancy
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Орієнтовний розмір партиції файлу для паралельного імпорту
+PARTITION_BYTES = 4 * 1024 * 1024
+
+# Поля, які імпорт перезаписує в існуючій вакансії
+IMPORT_FIELDS = [
+    "employer",
+    "title",
+    "position",
+    "location",
+    "salary_min",
+    "salary_max",
+    "description",
+    "report_3pn_date",
+    "published_at",
+    "confirmed_at",
+    "source",
+    "employment_type",
+    "education_level",
+    "degree",
+    "import_fingerprint",
+]
+
+# Формат external_id — з валідатора моделі, як і в --dry-run
+EXTERNAL_ID_REGEX = re.compile(regex_of(Vacancy, "external_id"))
+
+
+class RowRejected(Exception):
+    """Рядок CSV неможливо імпортувати (недостатньо даних або довідників)."""
+
+
+def parse_date(date_str, is_datetime=False):
+    """Парсинг дати у форматі ДД.ММ.РРРР. Некоректна дата → None."""
+    if not date_str:
+        return None
+    try:
+        dt = datetime.strptime(date_str, "%d.%m.%Y")
+        return timezone.make_aware(dt) if is_datetime else dt.date()
+    except ValueError:
+        return None
+
+
+def parse_salary(salary_min, salary_max):
+    """Зарплата (min, max). Якщо min порожня, то min = max."""
+    try:
+        s_max = int(salary_max) if salary_max else None
+        s_min = int(salary_min) if salary_min else s_max
+    except ValueError:
+        s_min = s_max = None
+    return s_min, s_max
+
+
+def fingerprint(values):
+    """Відбиток імпортованих значень: однаковий для незмінного рядка."""
+    raw = "\x1f".join("" if value is None else str(value) for value in values)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def read_rows(f, fieldnames=None):
+    """Стадія read: рядки CSV як словники."""
+    return csv.DictReader(f, fieldnames=fieldnames, delimiter=";")
+
+
+def partition_csv(path, parts, start=0):
+    """Ділить CSV на байтові діапазони [(start, end)] без заголовка.
+
+    Межі ставляться лише на переносах рядків поза лапками, тож запис з
+    багаторядковим полем у лапках ніколи не розрізається. `start` —
+    початок запису, з якого ділити (контрольна точка). Повертає також
+    назви колонок із заголовка.
+    """
+    size = os.path.getsize(path)
+    targets = deque(
+        [0, *(start + (size - start) * i // parts for i in range(1, parts))]
+    )
+    boundaries = []
+
+    with open(path, "rb") as f:
+        offset = 0
+        in_quotes = False
+        while targets:
+            block = f.read(1024 * 1024)
+            if not block:
+                break
+            pos = 0
+            while targets and targets[0] < offset + len(block):
+                newline = block.find(b"\n", max(targets[0] - offset, pos))
+                if newline == -1:
+                    break
+                in_quotes ^= block.count(b'"', pos, newline) % 2 == 1
+                pos = newline
+                if in_quotes:
+                    pos += 1
+                    continue
+                boundary = offset + newline + 1
+                boundaries.append(boundary)
+                while targets and targets[0] < boundary:
+                    targets.popleft()
+            in_quotes ^= block.count(b'"', pos) % 2 == 1
+            offset += len(block)
+
+        f.seek(0)
+        header = f.read(boundaries[0]) if boundaries else f.read()
+
+    fieldnames = next(csv.reader(
+        io.StringIO(header.decode("utf-8-sig")), delimiter=";"
+    ), [])
+    edges = [
+        max(boundaries[0], start),
+        *(boundary for boundary in boundaries[1:] if boundary > start),
+        size,
+    ] if boundaries else [size]
+    ranges = [(begin, end) for begin, end in pairwise(edges) if end > begin]
+    return fieldnames, ranges
+
+
+def normalize_row(row):
+    """Стадія normalize: очищені значення та розібрані дати/зарплата."""
+    record = {
+        key: row.get(key, "").strip()
+        for key in (
+            "external_id",
+            "employer_tax_id",
+            "position_code",
+            "location_code",
+            "description",
+            "education_level",
+            "degree",
+        )
+    }
+    if (
+        not record["employer_tax_id"]
+        or not record["position_code"]
+        or not record["location_code"]
+    ):
+        raise RowRejected(f"Пропущено рядок: недостатньо даних ({row})")
+    # Без коректного external_id рядки зливалися б в одну вакансію
+    if not EXTERNAL_ID_REGEX.fullmatch(record["external_id"]):
+        raise RowRejected(
+            f"Пропущено рядок: external_id не з 14 цифр ({row})"
+        )
+
+    record["salary_min"], record["salary_max"] = parse_salary(
+        row.get("salary_min", "").strip(),
+        row.get("salary_max", "").strip(),
+    )
+    record["report_3pn_date"] = parse_date(
+        row.get("report_3pn_date", "").strip()
+    )
+    record["published_at"] = parse_date(
+        row.get("published_at", "").strip(), is_datetime=True
+    )
+    record["confirmed_at"] = parse_date(
+        row.get("confirmed_at", "").strip(), is_datetime=True
+    )
+    return record
+
+
+class LookupMaps:
+    """Мапи код → id для всіх довідників, потрібних імпорту вакансій."""
+
+    def __init__(self):
+        """Завантажує кожен довідник одним запитом."""
+        self.employers = dict(Employer.objects.values_list("tax_id", "id"))
+
+        # Код КП не унікальний: беремо перший запис, як і filter().first()
+        self.job_titles = {}
+        for pk, code, name in JobTitle.objects.order_by(
+            "code", "name", "pk"
+        ).values_list("pk", "code", "name"):
+            self.job_titles.setdefault(code, (pk, name))
+
+        self.locations = SettlementLookup()
+        self.education_levels = {
+            name.lower(): pk
+            for pk, name in EducationLevel.objects.values_list("pk", "name")
+        }
+        self.degrees = {
+            name.lower(): pk
+            for pk, name in Degree.objects.values_list("pk", "name")
+        }
+
+    def location(self, code):
+        """Населений пункт за кодом (з підтримкою районів у місті)."""
+        return self.locations.get(code)
+
+
+class VacancyResolver:
+    """Стадія resolve: нормалізований запис → незбережена Vacancy."""
+
+    def __init__(
+        self, maps, source_id, employment_type_id, default_education_id
+    ):
+        """Ідентифікатори — значення за замовчуванням для всіх вакансій."""
+        self.maps = maps
+        self.source_id = source_id
+        self.employment_type_id = employment_type_id
+        self.default_education_id = default_education_id
+
+    def __call__(self, record):
+        tax_id = record["employer_tax_id"]
+        employer_id = self.maps.employers.get(tax_id)
+        if employer_id is None:
+            raise RowRejected(
+                f"Роботодавця з tax_id {tax_id} не знайдено. Пропуск."
+            )
+
+        pos_code = record["position_code"]
+        position = self.maps.job_titles.get(pos_code)
+        if position is None:
+            raise RowRejected(f"Посаду {pos_code} не знайдено. Пропуск.")
+        position_id, position_name = position
+
+        loc_code = record["location_code"]
+        location_id = self.maps.location(loc_code)
+        if location_id is None:
+            raise RowRejected(f"Локацію {loc_code} не знайдено. Пропуск.")
+
+        edu_name = record["education_level"]
+        if edu_name:
+            education_id = self.maps.education_levels.get(edu_name.lower())
+        else:
+            education_id = self.default_education_id
+        deg_name = record["degree"]
+        degree_id = None
+        if deg_name:
+            degree_id = self.maps.degrees.get(deg_name.lower())
+        description = record["description"] or position_name
+
+        return Vacancy(
+            external_id=record["external_id"],
+            employer_id=employer_id,
+            title=position_name,  # Беремо назву з довідника
+            position_id=position_id,
+            location_id=location_id,
+            salary_min=record["salary_min"],
+            salary_max=record["salary_max"],
+            description=description,
+            report_3pn_date=record["report_3pn_date"],
+            published_at=record["published_at"] or timezone.now(),
+            confirmed_at=record["confirmed_at"],
+            source_id=self.source_id,
+            employment_type_id=self.employment_type_id,
+            education_level_id=education_id,
+            degree_id=degree_id,
+            # Без published_at за замовчуванням (now), інакше відбиток
+            # змінювався б щоразу
+            import_fingerprint=fingerprint((
+                employer_id,
+                position_id,
+                position_name,
+                location_id,
+                record["salary_min"],
+                record["salary_max"],
+                description,
+                record["report_3pn_date"],
+                record["published_at"],
+                record["confirmed_at"],
+                self.source_id,
+                self.employment_type_id,
+                education_id,
+                degree_id,
+            )),
+        )
+
+
+class VacancyValidator:
+    """Перевірка пачки рядків без запису (--dry-run).
+
+    Правила ті ж, що й в імпорту, але застосовуються по колонках
+    (див. core.validation).
+    """
+
+    def __init__(self, maps, report):
+        """Результати перевірки додаються в `report` (DryRunReport)."""
+        self.maps = maps
+        self.report = report
+        self.external_id_regex = regex_of(Vacancy, "external_id")
+        self.tax_id_regex = regex_of(Employer, "tax_id")
+
+    def __call__(self, numbers, rows):
+        report = self.report
+        report.rows += len(rows)
+
+        tax_ids = column(rows, "employer_tax_id")
+        position_codes = column(rows, "position_code")
+        location_codes = column(rows, "location_code")
+        incomplete = sorted({
+            *empty(tax_ids), *empty(position_codes), *empty(location_codes)
+        })
+        report.check(
+            "error",
+            "Недостатньо даних (tax_id, position_code, location_code)",
+            numbers,
+            incomplete,
+        )
+
+        external_ids = column(rows, "external_id")
+        report.check(
+            "error", "Відсутній external_id", numbers, empty(external_ids)
+        )
+        report.check(
+            "error",
+            "external_id не з 14 цифр",
+            numbers,
+            not_matching(external_ids, self.external_id_regex),
+        )
+
+        bad_tax_ids = not_matching(tax_ids, self.tax_id_regex)
+        report.check("error", "tax_id не з 8-10 цифр", numbers, bad_tax_ids)
+        skip = set(bad_tax_ids)
+        report.check(
+            "error",
+            "Роботодавця не знайдено",
+            numbers,
+            [
+                i for i in unknown(tax_ids, self.maps.employers.__contains__)
+                if i not in skip
+            ],
+        )
+        report.check(
+            "error",
+            "Посаду не знайдено",
+            numbers,
+            unknown(position_codes, self.maps.job_titles.__contains__),
+        )
+        report.check(
+            "error",
+            "Локацію не знайдено",
+            numbers,
+            unknown(
+                location_codes,
+                lambda code: self.maps.location(code) is not None,
+            ),
+        )
+
+        for key in ("salary_min", "salary_max"):
+            report.check(
+                "warning",
+                f"{key} не ціле число (зарплата не буде збережена)",
+                numbers,
+                not_integer(column(rows, key)),
+            )
+        for key in ("report_3pn_date", "published_at", "confirmed_at"):
+            report.check(
+                "warning",
+                f"{key} не у форматі ДД.ММ.РРРР",
+                numbers,
+                not_date(column(rows, key)),
+            )
+        # education_level обов'язковий: невідомий рівень не пройде запис
+        report.check(
+            "error",
+            "Невідомий рівень освіти",
+            numbers,
+            unknown(
+                column(rows, "education_level"),
+                lambda name: name.lower() in self.maps.education_levels,
+            ),
+        )
+        report.check(
+            "warning",
+            "Невідомий освітній ступінь",
+            numbers,
+            unknown(
+                column(rows, "degree"),
+                lambda name: name.lower() in self.maps.degrees,
+            ),
+        )
+
+
+def link_republications(vacancies):
+    """Прив'язує нові вакансії до їхньої попередньої публікації.
+
+    Попередня публікація — остання закрита вакансія того ж роботодавця
+    на тій самій посаді в тому самому населеному пункті, яка ще не має
+    продовження. Кандидати для всієї пачки вибираються одним запитом
+    (індекс vacancy_republication_idx); кожна закрита вакансія
+    продовжується не більше одного разу. Повертає кількість прив'язаних.
+    """
+    keys = {(v.employer_id, v.position_id, v.location_id) for v in vacancies}
+    if not keys:
+        return 0
+    employers, positions, locations = (
+        set(ids) for ids in zip(*keys, strict=True)
+    )
+    closed = (
+        Vacancy.objects.filter(
+            employer_id__in=employers,
+            position_id__in=positions,
+            location_id__in=locations,
+        )
+        .exclude(status="active")
+        .exclude(Exists(Vacancy.objects.filter(parent=OuterRef("pk"))))
+        .order_by(F("closed_at").desc(nulls_last=True), "-pk")
+        .values_list(
+            "pk",
+            "employer_id",
+            "position_id",
+            "location_id",
+            "generation",
+            "chain_root_id",
+        )
+    )
+    previous = {}
+    for pk, *key, generation, root_id in closed:
+        key = tuple(key)
+        if key in keys:
+            previous.setdefault(key, (pk, generation, root_id or pk))
+
+    linked = 0
+    for vacancy in vacancies:
+        parent = previous.pop(
+            (vacancy.employer_id, vacancy.position_id, vacancy.location_id),
+            None,
+        )
+        if parent is not None:
+            vacancy.parent_id, generation, vacancy.chain_root_id = parent
+            vacancy.generation = generation + 1
+            linked += 1
+    return linked
+
+
+class VacancyWriter:
+    """Стадія write: запис пачки вакансій.
+
+    У пакетному режимі пачка пишеться одним upsert по `external_id` в
+    окремій транзакції, інакше — `update_or_create` по рядку (з `save()`).
+    Лічильники рахуються так само, як при послідовному `update_or_create`:
+    повтор `external_id` у файлі вважається оновленням.
+
+    З `skip_unchanged` рядки, чий відбиток збігається зі збереженим, не
+    пишуться зовсім (і `updated_at` не змінюється).
+
+    Нові вакансії (external_id ще немає в базі) продовжують ланцюжок
+    попередньої закритої публікації (див. `link_republications`);
+    `parent`, `generation` і `chain_root` існуючих вакансій імпорт не
+    змінює.
+
+    `dedup` (vacancy.dedup.DuplicateIndex) отримує кожну записану пачку,
+    щоб одразу позначити майже однакові вакансії з інших джерел. Після
+    цього пачка переноситься в публічний список (vacancy.listing) одним
+    `sync_listings`; сигнал `save()` при записі по рядку вимкнено.
+    """
+
+    def __init__(
+        self, bulk=True, skip_unchanged=False, on_error=None, dedup=None
+    ):
+        """`on_error(vacancy, exception)` — для рядків, що не записались."""
+        self.bulk = bulk
+        self.skip_unchanged = skip_unchanged
+        self.on_error = on_error
+        self.dedup = dedup
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.errors = 0
+        self.linked = 0
+
+    def write(self, batch):
+        existing = dict(
+            Vacancy.objects.filter(
+                external_id__in={v.external_id for v in batch}
+            ).values_list("external_id", "import_fingerprint")
+        )
+        if self.skip_unchanged:
+            batch = self._changed(batch, existing)
+        # Вакансію створює останній рядок з тим самим external_id у
+        # пакетному режимі і перший — при записі по рядку
+        new = {}
+        for vacancy in batch:
+            if vacancy.external_id in existing:
+                continue
+            if self.bulk:
+                new[vacancy.external_id] = vacancy
+            else:
+                new.setdefault(vacancy.external_id, vacancy)
+        link_republications(new.values())
+
+        if not self.bulk:
+            self._written([v for v in batch if self._write_one(v)])
+            return
+        # Останній рядок з тим самим external_id перемагає
+        unique = {}
+        created = updated = 0
+        for vacancy in batch:
+            external_id = vacancy.external_id
+            if external_id in existing or external_id in unique:
+                updated += 1
+            else:
+                created += 1
+            unique[vacancy.external_id] = vacancy
+
+        try:
+            with transaction.atomic():
+                Vacancy.objects.bulk_create(
+                    unique.values(),
+                    update_conflicts=True,
+                    unique_fields=["external_id"],
+                    update_fields=[*IMPORT_FIELDS, "updated_at"],
+                )
+        except Exception:
+            # Пачка не пройшла: пишемо по рядку, щоб ізолювати помилкові
+            self._written([v for v in batch if self._write_one(v)])
+            return
+
+        self.created += created
+        self.updated += updated
+        self.linked += sum(v.parent_id is not None for v in new.values())
+        self._written(unique.values())
+
+    def _written(self, written):
+        """Дублікати і публічний список для записаних вакансій пачки."""
+        written = list(written)
+        if not written:
+            return
+        if self.dedup is not None:
+            self.dedup.add(written)
+        # id знаходиться за external_id, якщо upsert його не повернув
+        missing = [v.external_id for v in written if v.pk is None]
+        pks = {v.pk for v in written if v.pk is not None}
+        for chunk in batched(missing, QUERY_CHUNK):
+            pks.update(
+                Vacancy.objects.filter(external_id__in=chunk)
+                .values_list("pk", flat=True)
+            )
+        sync_listings(pks)
+
+    def _changed(self, batch, existing):
+        """Відкидає рядки, що не змінюють збережену вакансію."""
+        known = dict(existing)
+        changed = []
+        for vacancy in batch:
+            if known.get(vacancy.external_id) == vacancy.import_fingerprint:
+                self.unchanged += 1
+                continue
+            known[vacancy.external_id] = vacancy.import_fingerprint
+            changed.append(vacancy)
+        return changed
+
+    def _write_one(self, vacancy):
+        attnames = (Vacancy._meta.get_field(f).attname for f in IMPORT_FIELDS)
+        defaults = {name: getattr(vacancy, name) for name in attnames}
+        create_defaults = {
+            **defaults,
+            "parent_id": vacancy.parent_id,
+            "generation": vacancy.generation,
+            "chain_root_id": vacancy.chain_root_id,
+        }
+        try:
+            # Рядок списку перебудовує _written для всієї пачки
+            with transaction.atomic(), deferred():
+                _, created = Vacancy.objects.update_or_create(
+                    external_id=vacancy.external_id,
+                    defaults=defaults,
+                    create_defaults=create_defaults,
+                )
+        except Exception as e:
+            self.errors += 1
+            if self.on_error:
+                self.on_error(vacancy, e)
+            return False
+        if created:
+            self.created += 1
+            self.linked += vacancy.parent_id is not None
+        else:
+            self.updated += 1
+        return True
+
+
+class StageTimer:
+    """Час і кількість рядків по стадіях конвеєра.
+
+    Генератори вкладені один в одного, тому власний час стадії — це її
+    загальний час мінус час попередньої стадії.
+    """
+
+    def __init__(self):
+        """Порожній звіт: стадії додаються в порядку першого виміру."""
+        self.order = []
+        self.seconds = {}
+        self.rows = {}
+
+    def add(self, name, seconds, rows=0):
+        if name not in self.seconds:
+            self.order.append(name)
+            self.seconds[name] = 0.0
+            self.rows[name] = 0
+        self.seconds[name] += seconds
+        self.rows[name] += rows
+
+    def merge(self, other):
+        for name in other.order:
+            self.add(name, other.seconds[name], other.rows[name])
+
+    def wrap(self, name, iterable):
+        """Рахує час, витрачений на отримання кожного елемента."""
+        self.add(name, 0.0)
+        return self._timed(name, iter(iterable))
+
+    def _timed(self, name, iterator):
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(name, time.perf_counter() - start)
+                return
+            # None — рядок, відхилений на попередній стадії
+            self.add(name, time.perf_counter() - start, item is not None)
+            yield item
+
+    def report(self, chained):
+        """Список (стадія, рядків, власний час).
+
+        `chained` — стадії-генератори у порядку вкладення.
+        """
+        result = []
+        previous = 0.0
+        for name in self.order:
+            seconds = self.seconds[name]
+            if name in chained:
+                seconds, previous = max(seconds - previous, 0.0), seconds
+            result.append((name, self.rows[name], seconds))
+        return result
+
+
+class VacancyImportPipeline:
+    """Збирає стадії read → normalize → resolve → write в один прохід.
+
+    Відхилений рядок проходить далі стадіями як None, тож запис і
+    контрольна точка (`on_checkpoint`) відбуваються кожні `batch_size`
+    прочитаних рядків, навіть якщо серед них немає жодної вакансії.
+    """
+
+    STAGES = ("read", "normalize", "resolve")
+
+    def __init__(
+        self,
+        resolver,
+        writer,
+        batch_size=DEFAULT_BATCH_SIZE,
+        on_reject=None,
+        on_checkpoint=None,
+        track_seen=False,
+    ):
+        """`on_reject(error, row_number, row)`, `on_checkpoint(pipeline)`."""
+        self.resolver = resolver
+        self.writer = writer
+        self.batch_size = batch_size
+        self.on_reject = on_reject
+        self.on_checkpoint = on_checkpoint
+        self.rejected = 0
+        self.timer = StageTimer()
+        # external_id усіх рядків файлу (для закриття відсутніх у знімку)
+        self.seen_ids = set() if track_seen else None
+        # Номер рядка з урахуванням заголовка та поточний сирий рядок
+        self.row_number = 1
+        self.current_row = None
+        # (байтовий зсув, номер рядка), до якого все оброблено
+        self.position = None
+
+    @property
+    def created(self):
+        return self.writer.created
+
+    @property
+    def updated(self):
+        return self.writer.updated
+
+    @property
+    def unchanged(self):
+        return self.writer.unchanged
+
+    @property
+    def errors(self):
+        return self.rejected + self.writer.errors
+
+    def reject(self, error, row_number, row):
+        self.rejected += 1
+        if self.on_reject:
+            self.on_reject(error, row_number, row)
+
+    def _apply(self, func, items):
+        for item in items:
+            if item is None:
+                yield None
+                continue
+            try:
+                yield func(item)
+            except RowRejected as e:
+                self.reject(e, self.row_number, self.current_row)
+                yield None
+
+    def _resolve(self, record):
+        vacancy = self.resolver(record)
+        vacancy._import_row = (self.row_number, self.current_row)
+        return vacancy
+
+    def _track(self, rows, lines=None):
+        for row in rows:
+            self.row_number += 1
+            self.current_row = row
+            if self.seen_ids is not None:
+                self.seen_ids.add(row.get("external_id", "").strip())
+            if lines is not None:
+                self.position = (lines.offset, self.row_number)
+            yield row
+
+    def resolved(self, f, fieldnames=None, lines=None):
+        """Стадії read → normalize → resolve.
+
+        Генератор видає вакансію або None (рядок відхилено) на кожен рядок.
+        """
+        reader = read_rows(f, fieldnames)
+        rows = self.timer.wrap("read", self._track(reader, lines))
+        records = self._apply(normalize_row, rows)
+        records = self.timer.wrap("normalize", records)
+        return self.timer.wrap("resolve", self._apply(self._resolve, records))
+
+    def write(self, items, checkpoint=True):
+        """Стадія write: пачка на кожні `batch_size` прочитаних рядків."""
+        batch = []
+        for consumed, item in enumerate(items, 1):
+            if item is not None:
+                batch.append(item)
+            if consumed % self.batch_size == 0:
+                self._flush(batch, checkpoint)
+                batch = []
+        self._flush(batch, checkpoint)
+
+    def _flush(self, batch, checkpoint):
+        # Пачка і контрольна точка фіксуються разом: після збою --resume
+        # продовжить рівно з першого незаписаного рядка
+        with transaction.atomic():
+            if batch:
+                start = time.perf_counter()
+                self.writer.write(batch)
+                self.timer.add(
+                    "write", time.perf_counter() - start, len(batch)
+                )
+            if checkpoint:
+                self.checkpoint()
+
+    def checkpoint(self):
+        if self.on_checkpoint and self.position is not None:
+            self.on_checkpoint(self)
+
+    def run(self, path, position=None):
+        """Послідовний імпорт файлу.
+
+        `position` — (зсув, номер рядка) контрольної точки, з якої
+        продовжити; заголовок завжди читається з початку файлу.
+        """
+        with open(path, "rb") as f:
+            lines = ByteOffsetLines(f)
+            reader = read_rows(lines)
+            fieldnames = reader.fieldnames
+            if position is not None:
+                lines.seek(position[0])
+                self.row_number = position[1]
+            self.position = (lines.offset, self.row_number)
+            self.write(self.resolved(lines, fieldnames, lines=lines))
+
+    def run_parallel(self, path, workers, position=None):
+        """Normalize/resolve у пулі процесів, запис — лише в цьому процесі.
+
+        Результати партицій споживаються у порядку файлу, тож лічильники й
+        дані збігаються з послідовним запуском. Одночасно в роботі не
+        більше `2 * workers` партицій; контрольна точка — кінець партиції.
+        """
+        start = position[0] if position is not None else 0
+        if position is not None:
+            self.row_number = position[1]
+        fieldnames, ranges = partition_csv(
+            path,
+            max(workers, (os.path.getsize(path) - start) // PARTITION_BYTES),
+            start=start,
+        )
+        # Дочірні процеси не повинні успадкувати відкрите з'єднання з БД
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker,
+            initargs=(self.resolver,),
+        ) as pool:
+            for end, outcomes, rows, timer, seen_ids in self._partitions(
+                pool, path, fieldnames, ranges, workers
+            ):
+                self.timer.merge(timer)
+                if seen_ids:
+                    self.seen_ids.update(seen_ids)
+                # Контрольна точка — кінець партиції, тож усі її пачки
+                # фіксуються в одній транзакції з нею
+                with transaction.atomic():
+                    self.write(self._replay(outcomes), checkpoint=False)
+                    self.row_number += rows
+                    self.position = (end, self.row_number)
+                    self.checkpoint()
+
+    def _partitions(self, pool, path, fieldnames, ranges, workers):
+        """Результати партицій у порядку файлу."""
+        ranges = iter(ranges)
+        pending = deque()
+
+        def submit():
+            part = next(ranges, None)
+            if part is not None:
+                future = pool.submit(
+                    _resolve_partition,
+                    path,
+                    fieldnames,
+                    *part,
+                    track_seen=self.seen_ids is not None,
+                )
+                pending.append((part[1], future))
+
+        for _ in range(2 * workers):
+            submit()
+        while pending:
+            end, future = pending.popleft()
+            submit()
+            yield end, *future.result()
+
+    def _replay(self, outcomes):
+        """Переносить результати партиції з локальною нумерацією рядків."""
+        base = self.row_number
+        for outcome in outcomes:
+            if isinstance(outcome, Vacancy):
+                row_number, row = outcome._import_row
+                outcome._import_row = (base + row_number - 1, row)
+                yield outcome
+            else:
+                error, row_number, row = outcome
+                self.reject(error, base + row_number - 1, row)
+                yield None
+
+    def stage_report(self):
+        return self.timer.report(chained=self.STAGES)
+
+
+class ByteOffsetLines:
+    """Рядки бінарного файлу як текст з відстеженням байтового зсуву.
+
+    csv читає рівно стільки рядків, скільки займає запис, тож після
+    кожного запису `offset` вказує на початок наступного.
+    """
+
+    def __init__(self, f):
+        """`f` — файл, відкритий у бінарному режимі."""
+        self.f = f
+        self.offset = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        encoding = "utf-8-sig" if self.offset == 0 else "utf-8"
+        self.offset += len(line)
+        text = line.decode(encoding)
+        if text.endswith("\r\n"):
+            text = text[:-2] + "\n"
+        return text
+
+    def seek(self, offset):
+        self.f.seek(offset)
+        self.offset = offset
+
+
+# Резолвер у процесі пулу (успадковується через fork разом з мапами)
+_worker_resolver = None
+
+
+def _init_worker(resolver):
+    global _worker_resolver
+    _worker_resolver = resolver
+
+
+def _resolve_partition(path, fieldnames, start, end, track_seen=False):
+    """Обробляє одну партицію файлу в процесі пулу."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    outcomes = []
+    pipeline = VacancyImportPipeline(
+        _worker_resolver,
+        writer=None,
+        on_reject=lambda *reject: outcomes.append(reject),
+        track_seen=track_seen,
+    )
+    text = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")
+    for vacancy in pipeline.resolved(text, fieldnames):
+        if vacancy is not None:
+            outcomes.append(vacancy)
+    rows = pipeline.row_number - 1
+    return outcomes, rows, pipeline.timer, pipeline.seen_ids
+
+
+def close_missing(source_id, seen_ids, status="withdrawn"):
+    """Закриває активні вакансії джерела, яких немає в повному знімку.
+
+    Кандидати відбираються в пам'яті, а закриваються пакетними UPDATE в
+    одній транзакції (без `save()` на кожну вакансію).
+    """
+    missing = [
+        pk
+        for pk, external_id in Vacancy.objects.filter(
+            source_id=source_id, status="active", external_id__isnull=False
+        ).values_list("pk", "external_id").iterator()
+        if external_id not in seen_ids
+    ]
+    now = timezone.now()
+    with transaction.atomic():
+        for chunk in batched(missing, DEFAULT_BATCH_SIZE):
+            Vacancy.objects.filter(pk__in=chunk).update(
+                status=status, is_active=False, closed_at=now, updated_at=now
+            )
+        sync_listings(missing)
+    return len(missing)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportRunTracker:
+    """Зберігає прогрес імпорту в ImportRun.
+
+    Відхилені рядки накопичуються в пам'яті й пишуться пачкою разом з
+    контрольною точкою в одній транзакції, тож журнал завжди відповідає
+    збереженому зсуву.
+    """
+
+    def __init__(self, run):
+        """Лічильники продовжуються від збережених у `run` (--resume)."""
+        self.run = run
+        self.rejects = []
+        self.base = {
+            "created_count": run.created_count,
+            "updated_count": run.updated_count,
+            "unchanged_count": run.unchanged_count,
+            "error_count": run.error_count,
+        }
+
+    @classmethod
+    def start(cls, path, resume=False):
+        """Новий запуск або (з `resume`) незавершений запуск того ж файлу."""
+        file_hash = file_sha256(path)
+        run = None
+        if resume:
+            run = (
+                ImportRun.objects.filter(file_hash=file_hash)
+                .exclude(status="completed")
+                .first()
+            )
+        if run is None:
+            run = ImportRun.objects.create(
+                file_name=os.path.basename(path),
+                file_hash=file_hash,
+                file_size=os.path.getsize(path),
+            )
+        else:
+            run.status = "running"
+            run.save(update_fields=["status", "updated_at"])
+        return cls(run)
+
+    @property
+    def position(self):
+        """(зсув, номер рядка), з якого продовжити, або None."""
+        if self.run.checkpoint_offset:
+            return self.run.checkpoint_offset, self.run.checkpoint_row
+        return None
+
+    def reject(self, row_number, reason, row):
+        self.rejects.append(ImportReject(
+            run=self.run, row_number=row_number, reason=reason, raw_row=row
+        ))
+
+    def checkpoint(self, pipeline):
+        offset, row_number = pipeline.position
+        self.run.checkpoint_offset = offset
+        self.run.checkpoint_row = row_number
+        self._save(pipeline)
+
+    def finish(self, pipeline):
+        self.run.status = "completed"
+        self.run.finished_at = timezone.now()
+        self._save(pipeline, "status", "finished_at")
+
+    def fail(self):
+        """Усе після контрольної точки буде повторено при --resume."""
+        self.run.status = "failed"
+        self.run.finished_at = timezone.now()
+        self.run.save(update_fields=["status", "finished_at", "updated_at"])
+
+    def _save(self, pipeline, *fields):
+        self.run.created_count = self.base["created_count"] + pipeline.created
+        self.run.updated_count = self.base["updated_count"] + pipeline.updated
+        self.run.unchanged_count = (
+            self.base["unchanged_count"] + pipeline.unchanged
+        )
+        self.run.error_count = self.base["error_count"] + pipeline.errors
+        with transaction.atomic():
+            ImportReject.objects.bulk_create(self.rejects)
+            self.rejects = []
+            self.run.save(update_fields=[
+                *self.base, "checkpoint_offset", "checkpoint_row",
+                "updated_at", *fields,
+            ])
@@ -0,0 +1,227 @@
+"""Синхронізація публічного списку вакансій (VacancyListing).
+
+Список читає одну пласку таблицю замість JOIN вакансії з роботодавцем і
+ланцюжком КАТОТТГ. Рядок є лише в активної вакансії і перебудовується
+`sync_listings` щоразу, коли вакансія змінюється: `save()` і видалення
+(vacancy.signals), зміна тегів, пакетний імпорт, масові зміни
+статусу. Зміна роботодавця оновлює рядки всіх його вакансій.
+Код, що сам синхронізує записану пачку (імпорт), вимикає сигнали на час
+запису через `deferred()`, щоб рядок не перебудовувався двічі.
+
+Разом з вакансіями пачки перераховуються і їхні кластери дублікатів:
+голова (кількість схожих оголошень) і дублікати (чи приховані вони).
+"""
+
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import batched
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Coalesce
+
+from vacancy.models import Vacancy, VacancyListing
+
+# Скільки значень передавати в одному IN (обмеження параметрів SQLite)
+QUERY_CHUNK = 900
+
+LISTING_FIELDS = [
+    field.name
+    for field in VacancyListing._meta.concrete_fields
+    if not field.primary_key
+]
+
+# Діапазони зарплати для фасету: (номер, нижня межа, підпис). Вакансія
+# потрапляє в діапазон за мінімальною зарплатою (або максимальною, якщо
+# вказана лише вона). Після зміни — manage.py rebuild_listings
+SALARY_BANDS = [
+    (1, 0, "до 10 000"),
+    (2, 10000, "10 000 – 15 000"),
+    (3, 15000, "15 000 – 20 000"),
+    (4, 20000, "20 000 – 30 000"),
+    (5, 30000, "від 30 000"),
+]
+
+# Колонки рядка списку, вибрані з вакансії та довідників одним запитом
+# (без екземплярів моделей, тож синхронізація пачки дешева)
+SOURCE_COLUMNS = {
+    "vacancy_id": F("pk"),
+    "employer_brand_name": F("employer__brand_name"),
+    "employer_legal_name": F("employer__name"),
+    "settlement_name": F("location__name"),
+    "settlement_category": F("location__category"),
+    "district_id": F("location__community__district_id"),
+    "district_name": F("location__community__district__name"),
+    "region_id": F("location__community__district__region_id"),
+    "region_name": F("location__community__district__region__name"),
+    "position_code": F("position__code"),
+    # КВЕД вакансії, інакше основний КВЕД роботодавця
+    "kved_section": Coalesce(
+        "kved__group__division__section__code",
+        "employer__kved__group__division__section__code",
+        Value(""),
+    ),
+    # Дублікат видно, лише якщо голова кластера вже неактивна
+    "is_duplicate": Q(duplicate_of__is_active=True),
+}
+
+
+# Сигнали vacancy.signals не синхронізують рядки, поки потік у deferred()
+_state = threading.local()
+
+
+@contextmanager
+def deferred():
+    """Вимикає синхронізацію з сигналів `save()` у цьому потоці.
+
+    Для коду, що після запису сам викликає `sync_listings` для всієї
+    пачки.
+    """
+    previous = is_deferred()
+    _state.deferred = True
+    try:
+        yield
+    finally:
+        _state.deferred = previous
+
+
+def is_deferred():
+    """Чи синхронізацію з сигналів відкладено (див. `deferred()`)."""
+    return getattr(_state, "deferred", False)
+
+
+def salary_band(salary_min, salary_max):
+    """Номер діапазону SALARY_BANDS для зарплати або None."""
+    salary = salary_min or salary_max
+    if not salary:
+        return None
+    band = None
+    for number, lower, _ in SALARY_BANDS:
+        if salary >= lower:
+            band = number
+    return band
+
+
+def position_group_code(code):
+    """Група КП з коду посади: "2131.2" → "2131"."""
+    return code.partition(".")[0]
+
+
+def affected(pks):
+    """Вакансії, чиї рядки залежать від `pks`.
+
+    Самі вакансії, голови їхніх кластерів (теперішні й записані в списку)
+    і їхні дублікати.
+    """
+    pks = set(pks)
+    result = set(pks)
+    for chunk in batched(pks, QUERY_CHUNK):
+        result.update(
+            Vacancy.objects.filter(pk__in=chunk, duplicate_of__isnull=False)
+            .values_list("duplicate_of_id", flat=True)
+        )
+        result.update(
+            VacancyListing.objects.filter(
+                vacancy_id__in=chunk, duplicate_of__isnull=False
+            ).values_list("duplicate_of_id", flat=True)
+        )
+        result.update(
+            Vacancy.objects.filter(duplicate_of__in=chunk)
+            .values_list("pk", flat=True)
+        )
+        result.update(
+            VacancyListing.objects.filter(duplicate_of__in=chunk)
+            .values_list("vacancy_id", flat=True)
+        )
+    return result
+
+
+def build(values, tags=()):
+    """Рядок списку зі значень, вибраних за SOURCE_COLUMNS."""
+    position_code = values.pop("position_code")
+    brand_name = values.pop("employer_brand_name")
+    legal_name = values.pop("employer_legal_name")
+    # Без голови кластера (LEFT JOIN) порівняння дає NULL
+    is_duplicate = bool(values.pop("is_duplicate"))
+    return VacancyListing(
+        **values,
+        is_duplicate=is_duplicate,
+        employer_name=brand_name or legal_name,
+        position_group_code=position_group_code(position_code),
+        salary_band=salary_band(values["salary_min"], values["salary_max"]),
+        tag_ids=f",{','.join(map(str, sorted(tags)))}," if tags else "",
+    )
+
+
+def sync_listings(pks):
+    """Перебудовує рядки списку для вакансій `pks` (і їхніх кластерів).
+
+    Активні вакансії записуються одним upsert на пачку, рядки решти
+    (закритих або видалених) видаляються. Повертає кількість рядків.
+    """
+    pks = affected(pks)
+    written = 0
+    for chunk in batched(pks, QUERY_CHUNK):
+        vacancies = (
+            Vacancy.objects.filter(pk__in=chunk, is_active=True)
+            .order_by()
+            .values(
+                "title",
+                "published_at",
+                "employer_id",
+                "salary_min",
+                "salary_max",
+                "currency",
+                "duplicate_of_id",
+                "employment_type_id",
+                "education_level_id",
+                "degree_id",
+                "source_id",
+                settlement_id=F("location_id"),
+                **SOURCE_COLUMNS,
+            )
+            .annotate(
+                duplicate_count=Count(
+                    "duplicates", filter=Q(duplicates__is_active=True)
+                ),
+            )
+        )
+        tags = defaultdict(list)
+        for vacancy_id, tag_id in Vacancy.tags.through.objects.filter(
+            vacancy_id__in=chunk
+        ).values_list("vacancy_id", "tag_id"):
+            tags[vacancy_id].append(tag_id)
+        rows = [
+            build(values, tags.get(values["vacancy_id"], ()))
+            for values in vacancies
+        ]
+        listed = {row.vacancy_id for row in rows}
+        with transaction.atomic():
+            VacancyListing.objects.filter(vacancy_id__in=chunk).exclude(
+                vacancy_id__in=listed
+            ).delete()
+            VacancyListing.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["vacancy"],
+                update_fields=LISTING_FIELDS,
+            )
+        written += len(rows)
+    return written
+
+
+def sync_employer(employer_id):
+    """Оновлює назву роботодавця в рядках усіх його активних вакансій."""
+    return sync_employers([employer_id])
+
+
+def sync_employers(employer_ids):
+    """Те саме для пачки роботодавців (масовий upsert оминає post_save)."""
+    pks = []
+    for chunk in batched(employer_ids, QUERY_CHUNK):
+        pks.extend(
+            Vacancy.objects.filter(employer_id__in=chunk, is_active=True)
+            .values_list("pk", flat=True)
+        )
+    return sync_listings(pks)
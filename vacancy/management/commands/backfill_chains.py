@@ -0,0 +1,95 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from vacancy.importer import DEFAULT_BATCH_SIZE
+from vacancy.models import Vacancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Перераховує generation і chain_root усіх вакансій за полем '
+        'parent (після зміни ланцюжків поза save() або для даних до появи '
+        'chain_root)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість вакансій в одному bulk_update '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        # Лише вакансії, що мають попередника або вже позначені як частина
+        # ланцюжка; решта (переважна більшість) не читається в пам'ять
+        rows = Vacancy.objects.exclude(
+            parent__isnull=True, chain_root__isnull=True, generation=1
+        ).values_list('pk', 'parent_id', 'generation', 'chain_root_id')
+        current = {
+            pk: (parent_id, generation, root_id)
+            for pk, parent_id, generation, root_id in rows.iterator()
+        }
+
+        # Корінь і покоління кожної вакансії: підйом по parent з мемоізацією
+        resolved = {}
+        cycles = 0
+        for start in current:
+            path, on_path = [], set()
+            pk = start
+            while pk not in resolved:
+                parent_id = current[pk][0] if pk in current else None
+                if (
+                    parent_id is None
+                    or parent_id in on_path
+                    or parent_id == pk
+                ):
+                    # Перша вакансія ланцюжка; цикл розриваємо на цій
+                    # вакансії
+                    cycles += parent_id is not None
+                    resolved[pk] = (pk, 1)
+                    break
+                path.append(pk)
+                on_path.add(pk)
+                pk = parent_id
+            root, generation = resolved[pk]
+            for member in reversed(path):
+                generation += 1
+                resolved[member] = (root, generation)
+
+        changed = []
+        for pk, (_parent_id, generation, root_id) in current.items():
+            root, new_generation = resolved[pk]
+            new_root_id = None if root == pk else root
+            if (new_generation, new_root_id) != (generation, root_id):
+                changed.append(Vacancy(
+                    pk=pk,
+                    generation=new_generation,
+                    chain_root_id=new_root_id,
+                ))
+
+        with transaction.atomic():
+            Vacancy.objects.bulk_update(
+                changed,
+                ['generation', 'chain_root'],
+                batch_size=options['batch_size'],
+            )
+
+        if cycles:
+            self.stdout.write(self.style.WARNING(
+                f'Знайдено циклів у ланцюжках: {cycles} '
+                '(вважаються першими вакансіями)'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            'Ланцюжки перераховано. '
+            f'Перевірено вакансій: {len(current)}, оновлено: {len(changed)}'
+        ))
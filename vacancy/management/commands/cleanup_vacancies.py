@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
+from vacancy.listing import sync_listings
 from vacancy.models import Vacancy
 
 
@@ -16,11 +17,13 @@ class Command(BaseCommand):
             created_at__lt=threshold_date
         )
         
-        count = old_vacancies.count()
+        pks = list(old_vacancies.values_list('pk', flat=True))
+        count = len(pks)
         
         if count > 0:
-            # Деактивуємо їх
+            # Деактивуємо їх і прибираємо з публічного списку
             old_vacancies.update(is_active=False)
+            sync_listings(pks)
             self.stdout.write(
                 self.style.SUCCESS(f'Успішно деактивовано {count} старих вакансій.')
             )
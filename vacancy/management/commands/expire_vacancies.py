@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from vacancy.listing import sync_listings
+from vacancy.models import Vacancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Переводить активні вакансії з минулим expires_at у статус '
+        '"expired" (is_active=False, closed_at = expires_at). Розрахована '
+        'на запуск щохвилини з cron'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help=(
+                'Скільки вакансій закривати одним UPDATE '
+                '(за замовчуванням: 1000)'
+            ),
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help=(
+                'Пауза між пачками, секунд: менше навантаження на базу при '
+                'великому відставанні'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        # Межа фіксується на початку: вакансії, що протермінуються під час
+        # проходу, дочекаються наступного запуску
+        now = timezone.now()
+        expired = 0
+        while True:
+            # Найстаріші першими, за частковим індексом vacancy_expiring_idx
+            chunk = list(
+                Vacancy.objects.filter(status='active', expires_at__lte=now)
+                .order_by('expires_at')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not chunk:
+                break
+            # Кожна пачка — коротка окрема транзакція. Умова status='active'
+            # повторюється, тож паралельний запуск не закриє вакансію двічі
+            with transaction.atomic():
+                expired += Vacancy.objects.filter(
+                    pk__in=chunk, status='active'
+                ).update(
+                    status='expired',
+                    is_active=False,
+                    closed_at=F('expires_at'),
+                    updated_at=now,
+                )
+                sync_listings(chunk)
+            if options['verbosity'] >= 2:
+                self.stdout.write(f'Закрито {expired} вакансій...')
+            if len(chunk) < batch_size:
+                break
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        if expired:
+            self.stdout.write(
+                self.style.SUCCESS(f'Протерміновано вакансій: {expired}')
+            )
+        elif options['verbosity'] >= 2:
+            self.stdout.write('Протермінованих вакансій немає')
@@ -1,142 +1,212 @@
-import csv
 import os
-from datetime import datetime
-from django.core.management.base import BaseCommand
-from django.utils import timezone
-from vacancy.models import Vacancy
-from employer.models import Employer
-from dictionary.models import VacancySource, EmploymentType, EducationLevel, Degree
-from position.models import JobTitle
-from location.models import Settlement, CityDistrict
-from kved.models import Class as KvedClass
+from django.core.management.base import BaseCommand, CommandError
+from dictionary.models import VacancySource, EmploymentType, EducationLevel
+from core.validation import DryRunReport, validate_csv
+from vacancy.dedup import DuplicateIndex
+from vacancy.importer import (
+    DEFAULT_BATCH_SIZE, ImportRunTracker, LookupMaps, VacancyImportPipeline,
+    VacancyResolver, VacancyValidator, VacancyWriter, close_missing,
+)
 
 class Command(BaseCommand):
     help = 'Імпорт вакансій з CSV файлу'
 
     def add_arguments(self, parser):
         parser.add_argument('csv_file', type=str, help='Шлях до CSV файлу')
+        parser.add_argument(
+            '--bulk',
+            action='store_true',
+            help=(
+                'Пакетний режим: запис пачками (upsert по external_id) '
+                'замість update_or_create'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість рядків у пачці запису '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Кількість процесів для розбору та пошуку довідників '
+                '(запис завжди в одному процесі)'
+            ),
+        )
+        parser.add_argument(
+            '--skip-unchanged',
+            action='store_true',
+            help=(
+                'Не перезаписувати вакансії, відбиток яких не змінився '
+                'з минулого імпорту'
+            ),
+        )
+        parser.add_argument(
+            '--close-missing',
+            action='store_true',
+            help=(
+                'Файл є повним знімком: активні вакансії ДСЗ, яких у ньому '
+                'немає, закриваються (withdrawn)'
+            ),
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help=(
+                'Продовжити незавершений імпорт цього ж файлу з останньої '
+                'контрольної точки'
+            ),
+        )
+        parser.add_argument(
+            '--dedup',
+            action='store_true',
+            help=(
+                'Позначати майже однакові вакансії (з інших джерел) як '
+                'дублікати під час імпорту'
+            ),
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help=(
+                'Лише перевірити файл і показати, які рядки буде відхилено, '
+                'без запису в БД'
+            ),
+        )
 
     def handle(self, *args, **options):
         csv_file_path = options['csv_file']
 
+        # CommandError, а не повідомлення: ingest_watch має відрізнити
+        # невдалий запуск і перенести файл у failed/
         if not os.path.exists(csv_file_path):
-            self.stdout.write(self.style.ERROR(f'Файл не знайдено: {csv_file_path}'))
+            raise CommandError(f'Файл не знайдено: {csv_file_path}')
+
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size має бути більше 0')
+
+        if options['workers'] < 1:
+            raise CommandError('--workers має бути більше 0')
+
+        if options['dry_run']:
+            # Жодного запису: ні джерела, ні запуску імпорту
+            report = DryRunReport()
+            validator = VacancyValidator(LookupMaps(), report)
+            validate_csv(csv_file_path, validator, options['batch_size'])
+            report.write(self.stdout, self.style, options['verbosity'])
             return
 
+        if options['resume'] and options['close_missing']:
+            # Список external_id з уже обробленої частини файлу не
+            # зберігається
+            raise CommandError(
+                '--close-missing не можна поєднувати з --resume'
+            )
+
         # Знаходимо дефолтне джерело (ДСЗ)
         default_source, _ = VacancySource.objects.get_or_create(
-            code='dsz', 
+            code='dsz',
             defaults={'name': 'Державна служба зайнятості'}
         )
-        
+
         # Дефолтні типи (якщо вони будуть потрібні)
         default_employment = EmploymentType.objects.first()
         default_education = EducationLevel.objects.first()
 
-        with open(csv_file_path, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f, delimiter=';')
-            
-            created_count = 0
-            updated_count = 0
-            error_count = 0
-
-            for row in reader:
-                tax_id = row.get('employer_tax_id', '').strip()
-                external_id = row.get('external_id', '').strip()
-                pos_code = row.get('position_code', '').strip()
-                loc_code = row.get('location_code', '').strip()
-                salary_min = row.get('salary_min', '').strip()
-                salary_max = row.get('salary_max', '').strip()
-                description = row.get('description', '').strip()
-                report_3pn = row.get('report_3pn_date', '').strip()
-                published_at = row.get('published_at', '').strip()
-                edu_name = row.get('education_level', '').strip()
-                deg_name = row.get('degree', '').strip()
-                confirmed_at = row.get('confirmed_at', '').strip()
-
-                if not tax_id or not pos_code or not loc_code:
-                    self.stdout.write(self.style.WARNING(f'Пропущено рядок: недостатньо даних ({row})'))
-                    error_count += 1
-                    continue
-
-                # Пошук Роботодавця
-                employer = Employer.objects.filter(tax_id=tax_id).first()
-                if not employer:
-                    self.stdout.write(self.style.WARNING(f'Роботодавця з tax_id {tax_id} не знайдено. Пропуск.'))
-                    error_count += 1
-                    continue
-
-                # Пошук Посади
-                position = JobTitle.objects.filter(code=pos_code).first()
-                if not position:
-                    self.stdout.write(self.style.WARNING(f'Посаду {pos_code} не знайдено. Пропуск.'))
-                    error_count += 1
-                    continue
-
-                # Пошук Локації (з підтримкою районів у місті)
-                location = Settlement.objects.filter(code=loc_code).first()
-                if not location:
-                    city_district = CityDistrict.objects.filter(code=loc_code).select_related('settlement').first()
-                    if city_district:
-                        location = city_district.settlement
-                
-                if not location:
-                    self.stdout.write(self.style.WARNING(f'Локацію {loc_code} не знайдено. Пропуск.'))
-                    error_count += 1
-                    continue
-
-                # Пошук додаткових довідників
-                education = EducationLevel.objects.filter(name__iexact=edu_name).first() if edu_name else default_education
-                degree = Degree.objects.filter(name__iexact=deg_name).first() if deg_name else None
-
-                # Обробка зарплати (Логіка користувача: якщо min пуста, то min = max)
-                try:
-                    s_max = int(salary_max) if salary_max else None
-                    s_min = int(salary_min) if salary_min else s_max
-                except ValueError:
-                    s_min = s_max = None
-
-                # Парсинг дат
-                def parse_date(date_str, is_datetime=False):
-                    if not date_str: return None
-                    try:
-                        dt = datetime.strptime(date_str, '%d.%m.%Y')
-                        return timezone.make_aware(dt) if is_datetime else dt.date()
-                    except ValueError:
-                        return None
-
-                r_date = parse_date(report_3pn)
-                p_date = parse_date(published_at, is_datetime=True) or timezone.now()
-                c_date = parse_date(confirmed_at, is_datetime=True)
-
-                try:
-                    vacancy, created = Vacancy.objects.update_or_create(
-                        external_id=external_id,
-                        defaults={
-                            'employer': employer,
-                            'title': position.name,  # Беремо назву з довідника
-                            'position': position,
-                            'location': location,
-                            'salary_min': s_min,
-                            'salary_max': s_max,
-                            'description': description or position.name,
-                            'report_3pn_date': r_date,
-                            'published_at': p_date,
-                            'confirmed_at': c_date,
-                            'source': default_source,
-                            'employment_type': default_employment,
-                            'education_level': education,
-                            'degree': degree,
-                        }
-                    )
-                    if created:
-                        created_count += 1
-                    else:
-                        updated_count += 1
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f'Помилка при імпорті {external_id}: {str(e)}'))
-                    error_count += 1
-
-            self.stdout.write(self.style.SUCCESS(
-                f'Імпорт вакансій завершено. Створено: {created_count}, Оновлено: {updated_count}, Помилок: {error_count}'
-            ))
+        # Довідники завантажуються один раз, без запитів на кожен рядок
+        resolver = VacancyResolver(
+            LookupMaps(),
+            source_id=default_source.pk,
+            employment_type_id=getattr(default_employment, 'pk', None),
+            default_education_id=getattr(default_education, 'pk', None),
+        )
+        self.tracker = ImportRunTracker.start(
+            csv_file_path, resume=options['resume']
+        )
+        run = self.tracker.run
+        position = self.tracker.position
+        if position:
+            self.stdout.write(
+                f'Продовжуємо запуск #{run.pk} з рядка {position[1] + 1}'
+            )
+
+        dedup = DuplicateIndex() if options['dedup'] else None
+        writer = VacancyWriter(
+            bulk=options['bulk'],
+            skip_unchanged=options['skip_unchanged'],
+            on_error=self.on_error,
+            dedup=dedup,
+        )
+        pipeline = VacancyImportPipeline(
+            resolver,
+            writer,
+            batch_size=options['batch_size'],
+            on_reject=self.on_reject,
+            on_checkpoint=self.tracker.checkpoint,
+            track_seen=options['close_missing'],
+        )
+
+        try:
+            if options['workers'] > 1:
+                pipeline.run_parallel(
+                    csv_file_path, options['workers'], position
+                )
+            else:
+                pipeline.run(csv_file_path, position)
+        except BaseException:
+            self.tracker.fail()
+            raise
+        self.tracker.finish(pipeline)
+
+        if options['close_missing']:
+            closed = close_missing(default_source.pk, pipeline.seen_ids)
+            self.stdout.write(
+                f'Закрито вакансій, відсутніх у знімку: {closed}'
+            )
+
+        if writer.linked:
+            self.stdout.write(
+                f'Продовжено ланцюжків (повторні публікації): {writer.linked}'
+            )
+        if dedup:
+            self.stdout.write(
+                f'Знайдено дублікатів: {dedup.duplicates} '
+                f'з {dedup.indexed} вакансій'
+            )
+
+        self.write_stage_report(pipeline)
+        summary = (
+            f'Імпорт вакансій завершено. Створено: {run.created_count}, '
+            f'Оновлено: {run.updated_count}, Помилок: {run.error_count}'
+        )
+        if options['skip_unchanged']:
+            summary += f', Без змін: {run.unchanged_count}'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def on_reject(self, error, row_number, row):
+        self.stdout.write(self.style.WARNING(str(error)))
+        self.tracker.reject(row_number, str(error), row)
+
+    def on_error(self, vacancy, e):
+        message = f'Помилка при імпорті {vacancy.external_id}: {e}'
+        self.stdout.write(self.style.ERROR(message))
+        row_number, row = vacancy._import_row
+        self.tracker.reject(row_number, message, row)
+
+    def write_stage_report(self, pipeline):
+        """Пропускна здатність кожної стадії: де саме вузьке місце.
+
+        При --workers > 1 час read/normalize/resolve сумується по процесах.
+        """
+        for stage, rows, seconds in pipeline.stage_report():
+            rate = rows / seconds if seconds > 0 else 0
+            self.stdout.write(
+                f'  {stage:<10} {rows:>9} рядків  {seconds:8.2f} с  '
+                f'{rate:10.0f} рядків/с'
+            )
@@ -0,0 +1,237 @@
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.utils import timezone
+
+from vacancy.importer import DEFAULT_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Стежить за каталогом, куди партнери кладуть CSV з вакансіями, '
+        'та імпортує нові файли (пакетний режим). Оброблені файли '
+        'переносяться в done/, невдалі — в failed/'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'spool_dir', type=str, help='Каталог, куди надходять CSV файли'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=10,
+            help='Як часто перевіряти каталог, секунд (за замовчуванням: 10)'
+        )
+        parser.add_argument(
+            '--settle',
+            type=float,
+            default=5,
+            help=(
+                'Файл береться в роботу, лише якщо не змінювався стільки '
+                'секунд (ще дописується)'
+            ),
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Скільки файлів імпортувати одночасно (для SQLite завжди 1)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість рядків у пачці запису '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+        parser.add_argument(
+            '--skip-unchanged',
+            action='store_true',
+            help='Не перезаписувати вакансії, відбиток яких не змінився'
+        )
+        parser.add_argument(
+            '--dedup',
+            action='store_true',
+            help=(
+                'Позначати майже однакові вакансії з інших джерел '
+                'як дублікати'
+            ),
+        )
+        parser.add_argument(
+            '--name',
+            type=str,
+            default=socket.gethostname(),
+            help=(
+                'Ім\'я цього обробника (за замовчуванням: hostname); '
+                'у кожного свій processing/<name>/'
+            ),
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обробити файли, які вже є, і завершитись (для cron)'
+        )
+
+    def handle(self, *args, **options):
+        spool = Path(options['spool_dir'])
+        if not spool.is_dir():
+            raise CommandError(f'Каталог не знайдено: {spool}')
+        if options['workers'] < 1:
+            raise CommandError('--workers має бути більше 0')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size має бути більше 0')
+
+        workers = options['workers']
+        if connection.vendor == 'sqlite' and workers > 1:
+            # SQLite дозволяє лише одного writer'а
+            self.log('SQLite: файли імпортуються по одному')
+            workers = 1
+
+        self.spool = spool
+        self.processing = spool / 'processing' / options['name']
+        self.done = spool / 'done'
+        self.failed = spool / 'failed'
+        for directory in (self.processing, self.done, self.failed):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self.import_args = [
+            '--bulk', '--batch-size', str(options['batch_size'])
+        ]
+        if options['skip_unchanged']:
+            self.import_args.append('--skip-unchanged')
+        if options['dedup']:
+            self.import_args.append('--dedup')
+
+        self.stopping = threading.Event()
+        if not options['once']:
+            signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+
+        # Файли, взяті в роботу до падіння попереднього запуску: продовжуємо
+        # з контрольної точки
+        leftovers = sorted(self.processing.glob('*.csv'))
+
+        self.log(
+            f'Стежимо за {spool} (обробник {options["name"]}, '
+            f'файлів одночасно: {workers})'
+        )
+        running = set()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for path in leftovers:
+                self.log(f'{path.name}: продовжуємо перерваний імпорт')
+                running.add(executor.submit(self.ingest, path, resume=True))
+
+            try:
+                while not self.stopping.is_set():
+                    running = {
+                        future for future in running if not future.done()
+                    }
+                    # Беремо не більше файлів, ніж є вільних обробників:
+                    # решта лишається в каталозі для інших екземплярів
+                    ready = self.ready_files(options['settle'])
+                    for path in ready[:workers - len(running)]:
+                        claimed = self.claim(path)
+                        if claimed:
+                            running.add(executor.submit(self.ingest, claimed))
+                    if (
+                        options['once']
+                        and not running
+                        and not self.ready_files(options['settle'])
+                    ):
+                        break
+                    self.stopping.wait(
+                        1 if options['once'] else options['interval']
+                    )
+            except KeyboardInterrupt:
+                self.stopping.set()
+            if running:
+                self.log('Зупинка: чекаємо завершення поточних імпортів...')
+        self.log('Зупинено')
+
+    def ready_files(self, settle):
+        """CSV у корені каталогу, які вже не дописуються, від найстаріших."""
+        now = time.time()
+        files = []
+        for entry in os.scandir(self.spool):
+            if not entry.is_file() or not entry.name.lower().endswith('.csv'):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue  # Забрав інший обробник
+            if now - mtime >= settle:
+                files.append((mtime, entry.name))
+        return [self.spool / name for _, name in sorted(files)]
+
+    def claim(self, path):
+        """Атомарно забирає файл у processing/<name>/.
+
+        Перенесення — rename у межах однієї ФС. Якщо файл уже забрав інший
+        обробник, повертає None.
+        """
+        target = self.processing / path.name
+        if target.exists():
+            # Файл з такою назвою ще імпортується, візьмемо пізніше
+            return None
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            return None
+        return target
+
+    def ingest(self, path, resume=False):
+        """Імпорт одного файлу в потоці пулу.
+
+        Після імпорту файл переміщується в done/ або failed/.
+        """
+        output = StringIO()
+        started = time.perf_counter()
+        args = [str(path), *self.import_args]
+        if resume:
+            args.append('--resume')
+        try:
+            call_command(
+                'import_vacancies', *args, stdout=output, stderr=output
+            )
+        except Exception as e:
+            target = self.move(path, self.failed)
+            target.with_name(target.name + '.log').write_text(
+                f'{output.getvalue()}\n{type(e).__name__}: {e}\n',
+                encoding='utf-8',
+            )
+            self.log(self.style.ERROR(
+                f'{path.name}: помилка ({e}), файл у {target}'
+            ))
+        else:
+            self.move(path, self.done)
+            lines = output.getvalue().strip().splitlines()
+            summary = lines[-1] if lines else ''
+            seconds = time.perf_counter() - started
+            self.log(f'{path.name}: {summary} ({seconds:.1f} с)')
+        finally:
+            # Кожен потік має власне з'єднання з базою
+            connections.close_all()
+
+    def move(self, path, directory):
+        """Переносить файл з позначкою часу в імені.
+
+        Так однакові назви не перетирають одна одну.
+        """
+        target = directory / f'{timezone.now():%Y%m%d-%H%M%S}_{path.name}'
+        os.replace(path, target)
+        return target
+
+    def log(self, message):
+        now = timezone.localtime()
+        self.stdout.write(f'[{now:%Y-%m-%d %H:%M:%S}] {message}')
@@ -0,0 +1,63 @@
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from vacancy.dedup import DuplicateIndex
+from vacancy.importer import DEFAULT_BATCH_SIZE
+from vacancy.listing import sync_listings
+from vacancy.models import DuplicateBucket, Vacancy
+
+
+class Command(BaseCommand):
+    help = (
+        'Перебудова індексу майже однакових вакансій (MinHash/LSH) для всіх '
+        'активних вакансій. Потрібна після першого ввімкнення --dedup або '
+        'зміни параметрів у vacancy.dedup'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість вакансій у пачці '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        with transaction.atomic():
+            DuplicateBucket.objects.all().delete()
+            Vacancy.objects.filter(duplicate_of__isnull=False).update(
+                duplicate_of=None
+            )
+            Vacancy.objects.filter(minhash__isnull=False).update(minhash=None)
+
+        # Від найстаріших: головою кластера стає вакансія, опублікована
+        # першою
+        vacancies = (
+            Vacancy.objects.filter(is_active=True)
+            .order_by('published_at', 'pk')
+            .only('pk', 'title', 'description', 'employer_id', 'location_id')
+        )
+        index = DuplicateIndex()
+        batch_size = options['batch_size']
+        for batch in batched(
+            vacancies.iterator(chunk_size=batch_size), batch_size
+        ):
+            index.index(batch)
+            sync_listings(vacancy.pk for vacancy in batch)
+            self.stdout.write(f'Оброблено {index.indexed} вакансій...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Індекс перебудовано. Вакансій: {index.indexed}, '
+            f'дублікатів: {index.duplicates}'
+        ))
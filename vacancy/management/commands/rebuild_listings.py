@@ -0,0 +1,50 @@
+from itertools import batched
+
+from django.core.management.base import BaseCommand
+
+from vacancy.importer import DEFAULT_BATCH_SIZE
+from vacancy.listing import sync_listings
+from vacancy.models import Vacancy, VacancyListing
+
+
+class Command(BaseCommand):
+    help = (
+        'Перебудова публічного списку вакансій (VacancyListing) з нуля. '
+        'Потрібна після першого розгортання або зміни довідників КАТОТТГ, '
+        'КП чи КВЕД'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=(
+                'Кількість вакансій у пачці '
+                f'(за замовчуванням: {DEFAULT_BATCH_SIZE})'
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            self.stdout.write(
+                self.style.ERROR('--batch-size має бути більше 0')
+            )
+            return
+
+        # Рядки закритих вакансій прибираються одразу, активні перезаписуються
+        VacancyListing.objects.exclude(vacancy__is_active=True).delete()
+        pks = Vacancy.objects.filter(is_active=True).values_list(
+            'pk', flat=True
+        )
+        batch_size = options['batch_size']
+        processed = 0
+        for batch in batched(pks.iterator(chunk_size=batch_size), batch_size):
+            sync_listings(batch)
+            processed += len(batch)
+            self.stdout.write(f'Оброблено {processed} вакансій...')
+
+        self.stdout.write(self.style.SUCCESS(
+            'Список перебудовано. '
+            f'Вакансій у списку: {VacancyListing.objects.count()}'
+        ))
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:02
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vacancy", "0005_vacancy_address"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancy",
+            name="import_fingerprint",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                max_length=32,
+                verbose_name="Відбиток імпорту",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="vacancy",
+            name="external_id",
+            field=models.CharField(
+                blank=True,
+                max_length=50,
+                null=True,
+                unique=True,
+                validators=[
+                    django.core.validators.RegexValidator(
+                        message="ID повинен складатися з 14 цифр (Центр + Дата + Номер)",
+                        regex="^\\d{14}$",
+                    )
+                ],
+                verbose_name="Внутрішній номер (ID)",
+            ),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vacancy", "0006_vacancy_import_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("file_name", models.CharField(max_length=255, verbose_name="Файл")),
+                (
+                    "file_hash",
+                    models.CharField(
+                        db_index=True, max_length=64, verbose_name="SHA-256 файлу"
+                    ),
+                ),
+                (
+                    "file_size",
+                    models.PositiveBigIntegerField(verbose_name="Розмір файлу (байт)"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Виконується"),
+                            ("completed", "Завершено"),
+                            ("failed", "Перервано з помилкою"),
+                        ],
+                        default="running",
+                        max_length=20,
+                        verbose_name="Статус",
+                    ),
+                ),
+                (
+                    "checkpoint_offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Контрольна точка (байт)"
+                    ),
+                ),
+                (
+                    "checkpoint_row",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Контрольна точка (рядок)"
+                    ),
+                ),
+                (
+                    "created_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Створено"),
+                ),
+                (
+                    "updated_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Оновлено"),
+                ),
+                (
+                    "unchanged_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Без змін"),
+                ),
+                (
+                    "error_count",
+                    models.PositiveIntegerField(default=0, verbose_name="Помилок"),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Розпочато"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Оновлено"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Завершено"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запуск імпорту",
+                "verbose_name_plural": "Запуски імпорту",
+                "ordering": ["-started_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ImportReject",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_number", models.PositiveIntegerField(verbose_name="Номер рядка")),
+                ("reason", models.TextField(verbose_name="Причина")),
+                (
+                    "raw_row",
+                    models.JSONField(blank=True, null=True, verbose_name="Рядок файлу"),
+                ),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rejects",
+                        to="vacancy.importrun",
+                        verbose_name="Запуск імпорту",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Відхилений рядок",
+                "verbose_name_plural": "Відхилені рядки",
+                "ordering": ["run", "row_number"],
+            },
+        ),
+    ]
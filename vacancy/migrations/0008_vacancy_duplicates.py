@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vacancy", "0007_importrun_importreject"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancy",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="vacancy.vacancy",
+                verbose_name="Дублікат вакансії (голова кластера)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancy",
+            name="minhash",
+            field=models.BinaryField(
+                blank=True, null=True, verbose_name="MinHash-підпис"
+            ),
+        ),
+        migrations.CreateModel(
+            name="DuplicateBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.BigIntegerField(db_index=True, verbose_name="Ключ кошика"),
+                ),
+                (
+                    "vacancy",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="duplicate_buckets",
+                        to="vacancy.vacancy",
+                        verbose_name="Вакансія",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Кошик дублікатів",
+                "verbose_name_plural": "Кошики дублікатів",
+            },
+        ),
+    ]
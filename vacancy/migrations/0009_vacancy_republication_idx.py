@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0004_referencedatastate"),
+        ("employer", "0004_employer_address"),
+        ("kved", "0001_initial"),
+        ("location", "0001_initial"),
+        ("position", "0002_jobtitle"),
+        ("speciality", "0002_alter_knowledgefield_options_and_more"),
+        ("vacancy", "0008_vacancy_duplicates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                condition=models.Q(("status", "active"), _negated=True),
+                fields=["employer", "position", "location", "-closed_at"],
+                name="vacancy_republication_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0004_referencedatastate"),
+        ("employer", "0004_employer_address"),
+        ("kved", "0001_initial"),
+        ("location", "0001_initial"),
+        ("position", "0002_jobtitle"),
+        ("speciality", "0002_alter_knowledgefield_options_and_more"),
+        ("vacancy", "0010_vacancy_expiring_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancy",
+            name="chain_root",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="chain_members",
+                to="vacancy.vacancy",
+                verbose_name="Перша вакансія ланцюжка",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["chain_root", "generation"], name="vacancy_chain_idx"
+            ),
+        ),
+    ]
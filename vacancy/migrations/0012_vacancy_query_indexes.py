@@ -0,0 +1,87 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0004_referencedatastate"),
+        ("employer", "0004_employer_address"),
+        ("kved", "0001_initial"),
+        ("location", "0001_initial"),
+        ("position", "0002_jobtitle"),
+        ("speciality", "0002_alter_knowledgefield_options_and_more"),
+        ("vacancy", "0011_vacancy_chain_root"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="vacancy",
+            name="employer",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="vacancies",
+                to="employer.employer",
+                verbose_name="Роботодавець",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="vacancy",
+            name="source",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="vacancies",
+                to="dictionary.vacancysource",
+                verbose_name="Джерело",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["published_at"],
+                name="vacancy_public_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["employer", "published_at"],
+                name="vacancy_employer_published_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(fields=["published_at"], name="vacancy_published_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["status", "published_at"], name="vacancy_status_published_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["source", "published_at"], name="vacancy_source_published_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["report_3pn_date"], name="vacancy_report_3pn_date_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancy",
+            index=models.Index(
+                fields=["confirmed_at"], name="vacancy_confirmed_at_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,186 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employer", "0004_employer_address"),
+        ("location", "0001_initial"),
+        ("vacancy", "0012_vacancy_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VacancyListing",
+            fields=[
+                (
+                    "vacancy",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="listing",
+                        serialize=False,
+                        to="vacancy.vacancy",
+                        verbose_name="Вакансія",
+                    ),
+                ),
+                (
+                    "title",
+                    models.CharField(max_length=255, verbose_name="Назва вакансії"),
+                ),
+                ("published_at", models.DateTimeField(verbose_name="Дата публікації")),
+                (
+                    "employer_name",
+                    models.CharField(
+                        max_length=255, verbose_name="Роботодавець (назва)"
+                    ),
+                ),
+                (
+                    "settlement_name",
+                    models.CharField(
+                        max_length=128, verbose_name="Населений пункт (назва)"
+                    ),
+                ),
+                (
+                    "settlement_category",
+                    models.CharField(
+                        choices=[("M", "Місто"), ("X", "Селище"), ("C", "Село")],
+                        max_length=1,
+                        verbose_name="Категорія населеного пункту",
+                    ),
+                ),
+                (
+                    "district_name",
+                    models.CharField(max_length=128, verbose_name="Район (назва)"),
+                ),
+                (
+                    "region_name",
+                    models.CharField(max_length=128, verbose_name="Регіон (назва)"),
+                ),
+                (
+                    "salary_min",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Зарплата від"
+                    ),
+                ),
+                (
+                    "salary_max",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Зарплата до"
+                    ),
+                ),
+                (
+                    "currency",
+                    models.CharField(
+                        choices=[
+                            ("UAH", "₴ (Гривня)"),
+                            ("USD", "$ (Долар США)"),
+                            ("EUR", "€ (Євро)"),
+                        ],
+                        default="UAH",
+                        max_length=3,
+                        verbose_name="Валюта",
+                    ),
+                ),
+                (
+                    "position_group_code",
+                    models.CharField(max_length=20, verbose_name="Група КП"),
+                ),
+                (
+                    "kved_section",
+                    models.CharField(
+                        blank=True, default="", max_length=1, verbose_name="Секція КВЕД"
+                    ),
+                ),
+                (
+                    "is_duplicate",
+                    models.BooleanField(
+                        default=False, verbose_name="Прихований дублікат"
+                    ),
+                ),
+                (
+                    "duplicate_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Схожих оголошень"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Вакансія у списку",
+                "verbose_name_plural": "Список вакансій",
+                "ordering": ["-published_at"],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="vacancy",
+            name="vacancy_public_idx",
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="district",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="location.district",
+                verbose_name="Район",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="vacancy.vacancy",
+                verbose_name="Дублікат вакансії",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="employer",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="employer.employer",
+                verbose_name="Роботодавець",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="region",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="location.region",
+                verbose_name="Регіон",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="settlement",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="location.settlement",
+                verbose_name="Населений пункт",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancylisting",
+            index=models.Index(
+                condition=models.Q(("is_duplicate", False)),
+                fields=["published_at"],
+                name="vacancy_listing_public_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+from django.db import migrations
+
+# Повнотекстовий індекс вакансій (SQLite FTS5), див. vacancy.search.
+# rowid — id вакансії; індексуються всі вакансії (адмінка шукає і серед
+# закритих), публічний пошук обмежується рядками VacancyListing.
+# Апостроф розділяє слова так само, як у запиті (vacancy.search.match).
+CREATE_TABLE = """
+CREATE VIRTUAL TABLE vacancy_search USING fts5(
+    title,
+    description,
+    requirements,
+    responsibilities,
+    address,
+    employer,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+# Вага колонок для bm25: збіг у назві чи назві роботодавця важить більше,
+# ніж в описі. Ранжування зберігається в самій таблиці (ORDER BY rank)
+SET_RANK = """
+INSERT INTO vacancy_search (vacancy_search, rank)
+VALUES ('rank', 'bm25(10.0, 1.0, 1.0, 1.0, 0.5, 5.0)')
+"""
+
+INDEX_VACANCY = """
+INSERT INTO vacancy_search (
+    rowid, title, description, requirements, responsibilities, address, employer
+)
+SELECT v.id, v.title, v.description, v.requirements, v.responsibilities, v.address,
+       e.name || ' ' || e.brand_name
+FROM vacancy_vacancy v JOIN employer_employer e ON e.id = v.employer_id
+"""
+
+# Тригери тримають індекс у синхроні з будь-яким записом у таблиці:
+# save(), upsert імпорту, масові update() і видалення
+TRIGGERS = [
+    f"""
+    CREATE TRIGGER vacancy_search_insert AFTER INSERT ON vacancy_vacancy
+    BEGIN
+        {INDEX_VACANCY} WHERE v.id = new.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER vacancy_search_update
+    AFTER UPDATE OF title, description, requirements, responsibilities, address, employer_id
+    ON vacancy_vacancy
+    BEGIN
+        DELETE FROM vacancy_search WHERE rowid = old.id;
+        {INDEX_VACANCY} WHERE v.id = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER vacancy_search_delete AFTER DELETE ON vacancy_vacancy
+    BEGIN
+        DELETE FROM vacancy_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER vacancy_search_employer AFTER UPDATE OF name, brand_name ON employer_employer
+    BEGIN
+        UPDATE vacancy_search SET employer = new.name || ' ' || new.brand_name
+        WHERE rowid IN (SELECT id FROM vacancy_vacancy WHERE employer_id = new.id);
+    END
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("employer", "0004_employer_address"),
+        ("vacancy", "0013_vacancy_listing"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[CREATE_TABLE, SET_RANK, INDEX_VACANCY, *TRIGGERS],
+            reverse_sql=[
+                "DROP TRIGGER vacancy_search_employer",
+                "DROP TRIGGER vacancy_search_delete",
+                "DROP TRIGGER vacancy_search_update",
+                "DROP TRIGGER vacancy_search_insert",
+                "DROP TABLE vacancy_search",
+            ],
+        ),
+    ]
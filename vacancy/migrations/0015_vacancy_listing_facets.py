@@ -0,0 +1,107 @@
+# Generated by Django 5.2.9 on 2026-10-18 11:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dictionary", "0004_referencedatastate"),
+        ("employer", "0004_employer_address"),
+        ("location", "0001_initial"),
+        ("vacancy", "0014_vacancy_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="degree",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="dictionary.degree",
+                verbose_name="Освітній ступінь",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="education_level",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="dictionary.educationlevel",
+                verbose_name="Рівень освіти",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="employment_type",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="dictionary.employmenttype",
+                verbose_name="Вид зайнятості",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="salary_band",
+            field=models.PositiveSmallIntegerField(
+                blank=True, null=True, verbose_name="Діапазон зарплати"
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="source",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="dictionary.vacancysource",
+                verbose_name="Джерело",
+            ),
+        ),
+        migrations.AddField(
+            model_name="vacancylisting",
+            name="tag_ids",
+            field=models.CharField(
+                blank=True, default="", max_length=255, verbose_name="Теги (id)"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancylisting",
+            index=models.Index(
+                condition=models.Q(("is_duplicate", False)),
+                fields=[
+                    "region",
+                    "employment_type",
+                    "education_level",
+                    "degree",
+                    "source",
+                    "salary_band",
+                    "tag_ids",
+                ],
+                name="vacancy_listing_facets_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="vacancylisting",
+            index=models.Index(
+                condition=models.Q(("is_duplicate", False)),
+                fields=["region", "published_at"],
+                name="vacancy_listing_region_idx",
+            ),
+        ),
+    ]
@@ -1,8 +1,96 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.core.validators import RegexValidator
 from django.utils.translation import gettext_lazy as _
 
+from location.models import Settlement
+
+
+class VacancyQuerySet(models.QuerySet):
+
+    def lineage(self, vacancy, max_depth=1000):
+        """Увесь ланцюжок вакансії (усі покоління) одним запитом.
+
+        Рекурсивний CTE за parent: спершу вгору до першої вакансії, потім
+        униз до всіх повторних публікацій. Не залежить від збережених
+        chain_root/generation; `max_depth` обмежує цикли.
+        """
+        pk = getattr(vacancy, 'pk', vacancy)
+        quote = connections[self.db].ops.quote_name
+        table = quote(self.model._meta.db_table)
+        id_column = quote(self.model._meta.pk.column)
+        parent_column = quote(self.model._meta.get_field('parent').column)
+        sql = f"""
+            WITH RECURSIVE ancestors(id, parent_id) AS (
+                SELECT {id_column}, {parent_column} FROM {table}
+                WHERE {id_column} = %s
+                UNION
+                SELECT v.{id_column}, v.{parent_column}
+                FROM {table} v JOIN ancestors a ON v.{id_column} = a.parent_id
+            ),
+            chain(id, depth) AS (
+                SELECT id, 1 FROM ancestors WHERE parent_id IS NULL
+                UNION ALL
+                SELECT v.{id_column}, c.depth + 1
+                FROM {table} v JOIN chain c ON v.{parent_column} = c.id
+                WHERE c.depth < %s
+            )
+            SELECT id FROM chain UNION SELECT id FROM ancestors
+        """
+        return self.filter(pk__in=RawSQL(sql, (pk, max_depth))).order_by(
+            'generation', 'published_at'
+        )
+
+    def chain_metrics(self):
+        """Метрики набору вакансій (зазвичай lineage()) одним запитом.
+
+        Покоління, повторні публікації, сумарні дні відкритості, причини
+        закриття.
+        """
+        now = timezone.now()
+        open_for = models.ExpressionWrapper(
+            Coalesce(
+                'closed_at',
+                models.Value(now, output_field=models.DateTimeField()),
+            ) - models.F('published_at'),
+            output_field=models.DurationField(),
+        )
+        metrics = self.order_by().aggregate(
+            generations=models.Count('pk'),
+            first_published_at=models.Min('published_at'),
+            last_closed_at=models.Max('closed_at'),
+            filled_at=models.Max(
+                'closed_at', filter=models.Q(status='filled')
+            ),
+            total_open=models.Sum(open_for),
+            **{
+                f'{status}_count': models.Count(
+                    'pk', filter=models.Q(status=status)
+                )
+                for status, _label in Vacancy.STATUS_CHOICES
+            },
+        )
+        metrics['republications'] = max(metrics['generations'] - 1, 0)
+        total_open = metrics['total_open']
+        metrics['total_days_open'] = (
+            total_open.days if total_open is not None else 0
+        )
+        # Від першої публікації до укомплектування (якщо вакансію закрито так)
+        if metrics['filled_at'] and metrics['first_published_at']:
+            metrics['days_to_fill'] = (
+                metrics['filled_at'] - metrics['first_published_at']
+            ).days
+        else:
+            metrics['days_to_fill'] = None
+        metrics['closure_reasons'] = [
+            (label, metrics[f'{status}_count'])
+            for status, label in Vacancy.STATUS_CHOICES
+            if status != 'active' and metrics[f'{status}_count']
+        ]
+        return metrics
+
 
 class Vacancy(models.Model):
     """Модель вакансії"""
@@ -24,6 +112,7 @@ class Vacancy(models.Model):
     employer = models.ForeignKey(
         'employer.Employer',
         on_delete=models.CASCADE,
+        db_index=False,  # Покривається vacancy_employer_published_idx
         related_name='vacancies',
         verbose_name="Роботодавець"
     )
@@ -46,6 +135,7 @@ class Vacancy(models.Model):
     source = models.ForeignKey(
         'dictionary.VacancySource',
         on_delete=models.SET_NULL,
+        db_index=False,  # Покривається vacancy_source_published_idx
         null=True,
         blank=True,
         related_name='vacancies',
@@ -155,14 +245,72 @@ class Vacancy(models.Model):
         verbose_name="Попередня вакансія (ланцюжок)"
     )
     generation = models.PositiveIntegerField(default=1, verbose_name="Покоління")
+    # Перша вакансія ланцюжка (NULL — вакансія сама є першою): нащадок
+    # отримує її від попередника без обходу ланцюжка
+    chain_root = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        editable=False,
+        related_name='chain_members',
+        verbose_name="Перша вакансія ланцюжка"
+    )
+
+    # Near-duplicates (див. vacancy.dedup)
+    duplicate_of = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='duplicates',
+        verbose_name="Дублікат вакансії (голова кластера)"
+    )
+    minhash = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="MinHash-підпис"
+    )
+
+    # Import
+    import_fingerprint = models.CharField(
+        max_length=32,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Відбиток імпорту"
+    )
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Створено")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
 
+    objects = VacancyQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Попередник на момент завантаження: ланцюжок перераховується в
+        # save() лише тоді, коли він змінився
+        instance._loaded_parent_id = instance.__dict__.get('parent_id')
+        return instance
+
     def save(self, *args, **kwargs):
-        # Автоматичний розрахунок покоління
-        if self.parent:
-            self.generation = self.parent.generation + 1
+        # Автоматичний розрахунок покоління та початку ланцюжка
+        adding = self._state.adding
+        chain_changed = adding or self.parent_id != getattr(
+            self, '_loaded_parent_id', None
+        )
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'parent' not in update_fields:
+            chain_changed = False
+        elif chain_changed:
+            self.set_chain_from_parent()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'generation', 'chain_root'
+                }
         
         # Автоматична дата закриття
         if self.status != 'active' and not self.closed_at:
@@ -172,10 +320,401 @@ class Vacancy(models.Model):
 
         super().save(*args, **kwargs)
 
+        if chain_changed and not adding:
+            self.update_descendants()
+        self._loaded_parent_id = self.parent_id
+
+    def set_chain_from_parent(self):
+        """Обчислює generation і chain_root за попередником.
+
+        Не більше одного запиту, без завантаження об'єкта parent.
+        """
+        if self.parent_id is None:
+            self.generation = 1
+            self.chain_root_id = None
+            return
+        if Vacancy.parent.is_cached(self):
+            generation = self.parent.generation
+            root_id = self.parent.chain_root_id
+        else:
+            generation, root_id = Vacancy.objects.values_list(
+                'generation', 'chain_root_id'
+            ).get(pk=self.parent_id)
+        self.generation = generation + 1
+        self.chain_root_id = root_id or self.parent_id
+
+    def update_descendants(self):
+        """Переносить нащадків разом з цією вакансією.
+
+        Один UPDATE на покоління.
+        """
+        root_id = self.chain_root_id or self.pk
+        frontier, seen = [self.pk], {self.pk}
+        generation = self.generation
+        while frontier:
+            children = [
+                pk
+                for pk in Vacancy.objects.filter(
+                    parent_id__in=frontier
+                ).values_list('pk', flat=True)
+                if pk not in seen  # захист від циклу, створеного вручну
+            ]
+            generation += 1
+            Vacancy.objects.filter(pk__in=children).update(
+                chain_root_id=root_id, generation=generation
+            )
+            seen.update(children)
+            frontier = children
+
+    @property
+    def days_open(self):
+        """Скільки днів вакансія була (або є) відкритою."""
+        return ((self.closed_at or timezone.now()) - self.published_at).days
+
     class Meta:
         verbose_name = "Вакансія"
         verbose_name_plural = "Вакансії"
         ordering = ['-published_at']
+        # Індекси під реальні запити; плани перевіряються в vacancy/tests.py.
+        # published_at за зростанням: зворотний прохід дає ORDER BY
+        # -published_at, -id (сортування адмінки) без додаткового сортування
+        indexes = [
+            # Вакансії роботодавця (сторінка роботодавця)
+            models.Index(
+                fields=['employer', 'published_at'],
+                name='vacancy_employer_published_idx',
+            ),
+            # Адмінка: сортування за замовчуванням і фільтри
+            models.Index(
+                fields=['published_at'], name='vacancy_published_idx'
+            ),
+            models.Index(
+                fields=['status', 'published_at'],
+                name='vacancy_status_published_idx',
+            ),
+            models.Index(
+                fields=['source', 'published_at'],
+                name='vacancy_source_published_idx',
+            ),
+            models.Index(
+                fields=['report_3pn_date'], name='vacancy_report_3pn_date_idx'
+            ),
+            models.Index(
+                fields=['confirmed_at'], name='vacancy_confirmed_at_idx'
+            ),
+            # Пошук попередньої публікації під час імпорту (ланцюжки)
+            models.Index(
+                fields=['employer', 'position', 'location', '-closed_at'],
+                condition=~models.Q(status='active'),
+                name='vacancy_republication_idx',
+            ),
+            # Вакансії ланцюжка за chain_root; замінює індекс FK
+            # (db_index=False), зокрема для SET_NULL при видаленні першої
+            models.Index(
+                fields=['chain_root', 'generation'], name='vacancy_chain_idx'
+            ),
+            # Пошук протермінованих вакансій (expire_vacancies)
+            models.Index(
+                fields=['expires_at'],
+                condition=models.Q(status='active'),
+                name='vacancy_expiring_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} @ {self.employer.brand_name or self.employer.name}"
+
+
+class DuplicateBucket(models.Model):
+    """Кошик LSH: смуга MinHash-підпису вакансії (див. vacancy.dedup)."""
+
+    key = models.BigIntegerField(db_index=True, verbose_name="Ключ кошика")
+    vacancy = models.ForeignKey(
+        Vacancy,
+        on_delete=models.CASCADE,
+        related_name='duplicate_buckets',
+        verbose_name="Вакансія"
+    )
+
+    class Meta:
+        verbose_name = "Кошик дублікатів"
+        verbose_name_plural = "Кошики дублікатів"
+
+    def __str__(self):
+        return f"{self.key}: {self.vacancy_id}"
+
+
+class VacancyListing(models.Model):
+    """Рядок публічного списку: активна вакансія з усім, що показує картка.
+
+    Денормалізована копія (назви роботодавця та КАТОТТГ, зарплата, групи
+    КП і КВЕД), щоб список і фільтри читали одну таблицю без JOIN.
+    Синхронізується vacancy.listing.sync_listings; посилання без
+    зовнішніх ключів у БД, бо рядок перебудовується разом з вакансією.
+    """
+
+    vacancy = models.OneToOneField(
+        Vacancy,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='listing',
+        verbose_name="Вакансія"
+    )
+    title = models.CharField(max_length=255, verbose_name="Назва вакансії")
+    published_at = models.DateTimeField(verbose_name="Дата публікації")
+
+    employer = models.ForeignKey(
+        'employer.Employer',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name="Роботодавець"
+    )
+    employer_name = models.CharField(
+        max_length=255, verbose_name="Роботодавець (назва)"
+    )
+
+    settlement = models.ForeignKey(
+        'location.Settlement',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name="Населений пункт"
+    )
+    settlement_name = models.CharField(
+        max_length=128, verbose_name="Населений пункт (назва)"
+    )
+    settlement_category = models.CharField(
+        max_length=1,
+        choices=Settlement.CATEGORY_CHOICES,
+        verbose_name="Категорія населеного пункту"
+    )
+    district = models.ForeignKey(
+        'location.District',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name="Район"
+    )
+    district_name = models.CharField(
+        max_length=128, verbose_name="Район (назва)"
+    )
+    region = models.ForeignKey(
+        'location.Region',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name='+',
+        verbose_name="Регіон"
+    )
+    region_name = models.CharField(
+        max_length=128, verbose_name="Регіон (назва)"
+    )
+
+    salary_min = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Зарплата від"
+    )
+    salary_max = models.PositiveIntegerField(
+        null=True, blank=True, verbose_name="Зарплата до"
+    )
+    currency = models.CharField(
+        max_length=3,
+        choices=Vacancy.CURRENCY_CHOICES,
+        default='UAH',
+        verbose_name="Валюта"
+    )
+    # Межа зарплати (vacancy.listing.SALARY_BANDS); NULL — зарплату не вказано
+    salary_band = models.PositiveSmallIntegerField(
+        null=True, blank=True, verbose_name="Діапазон зарплати"
+    )
+    position_group_code = models.CharField(
+        max_length=20, verbose_name="Група КП"
+    )
+    kved_section = models.CharField(
+        max_length=1, blank=True, default="", verbose_name="Секція КВЕД"
+    )
+
+    # Фасети списку (vacancy.facets); NULL лише в рядках, записаних до
+    # появи фасетів (до manage.py rebuild_listings)
+    employment_type = models.ForeignKey(
+        'dictionary.EmploymentType',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Вид зайнятості"
+    )
+    education_level = models.ForeignKey(
+        'dictionary.EducationLevel',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Рівень освіти"
+    )
+    degree = models.ForeignKey(
+        'dictionary.Degree',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Освітній ступінь"
+    )
+    source = models.ForeignKey(
+        'dictionary.VacancySource',
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Джерело"
+    )
+    # id тегів у вигляді ",3,7," — фільтр і лічильник тегу без JOIN
+    tag_ids = models.CharField(
+        max_length=255, blank=True, default="", verbose_name="Теги (id)"
+    )
+
+    # Згортання дублікатів (див. vacancy.dedup): дублікат активної вакансії
+    # у списку не показується, а голова кластера показує їхню кількість
+    duplicate_of = models.ForeignKey(
+        Vacancy,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name="Дублікат вакансії"
+    )
+    is_duplicate = models.BooleanField(
+        default=False, verbose_name="Прихований дублікат"
+    )
+    duplicate_count = models.PositiveIntegerField(
+        default=0, verbose_name="Схожих оголошень"
+    )
+
+    class Meta:
+        verbose_name = "Вакансія у списку"
+        verbose_name_plural = "Список вакансій"
+        ordering = ['-published_at']
+        indexes = [
+            # Публічний список: is_duplicate=False ORDER BY -published_at
+            models.Index(
+                fields=['published_at'],
+                condition=models.Q(is_duplicate=False),
+                name='vacancy_listing_public_idx',
+            ),
+            # Лічильники фасетів (vacancy.facets): GROUP BY лише за індексом
+            models.Index(
+                fields=[
+                    'region', 'employment_type', 'education_level', 'degree',
+                    'source', 'salary_band', 'tag_ids',
+                ],
+                condition=models.Q(is_duplicate=False),
+                name='vacancy_listing_facets_idx',
+            ),
+            # Найчастіший фасет: список вакансій області
+            models.Index(
+                fields=['region', 'published_at'],
+                condition=models.Q(is_duplicate=False),
+                name='vacancy_listing_region_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.title} @ {self.employer_name}"
+
+    @property
+    def location(self):
+        """Населений пункт так само, як у str(Settlement)."""
+        category = self.get_settlement_category_display()
+        return (
+            f"{self.settlement_name} ({category}), "
+            f"{self.region_name} обл., {self.district_name} р-н"
+        )
+
+
+class ImportRun(models.Model):
+    """Запуск імпорту вакансій з файлу: контрольна точка та підсумки."""
+
+    STATUS_CHOICES = (
+        ('running', 'Виконується'),
+        ('completed', 'Завершено'),
+        ('failed', 'Перервано з помилкою'),
+    )
+
+    file_name = models.CharField(max_length=255, verbose_name="Файл")
+    file_hash = models.CharField(
+        max_length=64, db_index=True, verbose_name="SHA-256 файлу"
+    )
+    file_size = models.PositiveBigIntegerField(
+        verbose_name="Розмір файлу (байт)"
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='running',
+        verbose_name="Статус"
+    )
+
+    # Checkpoint: усе до цього зсуву вже записано в БД
+    checkpoint_offset = models.PositiveBigIntegerField(
+        default=0, verbose_name="Контрольна точка (байт)"
+    )
+    checkpoint_row = models.PositiveIntegerField(
+        default=0, verbose_name="Контрольна точка (рядок)"
+    )
+
+    created_count = models.PositiveIntegerField(
+        default=0, verbose_name="Створено"
+    )
+    updated_count = models.PositiveIntegerField(
+        default=0, verbose_name="Оновлено"
+    )
+    unchanged_count = models.PositiveIntegerField(
+        default=0, verbose_name="Без змін"
+    )
+    error_count = models.PositiveIntegerField(
+        default=0, verbose_name="Помилок"
+    )
+
+    started_at = models.DateTimeField(
+        auto_now_add=True, verbose_name="Розпочато"
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Оновлено")
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name="Завершено"
+    )
+
+    class Meta:
+        verbose_name = "Запуск імпорту"
+        verbose_name_plural = "Запуски імпорту"
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.file_name} ({self.get_status_display()})"
+
+
+class ImportReject(models.Model):
+    """Рядок файлу, який не вдалося імпортувати."""
+
+    run = models.ForeignKey(
+        ImportRun,
+        on_delete=models.CASCADE,
+        related_name='rejects',
+        verbose_name="Запуск імпорту"
+    )
+    row_number = models.PositiveIntegerField(verbose_name="Номер рядка")
+    reason = models.TextField(verbose_name="Причина")
+    raw_row = models.JSONField(
+        null=True, blank=True, verbose_name="Рядок файлу"
+    )
+
+    class Meta:
+        verbose_name = "Відхилений рядок"
+        verbose_name_plural = "Відхилені рядки"
+        ordering = ['run', 'row_number']
+
+    def __str__(self):
+        return f"Рядок {self.row_number}: {self.reason}"
@@ -0,0 +1,193 @@
+"""Повнотекстовий пошук вакансій (SQLite FTS5).
+
+Індекс `vacancy_search` (міграція 0014_vacancy_search) містить назву,
+опис, вимоги, обов'язки, адресу і назви роботодавця кожної вакансії й
+оновлюється тригерами на vacancy_vacancy та employer_employer, тож
+імпорт, save() і масові update() не потребують окремої синхронізації.
+
+Запит користувача не передається в MATCH як є: з нього беруться лише
+слова, кожне стає префіксною фразою ("прод"* знайде "продавець").
+Результати впорядковуються за bm25 (ваги колонок задані в міграції).
+
+bm25 рахується для кожного збігу, тож для загального слова на мільйоні
+вакансій це сотні мілісекунд. Тому ранжуються лише MAX_RESULTS
+найновіших збігів (rowid — id вакансії): межу дає прохід індексом за
+rowid, а рахувати й сортувати лишається не більше MAX_RESULTS рядків.
+"""
+
+import re
+
+from django.core.exceptions import FullResultSet
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from vacancy.models import VacancyListing
+
+# Скільки слів запиту враховувати
+MAX_TERMS = 10
+
+# Скільки найновіших збігів ранжувати й показувати
+MAX_RESULTS = 1000
+
+# Довжина фрагмента тексту з підсвіченими збігами, у словах
+SNIPPET_TOKENS = 24
+
+# Символи слова для токенізатора unicode61: літери й цифри
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Межі збігу у highlight()/snippet(): у тексті вакансій таких символів
+# немає, тож після екранування HTML їх можна замінити на <mark>
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+
+
+def match(text):
+    """Вираз MATCH для тексту з пошукового поля або "" для порожнього.
+
+    Слово з апострофом чи дефісом ("п'ять", "офіс-менеджер") токенізатор
+    ділить на частини, тож воно шукається як фраза з цих частин.
+    """
+    phrases = []
+    for word in text.split():
+        tokens = _TOKEN_RE.findall(word)
+        if tokens:
+            phrases.append('"{}"*'.format(" ".join(tokens)))
+    return " ".join(phrases[:MAX_TERMS])
+
+
+def matching(text):
+    """Вакансії (усіх статусів), що відповідають тексту, для `pk__in`."""
+    return RawSQL(
+        "SELECT rowid FROM vacancy_search WHERE vacancy_search MATCH %s",
+        (match(text),),
+    )
+
+
+def highlighted(text):
+    """Текст з highlight()/snippet() як безпечний HTML з <mark>."""
+    return mark_safe(
+        escape(text or "")
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+class SearchResults:
+    """Результати публічного пошуку в порядку релевантності.
+
+    Поводиться як послідовність для Paginator: `count()` рахує збіги
+    серед вакансій публічного списку (не більше MAX_RESULTS), а зріз
+    вибирає сторінку одним запитом до індексу (ORDER BY rank ... LIMIT)
+    і повертає рядки VacancyListing з підсвіченими `title_highlighted`
+    і `snippet`. `truncated` — чи є збіги, старші за показані.
+
+    `listings` (queryset VacancyListing, напр. з фасетами) додатково
+    обмежує результати умовами свого WHERE. Межа MAX_RESULTS
+    найновіших береться без цих умов, тож фільтр звужує той самий набір
+    збігів, що й лічильники фасетів (див. `floor`).
+    """
+
+    def __init__(self, text, listings=None):
+        """`text` — рядок з пошукового поля."""
+        self.query = match(text)
+        listing = connection.ops.quote_name(VacancyListing._meta.db_table)
+        # Параметри: текст MATCH, межа rowid, далі — умов `listings`
+        self._base_from = self._from = (
+            f"FROM vacancy_search JOIN {listing} "
+            f"ON {listing}.vacancy_id = vacancy_search.rowid "
+            "WHERE vacancy_search MATCH %s AND vacancy_search.rowid > %s "
+            f"AND NOT {listing}.is_duplicate"
+        )
+        self._params = ()
+        if listings is not None:
+            # Умови queryset на тому ж рядку списку, а не IN (SELECT ...):
+            # підзапит з фільтром області вибирав би сотні тисяч id
+            compiler = listings.query.get_compiler(connection=connection)
+            try:
+                sql, params = compiler.compile(listings.query.where)
+            except FullResultSet:
+                pass
+            else:
+                self._from += f" AND {sql}"
+                self._params += tuple(params)
+        self._bounds = None
+
+    def _range(self):
+        """(межа rowid, кількість): показуються збіги з rowid понад межу."""
+        if self._bounds is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT vacancy_search.rowid {self._base_from} "
+                    "ORDER BY vacancy_search.rowid DESC LIMIT 1 OFFSET %s",
+                    (self.query, 0, MAX_RESULTS),
+                )
+                row = cursor.fetchone()
+                floor = 0 if row is None else row[0]
+                if row is not None and self._from == self._base_from:
+                    self._bounds = (floor, MAX_RESULTS)
+                else:
+                    cursor.execute(
+                        f"SELECT COUNT(*) {self._from}",
+                        (self.query, floor, *self._params),
+                    )
+                    self._bounds = (floor, cursor.fetchone()[0])
+        return self._bounds
+
+    @property
+    def limit(self):
+        return MAX_RESULTS
+
+    @property
+    def floor(self):
+        """Нижня межа id: пошук охоплює лише вакансії понад неї.
+
+        Найбільший id вакансії, старшої за MAX_RESULTS найновіших збігів
+        (0, якщо збігів не більше).
+        """
+        return self._range()[0] if self.query else 0
+
+    @property
+    def truncated(self):
+        return bool(self.query) and self._range()[0] > 0
+
+    def count(self):
+        if not self.query:
+            return 0
+        return self._range()[1]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        stop = self.count() if index.stop is None else index.stop
+        limit = min(stop, self.count()) - start
+        if not self.query or limit <= 0:
+            return []
+        sql = (
+            "SELECT vacancy_search.rowid, "
+            f"highlight(vacancy_search, 0, '{_MARK_START}', '{_MARK_END}'), "
+            f"snippet(vacancy_search, -1, '{_MARK_START}', '{_MARK_END}', "
+            f"'…', {SNIPPET_TOKENS}) "
+            f"{self._from} ORDER BY rank LIMIT %s OFFSET %s"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                sql,
+                (self.query, self._range()[0], *self._params, limit, start),
+            )
+            rows = cursor.fetchall()
+
+        listings = VacancyListing.objects.in_bulk([pk for pk, _, _ in rows])
+        results = []
+        for pk, title, snippet in rows:
+            listing = listings.get(pk)
+            if listing is not None:
+                listing.title_highlighted = highlighted(title)
+                listing.snippet = highlighted(snippet)
+                results.append(listing)
+        return results
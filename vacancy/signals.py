@@ -0,0 +1,47 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from employer.models import Employer
+from vacancy.listing import is_deferred, sync_employer, sync_listings
+from vacancy.models import Vacancy, VacancyListing
+
+
+@receiver(post_save, sender=Vacancy)
+def vacancy_saved(sender, instance, raw=False, **kwargs):
+    """Рядок публічного списку оновлюється разом з вакансією.
+
+    Імпорт пише вакансії в `deferred()` і синхронізує пачку сам.
+    """
+    if not raw and not is_deferred():
+        sync_listings([instance.pk])
+
+
+@receiver(post_delete, sender=Vacancy)
+def vacancy_deleted(sender, instance, **kwargs):
+    # Рядок самої вакансії видаляє CASCADE; лишається її кластер дублікатів
+    sync_listings(
+        [pk for pk in (instance.pk, instance.duplicate_of_id) if pk]
+    )
+
+
+@receiver(m2m_changed, sender=Vacancy.tags.through)
+def vacancy_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # Теги денормалізовані в рядку списку (фасет "Теги")
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        sync_listings([instance.pk])
+    elif pk_set:
+        sync_listings(pk_set)
+    elif action == 'post_clear':
+        # tag.vacancies.clear(): які вакансії мали тег, уже невідомо
+        sync_listings(VacancyListing.objects.filter(
+            tag_ids__contains=f',{instance.pk},'
+        ).values_list('vacancy_id', flat=True))
+
+
+@receiver(post_save, sender=Employer)
+def employer_saved(sender, instance, created=False, raw=False, **kwargs):
+    """Назва роботодавця денормалізована в рядках його вакансій."""
+    if not created and not raw:
+        sync_employer(instance.pk)
@@ -1,3 +1,1054 @@
-from django.test import TestCase
+import csv
+import tempfile
+from io import StringIO
+from pathlib import Path
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from dictionary.models import (
+    EducationLevel,
+    EmploymentType,
+    Tag,
+    VacancySource,
+)
+from employer.models import Employer
+from location.models import Community, District, Region, Settlement
+from position.models import JobTitle
+from vacancy.dedup import DuplicateIndex
+from vacancy.facets import facet_counts
+from vacancy.listing import sync_listings
+from vacancy.importer import (
+    ImportRunTracker,
+    LookupMaps,
+    partition_csv,
+    VacancyImportPipeline,
+    VacancyResolver,
+    VacancyWriter,
+)
+from vacancy.management.commands.ingest_watch import Command as IngestWatch
+from vacancy.models import ImportRun, Vacancy, VacancyListing
+from vacancy.search import match
+
+
+class VacancyFixtures:
+    """Роботодавець, джерело і три вакансії.
+
+    Активна, укомплектована і протермінована.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            username='admin', email='admin@example.com', password='admin'
+        )
+        cls.employer = Employer.objects.create(
+            owner=cls.admin, name='ТОВ "Тест"', tax_id='12345678'
+        )
+        cls.source = VacancySource.objects.create(
+            name='Тестове джерело', code='test'
+        )
+
+        # Кілька вакансій, щоб сторінки справді вибирали рядки (на порожній
+        # таблиці пагінатор не виконує запит сторінки)
+        region = Region.objects.create(
+            code='UA01', name='Область', category='O'
+        )
+        district = District.objects.create(
+            code='UA0102', name='Район', region=region
+        )
+        community = Community.objects.create(
+            code='UA010203', name='Громада', district=district
+        )
+        settlement = Settlement.objects.create(
+            code='UA0102030001', name='Село', community=community,
+            category='C',
+        )
+        cls.position = JobTitle.objects.create(
+            code='1110.1', name='Продавець'
+        )
+        cls.settlement = settlement
+        cls.employment_type = EmploymentType.objects.create(name='Повна')
+        cls.education_level = EducationLevel.objects.create(
+            name='Вища освіта'
+        )
+        for status in ('active', 'filled', 'expired'):
+            vacancy = cls.vacancy(status=status, is_active=status == 'active')
+            if status == 'active':
+                cls.active = vacancy
+
+    @classmethod
+    def vacancy(cls, **fields):
+        """Вакансія з довідниками фікстури (поля можна перевизначити)."""
+        return Vacancy.objects.create(**{
+            'employer': cls.employer,
+            'title': 'Продавець',
+            'description': 'Опис',
+            'position': cls.position,
+            'location': cls.settlement,
+            'employment_type': cls.employment_type,
+            'education_level': cls.education_level,
+            'source': cls.source,
+            **fields,
+        })
+
+
+@skipUnless(
+    connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN є лише в SQLite'
+)
+class VacancyQueryPlanTests(VacancyFixtures, TestCase):
+    """Запити сторінок зі списками вакансій ідуть за індексами.
+
+    Індекси описані у Vacancy.Meta.indexes. Сторінка відкривається
+    тестовим клієнтом, а для її запитів до vacancy_vacancy виконується
+    EXPLAIN QUERY PLAN: міграція, що прибере або змінить індекс, поверне
+    повне сканування таблиці чи сортування, і тест це покаже.
+    """
+
+    def plans(self, url, table='vacancy_vacancy'):
+        """Повертає [(SQL, рядки плану)] SELECT з `table` зі сторінки."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        result = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                sql = query['sql']
+                if sql.startswith('SELECT') and f'FROM "{table}"' in sql:
+                    cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                    plan = [row[3] for row in cursor.fetchall()]
+                    result.append((sql, plan))
+        self.assertTrue(result, f'{url}: немає запитів до {table}')
+        return result
+
+    def page_plan(self, url, table='vacancy_vacancy'):
+        """План запиту, що вибирає сторінку списку (з ORDER BY)."""
+        for sql, plan in self.plans(url, table):
+            if 'ORDER BY' in sql:
+                return plan
+        self.fail(f'{url}: немає запиту сторінки списку')
+
+    def assertNoFullScan(self, plan, table='vacancy_vacancy'):
+        self.assertNotIn(f'SCAN {table}', plan, plan)
+
+    def assertNoSort(self, plan):
+        sorts = [
+            line for line in plan
+            if 'TEMP B-TREE FOR' in line and 'ORDER BY' in line
+        ]
+        self.assertFalse(sorts, plan)
+
+    def assertUsesIndex(self, plan, index):
+        uses = [line for line in plan if f'INDEX {index}' in line]
+        self.assertTrue(uses, plan)
+
+    def test_public_list(self):
+        plan = self.page_plan(
+            reverse('vacancy:list'), 'vacancy_vacancylisting'
+        )
+        self.assertUsesIndex(plan, 'vacancy_listing_public_idx')
+        self.assertNoFullScan(plan, 'vacancy_vacancylisting')
+        self.assertNoSort(plan)
+
+    def test_public_list_count(self):
+        plans = self.plans(reverse('vacancy:list'), 'vacancy_vacancylisting')
+        for sql, plan in plans:
+            if sql.startswith('SELECT COUNT(*)'):
+                # Будь-який частковий індекс is_duplicate=False покриває
+                # підрахунок
+                self.assertUsesIndex(plan, 'vacancy_listing_')
+
+    def test_facet_counts(self):
+        cache.clear()
+        plans = self.plans(reverse('vacancy:list'), 'vacancy_vacancylisting')
+        for sql, plan in plans:
+            if 'GROUP BY' in sql:
+                # Лічильники фасетів не читають саму таблицю
+                self.assertUsesIndex(plan, 'vacancy_listing_facets_idx')
+                self.assertNoFullScan(plan, 'vacancy_vacancylisting')
+                break
+        else:
+            self.fail('немає запиту лічильників фасетів')
+
+    def test_public_list_single_table(self):
+        """Сторінка списку не звертається до інших таблиць."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('vacancy:list'))
+        self.assertEqual(
+            [v.pk for v in response.context['page_obj']], [self.active.pk]
+        )
+        for query in queries.captured_queries:
+            self.assertNotIn('JOIN', query['sql'])
+            self.assertNotIn('"vacancy_vacancy"', query['sql'])
+
+    def test_employer_vacancies(self):
+        url = reverse('employer:detail', args=[self.employer.pk])
+        for sql, plan in self.plans(url):
+            self.assertUsesIndex(plan, 'vacancy_employer_published_idx')
+            if 'ORDER BY' in sql:
+                self.assertNoSort(plan)
+
+    def test_admin_default_ordering(self):
+        self.client.force_login(self.admin)
+        plan = self.page_plan(reverse('admin:vacancy_vacancy_changelist'))
+        self.assertUsesIndex(plan, 'vacancy_published_idx')
+        self.assertNoSort(plan)
+
+    def test_admin_filters(self):
+        self.client.force_login(self.admin)
+        url = reverse('admin:vacancy_vacancy_changelist')
+        cases = [
+            ('status__exact=filled', 'vacancy_status_published_idx', True),
+            (
+                f'source__id__exact={self.source.pk}',
+                'vacancy_source_published_idx',
+                True,
+            ),
+            # Діапазон дат: індекс відбирає рядки, сортується лише вибране
+            (
+                'report_3pn_date__gte=2025-01-01'
+                '&report_3pn_date__lt=2025-02-01',
+                'vacancy_report_3pn_date_idx',
+                False,
+            ),
+            (
+                'confirmed_at__gte=2025-01-01&confirmed_at__lt=2025-02-01',
+                'vacancy_confirmed_at_idx',
+                False,
+            ),
+        ]
+        for query, index, ordered in cases:
+            with self.subTest(query):
+                plan = self.page_plan(f'{url}?{query}')
+                self.assertUsesIndex(plan, index)
+                self.assertNoFullScan(plan)
+                if ordered:
+                    self.assertNoSort(plan)
+
+
+class VacancyListingTests(VacancyFixtures, TestCase):
+    """Рядки VacancyListing стежать за змінами, що оминають save()."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def employer_name(self):
+        return VacancyListing.objects.get(pk=self.active.pk).employer_name
+
+    def test_expire_vacancies(self):
+        expires_at = timezone.now() - timedelta(hours=1)
+        later = self.vacancy(expires_at=timezone.now() + timedelta(days=1))
+        Vacancy.objects.filter(pk=self.active.pk).update(expires_at=expires_at)
+
+        output = StringIO()
+        call_command('expire_vacancies', '--batch-size', '1', stdout=output)
+        self.assertIn('Протерміновано вакансій: 1', output.getvalue())
+        expired = Vacancy.objects.get(pk=self.active.pk)
+        self.assertEqual(
+            (expired.status, expired.is_active), ('expired', False)
+        )
+        # Закрита в момент закінчення терміну, а не запуску команди
+        self.assertEqual(expired.closed_at, expires_at)
+        self.assertFalse(
+            VacancyListing.objects.filter(pk=expired.pk).exists()
+        )
+        self.assertTrue(VacancyListing.objects.filter(pk=later.pk).exists())
+
+    def test_bulk_employer_import_renames(self):
+        path = self.tmp / 'employers.csv'
+        path.write_text(
+            'tax_id;name\n12345678;ТОВ "Нова назва"\n', encoding='utf-8'
+        )
+        call_command(
+            'import_employers',
+            str(path),
+            '--bulk',
+            owner='admin@example.com',
+            stdout=StringIO(),
+        )
+        self.assertEqual(self.employer_name(), 'ТОВ "Нова назва"')
+
+
+class VacancyCsvFiles:
+    """Невеликі CSV у форматі вивантаження ДСЗ у тимчасовому каталозі."""
+
+    HEADER = (
+        'external_id;employer_tax_id;position_code;location_code;'
+        'salary_max;description;education_level'
+    )
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def write_csv(self, rows, name='vacancies.csv'):
+        """CSV зі списків у форматі вивантаження (;, лапки за потреби)."""
+        path = self.tmp / name
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter=';', lineterminator='\n')
+            writer.writerow(self.HEADER.split(';'))
+            writer.writerows(rows)
+        return path
+
+    def vacancy_rows(self, count, start=0, description='Опис'):
+        return [
+            [
+                f'{number:014d}', '12345678', '1110.1', 'UA0102030001',
+                10000 + number, description, 'Вища освіта',
+            ]
+            for number in range(start, start + count)
+        ]
+
+    def import_vacancies(self, path, *args):
+        call_command('import_vacancies', str(path), *args, stdout=StringIO())
+        return ImportRun.objects.order_by('-pk').first()
+
+
+
+class VacancyImportTests(VacancyFixtures, VacancyCsvFiles, TestCase):
+    """import_vacancies на невеликих файлах у форматі вивантаження ДСЗ."""
+
+    def imported(self):
+        """Значення імпортованих вакансій у порядку external_id."""
+        return list(
+            Vacancy.objects.filter(external_id__isnull=False)
+            .order_by('external_id')
+            .values_list(
+                'external_id', 'title', 'salary_min', 'salary_max',
+                'description', 'location_id', 'education_level_id',
+                'import_fingerprint',
+            )
+        )
+
+    def test_bulk_matches_row_by_row(self):
+        rows = self.vacancy_rows(5)
+        # Повтор external_id і рядок без посади
+        rows.append([*rows[1][:4], 99000, 'Оновлений опис', 'Вища освіта'])
+        rows.append(
+            ['00000000000009', '12345678', '', 'UA0102030001', '', '', '']
+        )
+        path = self.write_csv(rows)
+
+        run = self.import_vacancies(path)
+        expected = self.imported()
+        counts = (run.created_count, run.updated_count, run.error_count)
+        Vacancy.objects.filter(external_id__isnull=False).delete()
+
+        run = self.import_vacancies(path, '--bulk', '--batch-size', '3')
+        self.assertEqual(
+            (run.created_count, run.updated_count, run.error_count), counts
+        )
+        self.assertEqual(counts, (5, 1, 1))
+        self.assertEqual(self.imported(), expected)
+        # Останній рядок з тим самим external_id перемагає
+        self.assertEqual(expected[1][3:5], (99000, 'Оновлений опис'))
+
+    def test_row_by_row_syncs_listing_once_per_batch(self):
+        def listing_queries(count, start):
+            path = self.write_csv(
+                self.vacancy_rows(count, start=start), name=f'{start}.csv'
+            )
+            with CaptureQueriesContext(connection) as queries:
+                self.import_vacancies(path)
+            return len([
+                q for q in queries.captured_queries
+                if 'vacancy_vacancylisting' in q['sql']
+            ])
+
+        # Сигнал save() вимкнено: кількість запитів до списку не залежить
+        # від кількості рядків у пачці
+        self.assertEqual(listing_queries(1, 0), listing_queries(6, 10))
+        self.assertEqual(
+            VacancyListing.objects.filter(
+                vacancy__external_id__isnull=False
+            ).count(),
+            7,
+        )
+
+    def test_pipeline_batches_and_checkpoints(self):
+        rows = self.vacancy_rows(5, description='Графік\n5/2; повний день')
+        rows[2][2] = ''  # Без посади: відхиляється на normalize
+        path = self.write_csv(rows)
+        resolver = VacancyResolver(
+            LookupMaps(),
+            self.source.pk,
+            self.employment_type.pk,
+            self.education_level.pk,
+        )
+        batches, checkpoints, rejects = [], [], []
+        writer = VacancyWriter()
+        write = writer.write
+        writer.write = lambda batch: (
+            batches.append(len(batch)) or write(batch)
+        )
+        pipeline = VacancyImportPipeline(
+            resolver,
+            writer,
+            batch_size=2,
+            on_reject=lambda error, number, row: rejects.append(number),
+            on_checkpoint=lambda p: checkpoints.append(p.position),
+        )
+        pipeline.run(path)
+
+        # Пачка на кожні 2 прочитані рядки, разом з відхиленими
+        self.assertEqual(batches, [2, 1, 1])
+        # Номер рядка файлу з урахуванням заголовка
+        self.assertEqual(rejects, [4])
+        self.assertEqual((pipeline.created, pipeline.errors), (4, 1))
+        self.assertEqual([row for _, row in checkpoints], [3, 5, 6])
+        # Зсув контрольної точки — початок наступного запису, навіть після
+        # поля з переносом рядка в лапках
+        data = path.read_bytes()
+        for offset, row_number in checkpoints[:-1]:
+            record = f'{row_number - 1:014d};'.encode()
+            self.assertTrue(data[offset:].startswith(record), offset)
+        self.assertEqual(checkpoints[-1][0], len(data))
+        self.assertEqual(
+            [(stage, rows) for stage, rows, _ in pipeline.stage_report()],
+            [('read', 5), ('normalize', 4), ('resolve', 4), ('write', 4)],
+        )
+
+    def quoted_rows(self, count):
+        """Багаторядкові описи в лапках, зокрема з "" всередині."""
+        rows = self.vacancy_rows(count)
+        for number, row in enumerate(rows):
+            lines = ['Вимоги: "досвід"; графік 5/2'] * (number % 4 + 1)
+            row[5] = '\n'.join(lines)
+        return rows
+
+    def test_partitions_split_between_records(self):
+        path = self.write_csv(self.quoted_rows(40))
+        data = path.read_bytes()
+        with open(path, encoding='utf-8', newline='') as f:
+            expected = list(csv.reader(f, delimiter=';'))
+        middle = data.index(b'\n00000000000017;') + 1
+        for parts, start in ((8, 0), (5, middle)):
+            with self.subTest(parts=parts, start=start):
+                fieldnames, ranges = partition_csv(path, parts, start)
+                self.assertEqual(fieldnames, expected[0])
+                self.assertGreater(len(ranges), 2)
+                rows = []
+                for begin, end in ranges:
+                    # Межа — завжди початок запису, а не середина поля
+                    # в лапках
+                    head = data[begin:begin + 15].decode()
+                    self.assertRegex(head, r'^\d{14};')
+                    chunk = StringIO(data[begin:end].decode(), newline='')
+                    rows.extend(csv.reader(chunk, delimiter=';'))
+                skipped = 1 if start == 0 else 18
+                self.assertEqual(rows, expected[skipped:])
+                self.assertEqual(ranges[-1][1], len(data))
+
+    def test_parallel_matches_sequential(self):
+        rows = self.quoted_rows(30)
+        rows[7][2] = '9999.9'  # Невідома посада
+        rows.append([*rows[3][:4], 99000, 'Оновлений опис', 'Вища освіта'])
+        path = self.write_csv(rows)
+
+        run = self.import_vacancies(path, '--bulk', '--batch-size', '4')
+        expected = self.imported()
+        counts = (run.created_count, run.updated_count, run.error_count)
+        rejects = list(run.rejects.values_list('row_number', 'reason'))
+        Vacancy.objects.filter(external_id__isnull=False).delete()
+
+        run = self.import_vacancies(
+            path, '--bulk', '--batch-size', '4', '--workers', '2'
+        )
+        self.assertEqual(counts, (29, 1, 1))
+        self.assertEqual(
+            (run.created_count, run.updated_count, run.error_count), counts
+        )
+        self.assertEqual(
+            list(run.rejects.values_list('row_number', 'reason')), rejects
+        )
+        self.assertEqual(self.imported(), expected)
+
+    def test_skip_unchanged(self):
+        rows = self.vacancy_rows(4)
+        self.import_vacancies(self.write_csv(rows), '--bulk')
+        imported = Vacancy.objects.filter(external_id__isnull=False)
+        updated_at = dict(imported.values_list('external_id', 'updated_at'))
+
+        rows[1][4] = 55000
+        run = self.import_vacancies(
+            self.write_csv(rows, name='second.csv'),
+            '--bulk',
+            '--skip-unchanged',
+        )
+        self.assertEqual(
+            (run.created_count, run.updated_count, run.unchanged_count),
+            (0, 1, 3),
+        )
+        # Незмінені рядки не перезаписуються зовсім
+        changed = rows[1][0]
+        for external_id, value in imported.values_list(
+            'external_id', 'updated_at'
+        ):
+            self.assertEqual(
+                value == updated_at[external_id],
+                external_id != changed,
+                external_id,
+            )
+        self.assertEqual(
+            Vacancy.objects.get(external_id=changed).salary_max, 55000
+        )
+
+    def test_close_missing(self):
+        self.import_vacancies(self.write_csv(self.vacancy_rows(4)), '--bulk')
+        # Повний знімок без останньої вакансії
+        snapshot = self.write_csv(self.vacancy_rows(3), name='snapshot.csv')
+        run = self.import_vacancies(snapshot, '--bulk', '--close-missing')
+        self.assertEqual(run.status, 'completed')
+
+        missing = Vacancy.objects.get(external_id=f'{3:014d}')
+        self.assertEqual(
+            (missing.status, missing.is_active), ('withdrawn', False)
+        )
+        self.assertIsNotNone(missing.closed_at)
+        listings = VacancyListing.objects
+        self.assertFalse(listings.filter(pk=missing.pk).exists())
+        imported = Vacancy.objects.filter(external_id__isnull=False)
+        self.assertEqual(imported.filter(status='active').count(), 3)
+        # Вакансії інших джерел знімок не стосується
+        self.assertTrue(listings.filter(pk=self.active.pk).exists())
+
+    def test_republication_continues_chain(self):
+        # Дві закриті публікації фікстури; продовжується остання закрита
+        filled = Vacancy.objects.get(status='filled')
+        expired = Vacancy.objects.get(status='expired')
+        Vacancy.objects.filter(pk=filled.pk).update(
+            closed_at=timezone.now() - timedelta(days=1)
+        )
+        Vacancy.objects.filter(pk=expired.pk).update(
+            closed_at=timezone.now() - timedelta(days=10)
+        )
+
+        rows = self.vacancy_rows(2)
+        self.import_vacancies(self.write_csv(rows), '--bulk')
+        imported = Vacancy.objects.filter(external_id__isnull=False)
+        first, second = imported.order_by('external_id')
+        # Пачка продовжує лише останню закриту публікацію, і лише один раз
+        linked = {first.parent_id, second.parent_id}
+        self.assertEqual(linked, {filled.pk, None})
+        republication = first if first.parent_id else second
+        self.assertEqual(
+            (republication.generation, republication.chain_root_id),
+            (2, filled.pk),
+        )
+
+        # Повторний імпорт не змінює ланцюжок існуючих вакансій
+        self.import_vacancies(
+            self.write_csv(rows, name='again.csv'), '--bulk'
+        )
+        self.assertEqual(
+            set(imported.values_list('parent_id', flat=True)), linked
+        )
+        # Укомплектована вже має продовження: наступна нова йде за
+        # протермінованою
+        self.import_vacancies(
+            self.write_csv(self.vacancy_rows(1, start=5), name='next.csv'),
+            '--bulk',
+        )
+        self.assertEqual(
+            Vacancy.objects.get(external_id=f'{5:014d}').parent_id, expired.pk
+        )
+
+    def test_resume_after_crash_between_batches(self):
+        path = self.write_csv(self.vacancy_rows(6))
+        checkpoint = ImportRunTracker.checkpoint
+        calls = []
+
+        def crash_on_third(tracker, pipeline):
+            calls.append(pipeline.position)
+            if len(calls) == 3:
+                raise RuntimeError('збій')
+            checkpoint(tracker, pipeline)
+
+        imported = Vacancy.objects.filter(external_id__isnull=False)
+        with (
+            mock.patch.object(ImportRunTracker, 'checkpoint', crash_on_third),
+            self.assertRaises(RuntimeError),
+        ):
+            self.import_vacancies(path, '--bulk', '--batch-size', '2')
+        # Третя пачка відкочена разом зі своєю контрольною точкою
+        self.assertEqual(imported.count(), 4)
+        self.assertEqual(ImportRun.objects.get().status, 'failed')
+
+        run = self.import_vacancies(
+            path, '--bulk', '--batch-size', '2', '--resume'
+        )
+        self.assertEqual(ImportRun.objects.count(), 1)
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual((run.created_count, run.updated_count), (6, 0))
+        self.assertEqual(imported.count(), 6)
+
+    def test_rejects_in_admin(self):
+        rows = self.vacancy_rows(3)
+        for row in rows[:2]:
+            row[2] = '9999.9'  # Невідома посада
+        run = self.import_vacancies(self.write_csv(rows), '--bulk')
+        self.assertEqual(run.error_count, 2)
+
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse('admin:vacancy_importrun_change', args=[run.pk])
+        )
+        # Сторінка запуску не виводить самі рядки, лише посилання на них
+        self.assertNotContains(response, 'Посаду 9999.9 не знайдено')
+        changelist = reverse('admin:vacancy_importreject_changelist')
+        self.assertContains(response, f'{changelist}?run__id__exact={run.pk}')
+        response = self.client.get(changelist, {'run__id__exact': run.pk})
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_invalid_options_raise(self):
+        path = self.write_csv(self.vacancy_rows(1))
+        for args in (
+            ['--batch-size', '0'],
+            ['--workers', '0'],
+            ['--resume', '--close-missing'],
+        ):
+            with self.subTest(args), self.assertRaises(CommandError):
+                self.import_vacancies(path, *args)
+        self.assertFalse(ImportRun.objects.exists())
+
+    def test_dry_run_rejects_match_import(self):
+        rows = self.vacancy_rows(8)
+        rows[1][2] = ''  # Без посади
+        rows[2][1] = '87654321'  # Невідомий роботодавець
+        rows[3][3] = 'UA9999999999'  # Невідома локація
+        rows[4][0] = '123'  # external_id не з 14 цифр
+        rows[5][0] = ''  # Без external_id
+        rows[6][6] = 'Невідома'  # Невідомий рівень освіти
+        rows[7][4] = 'багато'  # Зарплата губиться, рядок імпортується
+        path = self.write_csv(rows)
+
+        output = StringIO()
+        call_command(
+            'import_vacancies', str(path), '--dry-run', '--batch-size', '3',
+            verbosity=2, stdout=output,
+        )
+        self.assertIn(
+            'Буде відхилено: 6, з попередженнями: 1', output.getvalue()
+        )
+        self.assertFalse(ImportRun.objects.exists())
+        self.assertFalse(
+            Vacancy.objects.filter(external_id__isnull=False).exists()
+        )
+
+        run = self.import_vacancies(path)
+        self.assertEqual(
+            sorted(run.rejects.values_list('row_number', flat=True)),
+            [3, 4, 5, 6, 7, 8],
+        )
+        self.assertEqual((run.created_count, run.error_count), (2, 6))
+
+    def test_ingest_moves_failed_import(self):
+        command = IngestWatch(stdout=StringIO())
+        command.done, command.failed = self.tmp / 'done', self.tmp / 'failed'
+        command.done.mkdir()
+        command.failed.mkdir()
+        command.import_args = ['--bulk']
+        command.ingest(self.write_csv(self.vacancy_rows(2), name='good.csv'))
+        self.assertEqual(len(list(command.done.glob('*good.csv'))), 1)
+
+        # Помилка налаштувань імпорту — не успіх: файл іде в failed/ з логом
+        command.import_args = ['--bulk', '--batch-size', '0']
+        command.ingest(self.write_csv(self.vacancy_rows(2), name='bad.csv'))
+        self.assertEqual(len(list(command.failed.glob('*bad.csv'))), 1)
+        self.assertEqual(len(list(command.failed.glob('*bad.csv.log'))), 1)
+        self.assertFalse(list(command.done.glob('*bad.csv')))
+
+
+class IngestWatchTests(
+    VacancyFixtures, VacancyCsvFiles, TransactionTestCase
+):
+    """ingest_watch --once на тимчасовому каталозі-спулі.
+
+    Файли імпортуються в потоках пулу, тож тест без спільної транзакції.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.setUpTestData()
+        self.processing = self.tmp / 'processing' / 'test'
+        self.processing.mkdir(parents=True)
+
+    def ingest_watch(self):
+        output = StringIO()
+        call_command(
+            'ingest_watch', str(self.tmp), '--once', '--name', 'test',
+            '--settle', '0', '--batch-size', '2', stdout=output,
+        )
+        return output.getvalue()
+
+    def interrupted(self, name):
+        """Файл у processing/test/, імпорт якого впав після двох пачок."""
+        path = self.write_csv(
+            self.vacancy_rows(6, start=100), name=f'processing/test/{name}'
+        )
+        checkpoint = ImportRunTracker.checkpoint
+        calls = []
+
+        def crash_on_third(tracker, pipeline):
+            calls.append(pipeline.position)
+            if len(calls) == 3:
+                raise RuntimeError('збій')
+            checkpoint(tracker, pipeline)
+
+        with (
+            mock.patch.object(ImportRunTracker, 'checkpoint', crash_on_third),
+            self.assertRaises(RuntimeError),
+        ):
+            self.import_vacancies(path, '--bulk', '--batch-size', '2')
+        return path
+
+    def test_once(self):
+        leftover = self.interrupted('left.csv')
+        self.write_csv(self.vacancy_rows(3), name='good.csv')
+        # Не UTF-8: імпорт падає на читанні
+        (self.tmp / 'bad.csv').write_bytes(
+            f'{self.HEADER}\nВакансія\n'.encode('cp1251')
+        )
+
+        output = self.ingest_watch()
+        self.assertIn('left.csv: продовжуємо перерваний імпорт', output)
+        done, failed = self.tmp / 'done', self.tmp / 'failed'
+        self.assertEqual(
+            sorted(path.name.split('_', 1)[1] for path in done.iterdir()),
+            ['good.csv', 'left.csv'],
+        )
+        self.assertEqual(
+            sorted(path.name.split('_', 1)[1] for path in failed.iterdir()),
+            ['bad.csv', 'bad.csv.log'],
+        )
+        log = next(failed.glob('*bad.csv.log')).read_text(encoding='utf-8')
+        self.assertIn('UnicodeDecodeError', log)
+        self.assertFalse(list(self.processing.iterdir()))
+        self.assertFalse(list(self.tmp.glob('*.csv')))
+
+        # Перерваний файл продовжено тим самим запуском, з контрольної точки
+        run = ImportRun.objects.get(file_name=leftover.name)
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual((run.created_count, run.updated_count), (6, 0))
+        self.assertEqual(
+            ImportRun.objects.get(file_name='good.csv').created_count, 3
+        )
+        self.assertEqual(
+            Vacancy.objects.filter(external_id__isnull=False).count(), 9
+        )
+
+
+class VacancyDuplicateTests(VacancyFixtures, TestCase):
+    """Майже однакові вакансії з різних джерел (vacancy.dedup)."""
+
+    DESCRIPTION = (
+        'Продавець-консультант у продуктовий магазин. Графік роботи '
+        '2 через 2, офіційне працевлаштування, своєчасна виплата заробітної '
+        'плати, навчання на місці'
+    )
+
+    def test_near_duplicates_join_cluster(self):
+        other = VacancySource.objects.create(
+            name='Інше джерело', code='other'
+        )
+        first = self.vacancy(description=self.DESCRIPTION, source=other)
+        copy = self.vacancy(description=self.DESCRIPTION + '. Телефонуйте!')
+        different = self.vacancy(
+            description='Водій категорії C на міжміські перевезення, '
+            'досвід від 3 років'
+        )
+        employer = Employer.objects.create(
+            owner=self.admin, name='ТОВ "Інший"', tax_id='87654321'
+        )
+        elsewhere = self.vacancy(
+            description=self.DESCRIPTION, employer=employer
+        )
+
+        index = DuplicateIndex()
+        index.index([first])
+        index.index([copy, different, elsewhere])
+        self.assertEqual((index.indexed, index.duplicates), (4, 1))
+        self.assertEqual(
+            Vacancy.objects.get(pk=copy.pk).duplicate_of_id, first.pk
+        )
+        # Інший текст чи інший роботодавець — не дублікат
+        self.assertIsNone(Vacancy.objects.get(pk=different.pk).duplicate_of_id)
+        self.assertIsNone(Vacancy.objects.get(pk=elsewhere.pk).duplicate_of_id)
+
+        # У публічному списку лишається голова кластера
+        sync_listings([copy.pk])
+        self.assertTrue(VacancyListing.objects.get(pk=copy.pk).is_duplicate)
+        self.assertEqual(
+            VacancyListing.objects.get(pk=first.pk).duplicate_count, 1
+        )
+
+        # Повторне індексування голови не робить її дублікатом власного
+        # кластера
+        index.index([Vacancy.objects.get(pk=first.pk)])
+        self.assertIsNone(Vacancy.objects.get(pk=first.pk).duplicate_of_id)
+        self.assertEqual(
+            Vacancy.objects.get(pk=copy.pk).duplicate_of_id, first.pk
+        )
+
+
+class VacancyChainTests(VacancyFixtures, TestCase):
+    """Ланцюжки повторних публікацій: parent, generation, chain_root."""
+
+    def setUp(self):
+        now = timezone.now()
+        self.first = self.vacancy(
+            status='filled', published_at=now - timedelta(days=30)
+        )
+        self.second = self.vacancy(
+            status='expired',
+            parent=self.first,
+            published_at=now - timedelta(days=15),
+        )
+        self.third = self.vacancy(
+            parent=self.second, published_at=now - timedelta(days=5)
+        )
+        Vacancy.objects.filter(pk=self.first.pk).update(
+            closed_at=now - timedelta(days=20)
+        )
+        Vacancy.objects.filter(pk=self.second.pk).update(
+            closed_at=now - timedelta(days=10)
+        )
+
+    def chain_state(self, *vacancies):
+        return list(
+            Vacancy.objects.filter(pk__in=[v.pk for v in vacancies])
+            .order_by('pk')
+            .values_list('generation', 'chain_root_id')
+        )
+
+    def test_backfill_chains(self):
+        expected = [(1, None), (2, self.first.pk), (3, self.first.pk)]
+        chain = (self.first, self.second, self.third)
+        self.assertEqual(self.chain_state(*chain), expected)
+        # Ланцюжок, змінений поза save(), і цикл, створений вручну
+        Vacancy.objects.filter(pk__in=[self.second.pk, self.third.pk]).update(
+            generation=1, chain_root=None
+        )
+        a, b = self.vacancy(), self.vacancy()
+        Vacancy.objects.filter(pk=a.pk).update(parent=b)
+        Vacancy.objects.filter(pk=b.pk).update(parent=a)
+
+        output = StringIO()
+        call_command('backfill_chains', stdout=output)
+        self.assertIn('Знайдено циклів у ланцюжках: 1', output.getvalue())
+        self.assertEqual(self.chain_state(*chain), expected)
+        # Цикл розривається на одній з вакансій: вона стає першою
+        self.assertIn(
+            self.chain_state(a, b),
+            [[(1, None), (2, a.pk)], [(2, b.pk), (1, None)]],
+        )
+
+        # Повторний запуск нічого не змінює
+        output = StringIO()
+        call_command('backfill_chains', stdout=output)
+        self.assertIn('оновлено: 0', output.getvalue())
+
+    def test_lineage_and_metrics(self):
+        # Будь-яка вакансія ланцюжка дає весь ланцюжок, без chain_root
+        Vacancy.objects.filter(pk__in=[self.second.pk, self.third.pk]).update(
+            chain_root=None
+        )
+        for vacancy in (self.first, self.second, self.third):
+            with self.subTest(vacancy.pk):
+                self.assertEqual(
+                    [v.pk for v in Vacancy.objects.lineage(vacancy)],
+                    [self.first.pk, self.second.pk, self.third.pk],
+                )
+        self.assertEqual(
+            [v.pk for v in Vacancy.objects.lineage(self.active)],
+            [self.active.pk],
+        )
+
+        metrics = Vacancy.objects.lineage(self.third).chain_metrics()
+        self.assertEqual(
+            (metrics['generations'], metrics['republications']), (3, 2)
+        )
+        # 10 + 5 днів закритих публікацій і 5 днів активної
+        self.assertEqual(metrics['total_days_open'], 20)
+        self.assertEqual(metrics['days_to_fill'], 10)
+        self.assertEqual(
+            metrics['closure_reasons'],
+            [('Укомплектована', 1), ('Протермінована (архів)', 1)],
+        )
+
+    def test_lineage_survives_cycle(self):
+        Vacancy.objects.filter(pk=self.first.pk).update(parent=self.third)
+        lineage = Vacancy.objects.lineage(self.second, max_depth=10)
+        pks = {v.pk for v in lineage}
+        self.assertEqual(pks, {self.first.pk, self.second.pk, self.third.pk})
+
+
+@skipUnless(
+    connection.vendor == 'sqlite',
+    'Повнотекстовий індекс є лише в SQLite (FTS5)',
+)
+class VacancySearchTests(VacancyFixtures, TestCase):
+    """Пошук за індексом vacancy_search: публічний список і адмінка."""
+
+    def search(self, query):
+        response = self.client.get(reverse('vacancy:list'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return list(response.context['page_obj'])
+
+    def test_match(self):
+        self.assertEqual(match('  '), '')
+        self.assertEqual(match('"OR" <b>'), '"OR"* "b"*')
+        self.assertEqual(
+            match("офіс-менеджер п'ять"), '"офіс менеджер"* "п ять"*'
+        )
+
+    def test_public_search(self):
+        results = self.search('прод')
+        # Лише вакансії публічного списку, з підсвіченим збігом
+        self.assertEqual([v.pk for v in results], [self.active.pk])
+        self.assertEqual(
+            results[0].title_highlighted, '<mark>Продавець</mark>'
+        )
+        self.assertEqual(self.search('зварювальник'), [])
+
+    def test_index_follows_updates(self):
+        # Масовий update() оминає save(), індекс оновлюють тригери
+        Vacancy.objects.filter(pk=self.active.pk).update(
+            description='Потрібен <зварювальник>'
+        )
+        [result] = self.search('зварюв')
+        self.assertEqual(
+            result.snippet, 'Потрібен &lt;<mark>зварювальник</mark>&gt;'
+        )
+
+        self.employer.brand_name = 'Весна'
+        self.employer.save()
+        self.assertEqual(
+            [v.pk for v in self.search('весна')], [self.active.pk]
+        )
+
+        self.active.delete()
+        self.assertEqual(self.search('прод'), [])
+
+    def test_admin_search(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse('admin:vacancy_vacancy_changelist'), {'q': 'прод'}
+        )
+        self.assertEqual(response.context['cl'].result_count, 3)
+
+
+class VacancyFacetTests(VacancyFixtures, TestCase):
+    """Фасети публічного списку: лічильники одним запитом і кеш."""
+
+    def setUp(self):
+        cache.clear()
+
+    def facets(self, **params):
+        response = self.client.get(reverse('vacancy:list'), params)
+        self.assertEqual(response.status_code, 200)
+        counts = {
+            facet.name: {value: count for value, _, count, _ in options}
+            for facet, options in response.context['facets']
+        }
+        return [v.pk for v in response.context['page_obj']], counts
+
+    def test_counts(self):
+        pks, counts = self.facets()
+        self.assertEqual(pks, [self.active.pk])
+        region = self.active.location.community.district.region_id
+        self.assertEqual(counts['region'], {region: 1})
+        self.assertEqual(counts['source'], {self.source.pk: 1})
+        self.assertNotIn('salary', counts)
+
+    def test_selected_facet_keeps_alternatives(self):
+        other = Region.objects.create(
+            code='UA02', name='Інша область', category='O'
+        )
+        region = self.active.location.community.district.region_id
+        pks, counts = self.facets(region=other.pk)
+        self.assertEqual(pks, [])
+        # Власний фасет не звужує лічильники: видно, скільки дасть інша
+        # область
+        self.assertEqual(counts['region'], {region: 1, other.pk: 0})
+        self.assertNotIn('source', counts)
+
+    def test_invalid_values_ignored(self):
+        # "²" — isdigit(), але не int(); 20 цифр не вміщуються в ціле SQLite
+        region = self.active.location.community.district.region_id
+        for value in ('²', '99999999999999999999', 'abc'):
+            with self.subTest(value):
+                pks, counts = self.facets(region=value)
+                self.assertEqual(pks, [self.active.pk])
+                self.assertEqual(counts['region'], {region: 1})
+
+    def test_single_aggregate_query_and_cache(self):
+        listings = VacancyListing.objects.filter(is_duplicate=False)
+        with CaptureQueriesContext(connection) as queries:
+            facet_counts(listings, {'source': (self.source.pk,)})
+        listing_queries = [
+            q for q in queries.captured_queries
+            if 'vacancy_vacancylisting' in q['sql']
+        ]
+        self.assertEqual(len(listing_queries), 1)
+        with self.assertNumQueries(0):
+            facet_counts(listings, {'source': (self.source.pk,)})
+
+    @skipUnless(
+        connection.vendor == 'sqlite',
+        'Повнотекстовий індекс є лише в SQLite (FTS5)',
+    )
+    def test_search_counts_match_capped_results(self):
+        # Новіша вакансія в іншій області; пошук охоплює лише найновіший
+        # збіг
+        region = Region.objects.create(
+            code='UA02', name='Інша область', category='O'
+        )
+        district = District.objects.create(
+            code='UA0201', name='Район', region=region
+        )
+        community = Community.objects.create(
+            code='UA020101', name='Громада', district=district
+        )
+        newer = Vacancy.objects.get(pk=self.active.pk)
+        newer.pk = None
+        newer.location = Settlement.objects.create(
+            code='UA0201010001',
+            name='Місто',
+            community=community,
+            category='M',
+        )
+        newer.save()
+        with mock.patch('vacancy.search.MAX_RESULTS', 1):
+            pks, counts = self.facets(q='продавець')
+            self.assertEqual(pks, [newer.pk])
+            self.assertEqual(counts['region'], {region.pk: 1})
+            # Старіша вакансія за межею: фільтр її не повертає, лічильник 0
+            old_region = self.active.location.community.district.region_id
+            pks, counts = self.facets(q='продавець', region=old_region)
+            self.assertEqual(pks, [])
+            self.assertEqual(
+                counts['region'], {region.pk: 1, old_region: 0}
+            )
+
+    def test_tags(self):
+        tag = Tag.objects.create(name='Без досвіду')
+        self.active.tags.add(tag)
+        self.assertEqual(
+            VacancyListing.objects.get(pk=self.active.pk).tag_ids,
+            f',{tag.pk},',
+        )
+        pks, counts = self.facets(tag=tag.pk)
+        self.assertEqual(pks, [self.active.pk])
+        self.assertEqual(counts['tag'], {tag.pk: 1})
@@ -1,20 +1,57 @@
 from django.shortcuts import render, get_object_or_404
-from .models import Vacancy
+from . import facets, search
+from .models import Vacancy, VacancyListing
 from core.utils import get_paginated_page
 
 def vacancy_list(request):
-    """Список активних вакансій з пагінацією"""
-    vacancy_qs = Vacancy.objects.select_related(
-        "employer", 
-        "location__community__district__region"
-    ).filter(is_active=True)
+    """Список активних вакансій з пагінацією, пошуком і фасетами.
+
+    Повнотекстовий пошук; дублікати з інших джерел згорнуті.
+    """
+    query = request.GET.get("q", "").strip()
+    selected = facets.selected_filters(request.GET)
+    # Одна денормалізована таблиця (vacancy.listing) без JOIN і GROUP BY;
+    # без фільтрів сторінка читається з vacancy_listing_public_idx
+    listings = VacancyListing.objects.filter(is_duplicate=False)
+    cache_key = ""
+    if search.match(query):
+        # Найрелевантніші першими, з підсвіченими фрагментами (vacancy.search)
+        filtered = (
+            facets.filter_queryset(listings, selected) if selected else None
+        )
+        vacancy_qs = search.SearchResults(query, filtered)
+        # Фасети рахуються по тих самих MAX_RESULTS найновіших збігах, що й
+        # результати, тож лічильник не більший за показане
+        listings = listings.filter(
+            pk__in=search.matching(query), pk__gt=vacancy_qs.floor
+        )
+        cache_key = (search.match(query), vacancy_qs.floor)
+    else:
+        vacancy_qs = facets.filter_queryset(listings, selected)
     page_obj = get_paginated_page(request, vacancy_qs, per_page=8)
-    
-    return render(request, "vacancy/list.html", {"page_obj": page_obj})
+
+    context = {
+        "page_obj": page_obj,
+        "query": query,
+        "facets": facets.facet_counts(
+            listings, selected, cache_key=cache_key
+        ),
+        "filtered": bool(selected),
+    }
+    return render(request, "vacancy/list.html", context)
 
 def vacancy_detail(request, pk):
     """Детальна сторінка вакансії з підтримкою повернення на сторінку пагінації"""
     vacancy = get_object_or_404(Vacancy, pk=pk)
+
+    # Історія повторних публікацій: увесь ланцюжок одним запитом
+    chain = Vacancy.objects.lineage(vacancy)
+    chain_vacancies = list(chain.only(
+        "pk", "title", "status", "published_at", "closed_at", "generation"
+    ))
+    chain_metrics = (
+        chain.chain_metrics() if len(chain_vacancies) > 1 else None
+    )
     
     # Контекст пагінації (зі списку вакансій)
     page = request.GET.get('page')
@@ -28,5 +65,7 @@ def vacancy_detail(request, pk):
         "page": page,
         "employer_id": employer_id,
         "employer_page": employer_page,
+        "chain_vacancies": chain_vacancies,
+        "chain_metrics": chain_metrics,
     }
     return render(request, "vacancy/detail.html", context)